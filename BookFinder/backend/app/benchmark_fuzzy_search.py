@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Benchmark the fuzzy title search
+Reports, per query, the candidates left by each TitleIndex filter stage, the
+filter and CER scoring latency and the number of true matches, on the catalog
+titles and on a synthetic catalog scaled up from them
+"""
+import argparse
+import csv
+import random
+import sys
+import time
+from pathlib import Path
+
+from services.text_distance import LEVENSHTEIN_BACKEND, levenshtein_distance
+from services.title_index import TitleIndex, normalize_title
+
+DEFAULT_CSV = Path(__file__).parent / "../../etl/data/book.csv"
+DEFAULT_QUERIES = [
+    "the little prince",
+    "harry poter",
+    "harry potter and the chamber of secrets",
+    "fahrenheit 451",
+    "the hobit",
+    "war and peace",
+    "penguin readers level 1: the little prince",
+    "мастер и маргарита",
+]
+
+
+def load_titles(csv_path: Path) -> list:
+    """Titles of the catalog CSV"""
+    with open(csv_path, newline='', encoding='utf-8') as f:
+        return [row["title"] for row in csv.DictReader(f) if row["title"].strip()]
+
+
+def scale_titles(titles: list, n_titles: int, seed: int = 0) -> list:
+    """
+    Synthetic catalog of `n_titles` titles
+
+    Every extra title is a catalog title with one to three words replaced,
+    inserted or deleted, so the collection has the near-duplicate structure
+    (editions, series, translations) that makes fuzzy search hard.
+    """
+    rng = random.Random(seed)
+    vocabulary = [word for title in titles for word in title.split()]
+    scaled = list(titles)
+    while len(scaled) < n_titles:
+        words = rng.choice(titles).split()
+        for _ in range(rng.randint(1, 3)):
+            position = rng.randrange(len(words))
+            operation = rng.random()
+            if operation < 0.5:
+                words[position] = rng.choice(vocabulary)
+            elif operation < 0.8:
+                words.insert(position, rng.choice(vocabulary))
+            elif len(words) > 1:
+                del words[position]
+        scaled.append(" ".join(words))
+    return scaled
+
+
+def benchmark(titles: list, queries: list, threshold: float):
+    """Print candidate counts and latencies of every query"""
+    start = time.perf_counter()
+    snapshot = TitleIndex._build_snapshot((str(i), title) for i, title in enumerate(titles))
+    build_time = time.perf_counter() - start
+    postings_mb = (snapshot.posting_keys.nbytes + snapshot.gram_codes.nbytes + snapshot.gram_starts.nbytes) / 1e6
+    print(f"\n{len(titles)} titles: built in {build_time:.2f}s "
+          f"(postings {postings_mb:.1f} MB, histograms {snapshot.histograms.nbytes / 1e6:.1f} MB)")
+    print(f"{'query':45} {'length':>7} {'final':>6} {'filter':>9} {'score':>9} {'matches':>8}")
+
+    index = TitleIndex()
+    for query in queries:
+        normalized = normalize_title(query)
+        length_ok = sum(
+            1 for length in snapshot.lengths
+            if abs(length - len(normalized)) <= int(threshold * max(length, len(normalized)) + 1e-9)
+        )
+
+        start = time.perf_counter()
+        candidates = index.fuzzy_candidates(query, threshold, snapshot)
+        filter_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        matches = 0
+        for position in candidates:
+            title = snapshot.titles[position]
+            max_distance = int(threshold * max(len(title), len(normalized)) + 1e-9)
+            if levenshtein_distance(normalized, title, max_distance) <= max_distance:
+                matches += 1
+        score_time = time.perf_counter() - start
+
+        print(f"{query[:45]:45} {length_ok:7d} {len(candidates):6d} "
+              f"{filter_time * 1000:7.1f}ms {score_time * 1000:7.1f}ms {matches:8d}")
+
+
+def main():
+    """Benchmark fuzzy candidate filtering at catalog and synthetic scale"""
+    parser = argparse.ArgumentParser(description="Benchmark the fuzzy title search")
+    parser.add_argument("--csv", type=Path, default=DEFAULT_CSV, help="Catalog CSV with a title column")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[200_000, 1_000_000],
+                        help="Synthetic catalog sizes (the catalog itself is always included)")
+    parser.add_argument("--threshold", type=float, default=0.3, help="Maximum CER of a match")
+    parser.add_argument("--queries", nargs="+", default=DEFAULT_QUERIES, help="Queries to time")
+    args = parser.parse_args()
+
+    titles = load_titles(args.csv)
+
+    print("=" * 70)
+    print("FUZZY TITLE SEARCH BENCHMARK")
+    print("=" * 70)
+    print(f"Catalog titles: {len(titles)}")
+    print(f"CER threshold: {args.threshold}")
+    print(f"Levenshtein backend: {LEVENSHTEIN_BACKEND}")
+    print("Columns: titles passing the length filter, final candidates, filter time,")
+    print("         CER scoring time of the candidates, true matches")
+    print("=" * 70)
+
+    benchmark(titles, args.queries, args.threshold)
+    for size in args.sizes:
+        benchmark(scale_titles(titles, size), args.queries, args.threshold)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Build the book_similarity table from the FAISS index
+Run after the vector store was (re)built; recommendation reads are then
+served from the table instead of an embedding computation
+"""
+import argparse
+import sys
+
+from core.config import SIMILARITY_TOP_N
+from services.similarity_service import rebuild_similarity_table
+
+
+def main():
+    """Precompute top-N neighbors for every book and store them in the database"""
+    parser = argparse.ArgumentParser(description="Populate the book_similarity table")
+    parser.add_argument("--top-n", type=int, default=SIMILARITY_TOP_N,
+                        help="Neighbors stored per book (reads for more use a live kNN search)")
+    parser.add_argument("--chunk-size", type=int, default=1024, help="Books per batched kNN query")
+    parser.add_argument("--threads", type=int, default=None, help="FAISS threads (default: all cores)")
+    args = parser.parse_args()
+
+    print("=" * 70)
+    print("BUILDING BOOK SIMILARITY TABLE")
+    print("=" * 70)
+    print(f"Top-N: {args.top_n}")
+    print(f"Chunk size: {args.chunk_size}")
+    print(f"Threads: {args.threads or 'default'}")
+    print("=" * 70)
+
+    try:
+        stats = rebuild_similarity_table(top_n=args.top_n, chunk_size=args.chunk_size, n_threads=args.threads)
+
+        print("\n" + "=" * 70)
+        print("✅ SIMILARITY TABLE BUILT SUCCESSFULLY!")
+        print("=" * 70)
+        print(f"Books: {stats['books']}")
+        print(f"Skipped (not in database): {stats['skipped_books']}")
+        print(f"Skipped (duplicate index entries): {stats['duplicate_books']}")
+        print(f"Rows written: {stats['rows']}")
+        print("=" * 70)
+        return 0
+
+    except Exception as e:
+        print(f"\n❌ ERROR: Failed to build similarity table")
+        print(f"   {type(e).__name__}: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
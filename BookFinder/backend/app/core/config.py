@@ -8,7 +8,28 @@ load_dotenv()
 GOOGLE_CLIENT_ID = os.getenv("GOOGLE_CLIENT_ID")
 GOOGLE_CLIENT_SECRET = os.getenv("GOOGLE_CLIENT_SECRET")
 API_SECRET_KEY = os.getenv("API_SECRET_KEY")
+# Shared secret of the ETL's catalog refresh call (never API_SECRET_KEY, which signs user tokens);
+# the refresh endpoint rejects every call while it is unset
+CATALOG_REFRESH_SECRET = os.getenv("CATALOG_REFRESH_SECRET")
 
 # DS Service URL - defaults to docker service name, can be overridden
 DS_SERVICE_URL = os.getenv("DS_SERVICE_URL", "http://ds_service:8001")
-CALLBACK_URL = os.getenv("CALLBACK_URL")
\ No newline at end of file
+CALLBACK_URL = os.getenv("CALLBACK_URL")
+
+# In-memory title index used by exact/fuzzy search is rebuilt from the DB after this many seconds
+TITLE_INDEX_TTL_SECONDS = int(os.getenv("TITLE_INDEX_TTL_SECONDS", "600"))
+
+# Complete search responses are cached per normalized query (LRU, bounded size, TTL)
+SEARCH_CACHE_MAX_ENTRIES = int(os.getenv("SEARCH_CACHE_MAX_ENTRIES", "1024"))
+SEARCH_CACHE_TTL_SECONDS = int(os.getenv("SEARCH_CACHE_TTL_SECONDS", "300"))
+
+# Time budget of a search request; the semantic stage falls back to a title-only
+# query rather than exceed it (keep below the frontend's 30 s API_TIMEOUT)
+SEARCH_DEADLINE_SECONDS = float(os.getenv("SEARCH_DEADLINE_SECONDS", "20"))
+
+# Threads running semantic search stages (kept apart from the default pool, as they wait on the LLM)
+SEMANTIC_SEARCH_WORKERS = int(os.getenv("SEMANTIC_SEARCH_WORKERS", "16"))
+
+# Neighbors precomputed per book in the book_similarity table (build_similarity_table.py
+# default); "more like this" requests for more than this use a live kNN search
+SIMILARITY_TOP_N = int(os.getenv("SIMILARITY_TOP_N", "10"))
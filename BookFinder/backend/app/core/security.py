@@ -1,7 +1,9 @@
-from fastapi import Depends, HTTPException, status
+import hmac
+from typing import Optional
+from fastapi import Depends, Header, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt, JWTError
-from core.config import API_SECRET_KEY
+from core.config import API_SECRET_KEY, CATALOG_REFRESH_SECRET
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="api/auth/google")
 
@@ -35,3 +37,26 @@ def get_current_user(token: str = Depends(oauth2_scheme)):
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid token"
         )
+
+
+def verify_service_secret(x_service_secret: Optional[str] = Header(None)):
+    """
+    **Authenticate a service-to-service call with the shared secret.**
+
+    Used as a FastAPI dependency on internal endpoints (e.g. the ETL's catalog
+    refresh). The caller sends `CATALOG_REFRESH_SECRET` in the `X-Service-Secret`
+    header; it is compared in constant time. The JWT signing key is never
+    accepted here, so it does not have to leave the backend.
+
+    Args:
+        x_service_secret (str): Value of the `X-Service-Secret` header.
+
+    Raises:
+        HTTPException: If no secret is configured, or the header is missing or wrong.
+    """
+    if not CATALOG_REFRESH_SECRET or not x_service_secret or \
+            not hmac.compare_digest(x_service_secret.encode(), CATALOG_REFRESH_SECRET.encode()):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid service secret"
+        )
@@ -1,9 +1,10 @@
 import os
-from typing import List, Optional
+from typing import Dict, Iterable, List, Optional, Tuple
 from dotenv import load_dotenv
 from loguru import logger
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, Session, declarative_base
+from sqlalchemy import create_engine, func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import sessionmaker, Session, declarative_base, contains_eager
 from schemas.rating_schema import RatingResponse
 
 # Import your models
@@ -25,6 +26,22 @@ def get_book_by_isbn(db: Session, isbn: str) -> Optional[Book]:
     return db.query(Book).filter(Book.ISBN == isbn).first()
 
 
+def get_books_by_isbns(db: Session, isbns: List[str]) -> List[Book]:
+    """
+    **Retrieve several books by ISBN in a single query.**
+
+    Args:
+        db (Session): SQLAlchemy database session.
+        isbns (List[str]): ISBNs to look up.
+
+    Returns:
+        List[Book]: Books whose ISBN is in `isbns` (in no particular order).
+    """
+    if not isbns:
+        return []
+    return db.query(Book).filter(Book.ISBN.in_(set(isbns))).all()
+
+
 def search_books_by_title(db: Session, search_term: str, limit: int = 20) -> List[Book]:
     """
     **Search for books based on a partial title match.**
@@ -92,6 +109,34 @@ def get_allBooks(db: Session) -> List[Ratings]:
     """
     return db.query(Book).all()
 
+def get_all_isbns(db: Session) -> List[str]:
+    """
+    **Retrieve the ISBN of every book.**
+
+    Args:
+        db (Session): SQLAlchemy database session.
+
+    Returns:
+        List[str]: All ISBNs in the `book` table.
+    """
+    return [isbn for (isbn,) in db.query(Book.ISBN).all()]
+
+
+def get_book_titles(db: Session) -> List[Tuple[str, str]]:
+    """
+    **Retrieve the ISBN and title of every book.**
+
+    Unlike `get_allBooks`, only the two columns needed for title matching are
+    selected, so descriptions and ORM objects are never materialized.
+
+    Args:
+        db (Session): SQLAlchemy database session.
+
+    Returns:
+        List[Tuple[str, str]]: (ISBN, title) pairs for all books.
+    """
+    return [(isbn, title) for isbn, title in db.query(Book.ISBN, Book.title).all()]
+
 # -------------------------
 # Bookstore / Inventory
 # -------------------------
@@ -114,6 +159,33 @@ def get_stores_for_book(db: Session, isbn: str) -> List[BookStoreInventory]:
     ).order_by(BookStoreInventory.price.asc()).all()
 
 
+def get_stores_for_books(db: Session, isbns: List[str]) -> Dict[str, List[BookStoreInventory]]:
+    """
+    **Retrieve the inventories of several books in a single query, sorted by price.**
+
+    All inventory entries for the given ISBNs are fetched with one `IN` query,
+    with their bookstores loaded eagerly through the same join.
+
+    Args:
+        db (Session): SQLAlchemy database session.
+        isbns (List[str]): ISBNs of the books.
+
+    Returns:
+        Dict[str, List[BookStoreInventory]]: Inventory entries per ISBN, cheapest first.
+    """
+    inventories_by_isbn = {isbn: [] for isbn in isbns}
+    if not isbns:
+        return inventories_by_isbn
+
+    inventories = db.query(BookStoreInventory).join(BookStoreInventory.store)\
+        .options(contains_eager(BookStoreInventory.store))\
+        .filter(BookStoreInventory.ISBN.in_(set(isbns)))\
+        .order_by(BookStoreInventory.price.asc()).all()
+    for inventory in inventories:
+        inventories_by_isbn.setdefault(inventory.ISBN, []).append(inventory)
+    return inventories_by_isbn
+
+
 def insert_inventory_entry(db: Session, isbn: str, store_id: int, price: float) -> BookStoreInventory:
     """
     **Insert or update a book's inventory entry in a bookstore.**
@@ -192,6 +264,42 @@ def insert_similarity(db: Session, isbn1: str, isbn2: str, score: float) -> Book
     db.refresh(entry)
     return entry
 
+def replace_similarities(db: Session, rows: Iterable[Tuple[str, str, float]], batch_size: int = 5000) -> int:
+    """
+    **Replace the contents of the similarity table with precomputed neighbors.**
+
+    All existing rows are deleted and the new rows are inserted with multi-row
+    `INSERT ... ON CONFLICT DO NOTHING` statements of `batch_size` rows, all in
+    one transaction, so readers keep seeing the previous table until the commit.
+
+    Args:
+        db (Session): SQLAlchemy database session.
+        rows (Iterable[Tuple[str, str, float]]): (ISBN_1, ISBN_2, similarity_score) triples.
+        batch_size (int, optional): Rows per INSERT statement. Defaults to 5000.
+
+    Returns:
+        int: Number of rows written.
+    """
+    statement = pg_insert(BookSimilarity).on_conflict_do_nothing(constraint="idx_unique_similarity")
+    written = 0
+    batch = []
+    try:
+        db.query(BookSimilarity).delete(synchronize_session=False)
+        for isbn1, isbn2, score in rows:
+            batch.append({"ISBN_1": isbn1, "ISBN_2": isbn2, "similarity_score": score})
+            if len(batch) >= batch_size:
+                db.execute(statement, batch)
+                written += len(batch)
+                batch = []
+        if batch:
+            db.execute(statement, batch)
+            written += len(batch)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    return written
+
 # -------------------------
 # Search logging
 # -------------------------
@@ -219,6 +327,33 @@ def log_search_query(db: Session, user_id: int = None, term: str = "", matched_b
     return entry
 
 
+def get_unmatched_search_terms(db: Session, limit: Optional[int] = None) -> List[str]:
+    """
+    **Retrieve logged search terms that matched no catalog book**, most frequent first.
+
+    These are the queries whose semantic search needs an LLM description
+    (catalog matches are served from stored vectors), so they are the ones
+    worth pre-generating descriptions for.
+
+    Args:
+        db (Session): SQLAlchemy database session.
+        limit (int, optional): Maximum number of terms to return. Defaults to all.
+
+    Returns:
+        List[str]: Distinct search terms ordered by how often they were searched.
+    """
+    count = func.count(SearchQuery.query_id)
+    query = (
+        db.query(SearchQuery.search_term)
+        .filter(SearchQuery.matched_book_ISBN.is_(None))
+        .group_by(SearchQuery.search_term)
+        .order_by(count.desc())
+    )
+    if limit is not None:
+        query = query.limit(limit)
+    return [term for (term,) in query.all()]
+
+
 def get_recent_searches(db: Session, limit: int = 20) -> List[SearchQuery]:
     """
     **Retrieve the most recent search queries from the database.**
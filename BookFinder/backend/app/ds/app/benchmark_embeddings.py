@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Compare embedding backends
+Checks that the ONNX backend agrees with the PyTorch embeddings (cosine
+similarity per text and nearest-neighbor overlap) and reports load time,
+single-query latency, batch throughput and peak RSS of each backend.
+Exits with status 1 when parity is below the threshold
+"""
+import argparse
+import multiprocessing
+import resource
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Add app to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+DEFAULT_CSV = Path(__file__).parent / "../../../../etl/data/book.csv"
+
+
+def load_texts(csv_path: Path, n_texts: int) -> list:
+    """Catalog descriptions to embed"""
+    df = pd.read_csv(csv_path, usecols=["description"]).dropna()
+    return df["description"].astype(str).head(n_texts).tolist()
+
+
+def run_backend(backend: str, texts: list, n_latency: int, batch_size: int) -> dict:
+    """Load one backend in a fresh process and measure it (runs in a child process)"""
+    start = time.perf_counter()
+    from config import config
+    from embedding_backends import load_embedding_model
+    model = load_embedding_model(config.EMBEDDING_MODEL, backend)
+    load_seconds = time.perf_counter() - start
+
+    model.encode(texts[:batch_size], batch_size=batch_size, convert_to_numpy=True)  # warm-up
+
+    timings = []
+    for text in texts[:n_latency]:
+        start = time.perf_counter()
+        model.encode([text], convert_to_numpy=True)
+        timings.append((time.perf_counter() - start) * 1000)
+
+    start = time.perf_counter()
+    embeddings = model.encode(texts, batch_size=batch_size, convert_to_numpy=True)
+    throughput = len(texts) / (time.perf_counter() - start)
+
+    embeddings = np.asarray(embeddings, dtype=np.float32)
+    embeddings /= np.linalg.norm(embeddings, axis=1, keepdims=True) + 1e-8
+    return {
+        "load_seconds": load_seconds,
+        "p50_ms": float(np.percentile(timings, 50)),
+        "p99_ms": float(np.percentile(timings, 99)),
+        "throughput": throughput,
+        "rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "embeddings": embeddings
+    }
+
+
+def neighbor_overlap(a: np.ndarray, b: np.ndarray, k: int) -> float:
+    """Mean overlap of each text's top-k neighbors under both embeddings (cross-backend search quality)"""
+    k = min(k, len(a) - 1)
+    reference = a @ a.T
+    cross = b @ a.T  # queries embedded by one backend against an index built by the other
+    np.fill_diagonal(reference, -np.inf)
+    np.fill_diagonal(cross, -np.inf)
+    top_a = np.argsort(-reference, axis=1)[:, :k]
+    top_b = np.argsort(-cross, axis=1)[:, :k]
+    return float(np.mean([len(set(x) & set(y)) / k for x, y in zip(top_a, top_b)]))
+
+
+def main():
+    """Benchmark both backends and check parity"""
+    parser = argparse.ArgumentParser(description="Compare the torch and onnx embedding backends")
+    parser.add_argument("--csv", type=Path, default=DEFAULT_CSV, help="CSV with a 'description' column")
+    parser.add_argument("--texts", type=int, default=1000, help="Number of texts to embed")
+    parser.add_argument("--latency-queries", type=int, default=200, help="Single-text encodes for latency")
+    parser.add_argument("--batch-size", type=int, default=32, help="Batch size for throughput")
+    parser.add_argument("--k", type=int, default=10, help="Neighbors for the overlap check")
+    parser.add_argument("--threshold", type=float, default=0.99, help="Minimum mean cosine agreement")
+    args = parser.parse_args()
+
+    texts = load_texts(args.csv, args.texts)
+    print(f"Embedding {len(texts)} texts with each backend...")
+
+    # A separate process per backend keeps load time and RSS measurements independent
+    context = multiprocessing.get_context("spawn")
+    results = {}
+    for backend in ("torch", "onnx"):
+        with context.Pool(1) as pool:
+            results[backend] = pool.apply(run_backend, (backend, texts, args.latency_queries, args.batch_size))
+
+    print("\n" + "=" * 70)
+    print(f"{'backend':<10}{'load s':>10}{'p50 ms':>10}{'p99 ms':>10}{'texts/s':>12}{'RSS MB':>10}")
+    for backend, result in results.items():
+        print(f"{backend:<10}{result['load_seconds']:>10.2f}{result['p50_ms']:>10.2f}{result['p99_ms']:>10.2f}"
+              f"{result['throughput']:>12.1f}{result['rss_mb']:>10.0f}")
+
+    reference, candidate = results["torch"]["embeddings"], results["onnx"]["embeddings"]
+    cosine = np.sum(reference * candidate, axis=1)
+    overlap = neighbor_overlap(reference, candidate, args.k)
+    print("=" * 70)
+    print(f"Cosine agreement: mean {cosine.mean():.4f}, min {cosine.min():.4f}")
+    print(f"Top-{args.k} neighbor overlap (onnx queries vs torch index): {overlap:.3f}")
+
+    if cosine.mean() < args.threshold:
+        print(f"\n❌ Parity check failed: mean cosine {cosine.mean():.4f} < {args.threshold}")
+        return 1
+    print(f"\n✅ Parity check passed (mean cosine >= {args.threshold})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
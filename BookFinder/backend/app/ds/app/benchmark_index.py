@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Benchmark FAISS index types
+Reports build time, memory footprint, recall@k against the exact (flat) index
+and single-query p50/p99 latency for every index configuration (quantized ones
+with and without exact re-ranking), on the catalog vectors and on a synthetic
+clustered vector set
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import faiss
+
+# Add app to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from config import config
+from faiss_index import INDEX_TYPES, QUANTIZED_INDEX_TYPES, build_index, get_index_params, prepare_index, search_index
+from vector_store import current_index_files
+
+
+def normalize(vectors: np.ndarray) -> np.ndarray:
+    """Normalize float32 vectors to unit length in place"""
+    faiss.normalize_L2(vectors)
+    return vectors
+
+
+def load_catalog_vectors() -> np.ndarray:
+    """Read the exact catalog vectors (from the index itself for flat builds without a vectors file)"""
+    files = current_index_files("books")
+    if files.vectors.exists():
+        return np.ascontiguousarray(np.load(files.vectors), dtype=np.float32)
+    index = prepare_index(faiss.read_index(str(files.index)), {})
+    return index.reconstruct_n(0, index.ntotal)
+
+
+def make_synthetic_vectors(n_vectors: int, dim: int, n_clusters: int = 1000,
+                           seed: int = 0, chunk_size: int = 100_000) -> np.ndarray:
+    """
+    Clustered random unit vectors
+
+    Uniform random vectors have no neighborhood structure, which makes every
+    ANN index look worse than on real embeddings; a Gaussian mixture is closer.
+    """
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((n_clusters, dim), dtype=np.float32)
+    vectors = np.empty((n_vectors, dim), dtype=np.float32)
+    for start in range(0, n_vectors, chunk_size):
+        end = min(start + chunk_size, n_vectors)
+        assignment = rng.integers(0, n_clusters, end - start)
+        vectors[start:end] = centers[assignment] + 0.5 * rng.standard_normal((end - start, dim), dtype=np.float32)
+    return normalize(vectors)
+
+
+def make_queries(vectors: np.ndarray, n_queries: int, seed: int = 1) -> np.ndarray:
+    """Perturbed copies of random stored vectors, as stand-ins for query embeddings"""
+    rng = np.random.default_rng(seed)
+    rows = rng.choice(len(vectors), size=min(n_queries, len(vectors)), replace=False)
+    queries = vectors[rows] + 0.1 * rng.standard_normal((len(rows), vectors.shape[1]), dtype=np.float32)
+    return normalize(np.ascontiguousarray(queries, dtype=np.float32))
+
+
+def recall_at_k(found: np.ndarray, truth: np.ndarray, k: int) -> float:
+    """Fraction of the exact top-k neighbors that were returned"""
+    hits = sum(len(set(f[:k]) & set(t[:k])) for f, t in zip(found, truth))
+    return hits / (len(truth) * k)
+
+
+def index_size_mb(index: faiss.Index) -> float:
+    """Serialized size of an index, which is what a replica holds in RAM"""
+    return faiss.serialize_index(index).nbytes / 1024 / 1024
+
+
+def measure_latency(index: faiss.Index, queries: np.ndarray, k: int,
+                    vectors: np.ndarray = None, rerank_factor: int = 0) -> tuple:
+    """p50/p99 latency (ms) of single-query searches, as issued by the backend"""
+    timings = []
+    for query in queries:
+        start = time.perf_counter()
+        search_index(index, query.reshape(1, -1), k, vectors, rerank_factor)
+        timings.append((time.perf_counter() - start) * 1000)
+    return float(np.percentile(timings, 50)), float(np.percentile(timings, 99))
+
+
+def search_settings(index_type: str, args) -> list:
+    """Search-time parameter sweep for an index type"""
+    if index_type == "hnsw":
+        return [{"hnsw_ef_search": ef} for ef in args.ef_search]
+    if index_type in ("ivf", "ivfpq"):
+        return [{"ivf_nprobe": nprobe} for nprobe in args.nprobe]
+    return [{}]
+
+
+def benchmark(name: str, vectors: np.ndarray, args):
+    """Benchmark every configured index type on one vector set"""
+    queries = make_queries(vectors, args.queries)
+    print("\n" + "=" * 70)
+    print(f"{name}: {len(vectors)} vectors, dim {vectors.shape[1]}, {len(queries)} queries, k={args.k}")
+    print("=" * 70)
+
+    # Exact ground truth
+    _, truth = build_index(vectors, get_index_params("flat")).search(queries, args.k)
+
+    print(f"{'index':<8}{'setting':<22}{'build s':>9}{'MB':>9}{'recall@k':>10}{'p50 ms':>9}{'p99 ms':>9}")
+    for index_type in args.index_types:
+        params = get_index_params(index_type)
+        start = time.perf_counter()
+        index = build_index(vectors, params)
+        build_seconds = time.perf_counter() - start
+        size_mb = index_size_mb(index)
+
+        rerank_factors = [0]
+        if index_type in QUANTIZED_INDEX_TYPES and args.rerank_factor > 1:
+            rerank_factors.append(args.rerank_factor)
+
+        for setting in search_settings(index_type, args):
+            prepare_index(index, setting)
+            for rerank_factor in rerank_factors:
+                _, found = search_index(index, queries, args.k, vectors, rerank_factor)
+                recall = recall_at_k(found, truth, args.k)
+                p50, p99 = measure_latency(index, queries, args.k, vectors, rerank_factor)
+                label = ", ".join(f"{key.split('_', 1)[1]}={value}" for key, value in setting.items())
+                if rerank_factor:
+                    label = f"{label}, rerank x{rerank_factor}" if label else f"rerank x{rerank_factor}"
+                print(f"{index_type:<8}{label or '-':<22}{build_seconds:>9.1f}{size_mb:>9.1f}"
+                      f"{recall:>10.3f}{p50:>9.3f}{p99:>9.3f}")
+
+
+def main():
+    """Run the benchmark on the catalog and on a synthetic collection"""
+    parser = argparse.ArgumentParser(description="Benchmark FAISS index types")
+    parser.add_argument("--index-types", type=lambda s: s.split(","), default=list(INDEX_TYPES),
+                        help="Comma-separated index types")
+    parser.add_argument("--k", type=int, default=10, help="Neighbors per query")
+    parser.add_argument("--queries", type=int, default=1000, help="Number of queries")
+    parser.add_argument("--nprobe", type=lambda s: [int(v) for v in s.split(",")], default=[1, 4, 16, 64],
+                        help="IVF nprobe values to sweep")
+    parser.add_argument("--ef-search", type=lambda s: [int(v) for v in s.split(",")], default=[16, 64, 128],
+                        help="HNSW efSearch values to sweep")
+    parser.add_argument("--rerank-factor", type=int, default=config.RERANK_FACTOR,
+                        help="Candidates per result re-ranked exactly for quantized indexes")
+    parser.add_argument("--synthetic-size", type=int, default=1_000_000,
+                        help="Size of the synthetic set (0 = skip)")
+    parser.add_argument("--skip-catalog", action="store_true", help="Skip the catalog benchmark")
+    args = parser.parse_args()
+
+    dim = None
+    if not args.skip_catalog:
+        catalog = load_catalog_vectors()
+        dim = catalog.shape[1]
+        benchmark("Catalog", catalog, args)
+
+    if args.synthetic_size:
+        synthetic = make_synthetic_vectors(args.synthetic_size, dim or 384)
+        benchmark("Synthetic", synthetic, args)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
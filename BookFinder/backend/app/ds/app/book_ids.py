@@ -0,0 +1,125 @@
+"""
+Compact book ID store for the vector index
+Keeps the row -> book_id mapping as a fixed-width byte array (saved as a
+memory-mappable .npy file) plus the IDs in sorted order and their rows
+(saved next to it), which answer book_id -> row lookups by binary search
+"""
+import json
+import numpy as np
+from pathlib import Path
+from typing import Iterable, List, Optional, Tuple
+
+try:
+    from .utils import normalize_isbn
+except ImportError:
+    from utils import normalize_isbn
+
+
+def sorted_paths(path: Path) -> Tuple[Path, Path]:
+    """Paths of the sorted IDs and of their rows saved next to the IDs at `path`"""
+    return path.with_name(f"{path.stem}_sorted.npy"), path.with_name(f"{path.stem}_order.npy")
+
+
+class BookIds:
+    """
+    Row-aligned book IDs of a vector index
+
+    IDs are stored as one fixed-width bytes array ('S<n>', ~13 bytes per ISBN)
+    instead of a list of {"book_id": ...} dicts (~200 bytes each), so the
+    mapping loads without parsing and takes a fraction of the memory.
+    row -> book_id is an array lookup; book_id -> row is a binary search over
+    the sorted IDs. All three arrays are memory-mapped, so worker processes
+    share their pages and loading builds nothing per process.
+    """
+
+    def __init__(self, ids: Optional[np.ndarray] = None, sorted_ids: Optional[np.ndarray] = None,
+                 order: Optional[np.ndarray] = None):
+        """
+        Wrap an array of encoded book IDs
+
+        Args:
+            ids: 1-D bytes array, one canonical book ID per index row
+            sorted_ids: `ids` sorted (computed if not given)
+            order: Row of each entry of `sorted_ids`, first rows first among equal IDs
+        """
+        self._ids = ids if ids is not None else np.empty(0, dtype='S1')
+        if sorted_ids is None or order is None:
+            order = np.argsort(self._ids, kind='stable').astype(np.int64 if len(self._ids) >= 2**31 else np.int32)
+            sorted_ids = self._ids[order]
+        self._sorted_ids = sorted_ids
+        self._order = order
+
+    @classmethod
+    def from_list(cls, book_ids: Iterable[str]) -> "BookIds":
+        """Build from book IDs (normalized to canonical ISBNs)"""
+        encoded = [normalize_isbn(book_id).encode('utf-8') for book_id in book_ids]
+        width = max((len(book_id) for book_id in encoded), default=1) or 1
+        return cls(np.array(encoded, dtype=f'S{width}'))
+
+    @classmethod
+    def from_metadata(cls, metadata: List[dict]) -> "BookIds":
+        """Build from metadata dicts with a 'book_id' field"""
+        return cls.from_list(entry.get("book_id") for entry in metadata)
+
+    @classmethod
+    def load(cls, path: Path, mmap: bool = True) -> "BookIds":
+        """
+        Load IDs saved by save()
+
+        IDs saved before the sorted arrays existed are sorted on load.
+
+        Args:
+            path: Path of the .npy file
+            mmap: Memory-map the arrays instead of reading them
+        """
+        mmap_mode = 'r' if mmap else None
+        ids = np.load(path, mmap_mode=mmap_mode)
+        sorted_path, order_path = sorted_paths(path)
+        if not sorted_path.exists() or not order_path.exists():
+            return cls(ids)
+        sorted_ids = np.load(sorted_path, mmap_mode=mmap_mode)
+        order = np.load(order_path, mmap_mode=mmap_mode)
+        if len(sorted_ids) != len(ids) or len(order) != len(ids):
+            raise ValueError(f"Sorted book IDs next to {path.name} do not match it")
+        return cls(ids, sorted_ids, order)
+
+    @classmethod
+    def load_json(cls, path: Path) -> "BookIds":
+        """Load the legacy books_metadata.json format (a list of {"book_id": ...} dicts)"""
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls.from_metadata(json.load(f))
+
+    def save(self, path: Path):
+        """Write the IDs, the sorted IDs and their rows as .npy arrays (see sorted_paths)"""
+        sorted_path, order_path = sorted_paths(path)
+        np.save(path, np.asarray(self._ids))
+        np.save(sorted_path, np.asarray(self._sorted_ids))
+        np.save(order_path, np.asarray(self._order))
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, book_id: str) -> bool:
+        return self.row_of(book_id) is not None
+
+    def get(self, row: int) -> str:
+        """Book ID stored at an index row"""
+        return self._ids[row].decode('utf-8')
+
+    def row_of(self, book_id: str) -> Optional[int]:
+        """First index row of a book, or None if it is not indexed"""
+        key = book_id.encode('utf-8')
+        if not key or len(key) > self._sorted_ids.dtype.itemsize:
+            return None
+        position = int(np.searchsorted(self._sorted_ids, key))
+        if position == len(self._sorted_ids) or self._sorted_ids[position] != key:
+            return None
+        return int(self._order[position])
+
+    def extend(self, book_ids: Iterable[str]) -> "BookIds":
+        """Return a new BookIds with additional IDs appended"""
+        return BookIds.from_list(self.to_list() + list(book_ids))
+
+    def to_list(self) -> List[str]:
+        """All book IDs in row order"""
+        return [book_id.decode('utf-8') for book_id in self._ids.tolist()]
@@ -10,10 +10,12 @@ try:
     from .description_generator import DescriptionGenerator
     from .vector_store import VectorStore
     from .config import config
+    from .utils import normalize_isbn
 except ImportError:
     from description_generator import DescriptionGenerator
     from vector_store import VectorStore
     from config import config
+    from utils import normalize_isbn
 
 logger = logging.getLogger(__name__)
 
@@ -33,6 +35,8 @@ class BookRecommendationService:
         
         self.description_generator = DescriptionGenerator()
         self.vector_store = VectorStore()
+        # Index of title (+ author) embeddings, sharing the embedding model
+        self.title_store = VectorStore(name="titles", model_from=self.vector_store)
         
         logger.info("="*70)
         logger.info("✓ Service initialized successfully")
@@ -41,19 +45,47 @@ class BookRecommendationService:
     def find_similar_books(
         self,
         query_title: str,
-        top_k: Optional[int] = None
+        top_k: Optional[int] = None,
+        catalog_book_id: Optional[str] = None,
+        catalog_description: Optional[str] = None,
+        deadline: Optional[float] = None,
+        search_mode: Optional[str] = None
     ) -> List[dict]:
         """
         **Find books similar to the query title.**
         
+        When the query resolves to a catalog book, its stored vector (or, if
+        it is not indexed yet, its stored description) is used for the
+        neighbor search and the LLM description step is skipped.
+        
+        The description step waits at most DESCRIPTION_DEADLINE_SECONDS, and
+        never past `deadline` minus SEARCH_RESERVE_SECONDS; when it runs out
+        or the API call fails, the title itself is embedded instead
+        (`query_source` "title") and a late description is cached for later
+        searches.
+        
+        Other queries follow `search_mode`: "description" generates a
+        description and searches the description index, "title" embeds the
+        raw query against the title index (one local encode, no LLM call),
+        and "auto" does the latter but, when the best title match scores
+        below TITLE_MATCH_MIN_SCORE, also runs the description path and
+        fuses both rankings (reciprocal rank fusion).
+        
         Args:
             query_title: Title of the book user is searching for
             top_k: Number of recommendations to return (default from config)
+            catalog_book_id: Canonical ISBN of the catalog book matching the query, if any
+            catalog_description: Stored description of that book, if available
+            deadline: `time.monotonic()` value by which the caller needs the results
+            search_mode: description, title or auto (default: config.SEARCH_MODE)
             
         Returns:
-            List of book recommendations with similarity scores
+            List of book recommendations with similarity scores and the
+            `query_source` ("vector", "catalog_description", "title_index",
+            "description", "fused", or "title" when the description missed its deadline)
         """
         top_k = top_k or config.TOP_K_RESULTS
+        search_mode = search_mode or config.SEARCH_MODE
         
         print(f"\n{'='*70}")
         print(f"[BookRecommendationService] FINDING SIMILAR BOOKS")
@@ -64,30 +96,151 @@ class BookRecommendationService:
         
         start_time = time.time()
         
-        # Step 1: Generate description for the query title
+        # Step 1: Make sure the resident vector store is loaded (and up to date)
         print(f"{'─'*70}")
-        print("STEP 1: Generate Book Description")
+        print("STEP 1: Load Vector Store")
         print(f"{'─'*70}")
-        query_description = self.description_generator.generate_description(query_title)
         
-        # Step 2: Load vector store if not already loaded
-        print(f"{'─'*70}")
-        print("STEP 2: Load Vector Store")
-        print(f"{'─'*70}")
-        
-        if not self.vector_store.load_index():
+        if not self.vector_store.ensure_index():
             raise ValueError(f"Vector store not found. Please build the index first.")
         
-        # Step 3: Search for similar books
-        print(f"{'─'*70}")
-        print("STEP 3: Search for Similar Books")
-        print(f"{'─'*70}")
-        results = self.vector_store.search(query_description, top_k=top_k)
+        # The matched catalog book itself is not a recommendation
+        exclude_ids = [catalog_book_id] if catalog_book_id else None
+        stored_vector = self.vector_store.get_vector(catalog_book_id) if catalog_book_id else None
+        
+        # Step 2: Get a query vector / description, Step 3: search
+        if stored_vector is not None:
+            print(f"{'─'*70}")
+            print(f"STEP 2-3: Search with Stored Vector of ISBN {catalog_book_id}")
+            print(f"{'─'*70}")
+            results = self.vector_store.search_by_vector(stored_vector, top_k=top_k, exclude_ids=exclude_ids)
+            query_source = "vector"
+        elif catalog_description:
+            print(f"{'─'*70}")
+            print("STEP 2-3: Search with Stored Catalog Description")
+            print(f"{'─'*70}")
+            results = self.vector_store.search(catalog_description, top_k=top_k, exclude_ids=exclude_ids)
+            query_source = "catalog_description"
+        else:
+            title_results = None
+            if search_mode in ("title", "auto") and self.title_store.ensure_index():
+                print(f"{'─'*70}")
+                print("STEP 2-3: Search Title Index with Raw Query")
+                print(f"{'─'*70}")
+                title_results = self.title_store.search(query_title, top_k=top_k, exclude_ids=exclude_ids)
+            
+            best_title_score = title_results[0][1] if title_results else 0.0
+            title_confident = search_mode == "title" or best_title_score >= config.TITLE_MATCH_MIN_SCORE
+            if title_results is not None and title_confident:
+                results = title_results
+                query_source = "title_index"
+            else:
+                if title_results is not None:
+                    print(f"Best title match scored {best_title_score:.3f} "
+                          f"(< {config.TITLE_MATCH_MIN_SCORE}), adding description path")
+                print(f"{'─'*70}")
+                print("STEP 2: Generate Book Description")
+                print(f"{'─'*70}")
+                query_description = self.description_generator.generate_description(
+                    query_title, deadline=self._description_deadline(deadline)
+                )
+                description_ok = query_description is not None
+                if not description_ok:
+                    print("No description (API failure or deadline), embedding the title instead")
+                    query_description = query_title
+                
+                print(f"{'─'*70}")
+                print("STEP 3: Search for Similar Books")
+                print(f"{'─'*70}")
+                results = self.vector_store.search(query_description, top_k=top_k, exclude_ids=exclude_ids)
+                if title_results:
+                    results = self._fuse_results([title_results, results], top_k)
+                    query_source = "fused" if description_ok else "title"
+                else:
+                    query_source = "description" if description_ok else "title"
         
         # Step 4: Format results
         print(f"{'─'*70}")
         print("STEP 4: Format Results")
         print(f"{'─'*70}")
+        recommendations = self._format_recommendations(results)
+        for rec in recommendations:
+            rec["query_source"] = query_source
+        
+        elapsed_time = time.time() - start_time
+        
+        print(f"\n{'='*70}")
+        print(f"[BookRecommendationService] ✓ COMPLETE")
+        print(f"{'='*70}")
+        print(f"Found {len(recommendations)} recommendations in {elapsed_time:.2f}s")
+        print(f"{'='*70}\n")
+        
+        return recommendations
+    
+    @staticmethod
+    def _fuse_results(rankings: List[List[Tuple[dict, float]]], top_k: int) -> List[Tuple[dict, float]]:
+        """
+        **Merge rankings with reciprocal rank fusion.**
+        
+        Books are ordered by the sum of 1 / (RRF_K + rank) over the rankings
+        they appear in; each keeps its best cosine similarity as its score.
+        
+        Args:
+            rankings: Search results (metadata, similarity) of each query path
+            top_k: Number of results to keep
+            
+        Returns:
+            Fused list of (metadata, similarity) tuples
+        """
+        fused = {}
+        for ranking in rankings:
+            for rank, (metadata, similarity) in enumerate(ranking, 1):
+                book_id = metadata.get("book_id")
+                entry = fused.setdefault(book_id, [0.0, metadata, similarity])
+                entry[0] += 1.0 / (config.RRF_K + rank)
+                entry[2] = max(entry[2], similarity)
+        ordered = sorted(fused.values(), key=lambda entry: entry[0], reverse=True)
+        return [(metadata, similarity) for _, metadata, similarity in ordered[:top_k]]
+    
+    @staticmethod
+    def _description_deadline(deadline: Optional[float]) -> Optional[float]:
+        """**Deadline of the description step** (None = wait for the description)."""
+        limits = []
+        if config.DESCRIPTION_DEADLINE_SECONDS > 0:
+            limits.append(time.monotonic() + config.DESCRIPTION_DEADLINE_SECONDS)
+        if deadline is not None:
+            limits.append(deadline - config.SEARCH_RESERVE_SECONDS)
+        return min(limits) if limits else None
+    
+    def find_books_similar_to(self, book_id: str, top_k: Optional[int] = None) -> Optional[List[dict]]:
+        """
+        **Find books similar to a catalog book** ("more like this").
+        
+        Served straight from the book's stored vector: no description
+        generation and no embedding.
+        
+        Args:
+            book_id: Canonical ISBN of the book
+            top_k: Number of recommendations to return (default from config)
+            
+        Returns:
+            List of book recommendations with similarity scores (without the
+            book itself), or None if the book is not in the index
+        """
+        top_k = top_k or config.TOP_K_RESULTS
+        
+        if not self.vector_store.ensure_index():
+            raise ValueError(f"Vector store not found. Please build the index first.")
+        
+        results = self.vector_store.search_similar_to_book(book_id, top_k=top_k)
+        if results is None:
+            logger.info(f"ISBN {book_id} is not in the vector index")
+            return None
+        return self._format_recommendations(results)
+    
+    @staticmethod
+    def _format_recommendations(results: List[Tuple[dict, float]]) -> List[dict]:
+        """**Turn (metadata, similarity) search results into ranked recommendation dicts.**"""
         recommendations = []
         for idx, (metadata, similarity) in enumerate(results, 1):
             rec = {
@@ -98,15 +251,6 @@ class BookRecommendationService:
             }
             recommendations.append(rec)
             print(f"  #{idx}: ISBN {rec['book_id']} - {rec['similarity_percentage']}%")
-        
-        elapsed_time = time.time() - start_time
-        
-        print(f"\n{'='*70}")
-        print(f"[BookRecommendationService] ✓ COMPLETE")
-        print(f"{'='*70}")
-        print(f"Found {len(recommendations)} recommendations in {elapsed_time:.2f}s")
-        print(f"{'='*70}\n")
-        
         return recommendations
     
     def build_index(
@@ -153,7 +297,7 @@ class BookRecommendationService:
             
             descriptions.append(description)
             metadata.append({
-                "book_id": book.get("book_id") or book.get("ISBN")
+                "book_id": normalize_isbn(book.get("book_id") or book.get("ISBN"))
             })
         
         if books_without_description > 0:
@@ -224,7 +368,7 @@ class BookRecommendationService:
             if description_field in book and book[description_field]:
                 descriptions.append(book[description_field])
                 metadata.append({
-                    "book_id": book.get("book_id") or book.get("ISBN")
+                    "book_id": normalize_isbn(book.get("book_id") or book.get("ISBN"))
                 })
         
         self.vector_store.add_books(descriptions, metadata)
@@ -233,12 +377,16 @@ class BookRecommendationService:
         print(f"Added {len(descriptions)} books to index")
     
     def get_stats(self) -> dict:
-        """**Get statistics for the vector store.**"""
-        return self.vector_store.get_stats()
+        """**Get statistics for the vector store** (and the title index, once loaded)."""
+        stats = self.vector_store.get_stats()
+        if self.title_store.index is not None:
+            stats["title_index"] = self.title_store.get_stats()
+        return stats
     
     def delete_index(self):
-        """**Delete the vector index.**"""
+        """**Delete the vector index** (and the title index)."""
         self.vector_store.delete_index()
+        self.title_store.delete_index()
     
     def get_cache_stats(self) -> dict:
         """**Get description cache statistics.**"""
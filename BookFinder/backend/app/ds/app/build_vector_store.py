@@ -9,6 +9,7 @@ from pathlib import Path
 # Add app to path
 sys.path.insert(0, str(Path(__file__).parent))
 
+from config import config
 from vector_store import VectorStore
 
 def main():
@@ -18,6 +19,8 @@ def main():
     CSV_PATH = "../../../../etl/data/book.csv"  # Path from backend/app/ds/app to etl/data/book.csv
     BOOKID_COLUMN = "ISBN"                       # ← Column name for book ID
     DESCR_COLUMN = "description"                 # ← Column name for description
+    TITLE_COLUMN = "title"                       # ← Column name for title (title index)
+    AUTHOR_COLUMN = "author"                     # ← Column name for author (title index)
     
     print("="*70)
     print("BUILDING VECTOR STORE FROM CSV")
@@ -25,6 +28,7 @@ def main():
     print(f"CSV Path: {CSV_PATH}")
     print(f"Book ID Column: {BOOKID_COLUMN}")
     print(f"Description Column: {DESCR_COLUMN}")
+    print(f"Index Type: {config.INDEX_TYPE}")
     print("="*70)
     
     # Check if CSV exists
@@ -47,6 +51,16 @@ def main():
             descr_col=DESCR_COLUMN
         )
         
+        # Title (+ author) index for the LLM-free query path (SEARCH_MODE=title/auto)
+        print("\nBuilding title index...")
+        title_store = VectorStore(name="titles", model_from=vector_store)
+        title_store.load_titles_from_csv(
+            csv_path=str(csv_file),
+            bookid_col=BOOKID_COLUMN,
+            title_col=TITLE_COLUMN,
+            author_col=AUTHOR_COLUMN
+        )
+        
         # Show stats
         stats = vector_store.get_stats()
         print("\n" + "="*70)
@@ -54,14 +68,21 @@ def main():
         print("="*70)
         print(f"Model: {stats['model']}")
         print(f"Embedding Dimension: {stats['embedding_dim']}")
+        print(f"Index Type: {stats['index_type']}")
         print(f"Total Vectors: {stats['total_vectors']}")
+        print(f"Index Size: {stats['index_size_bytes'] / 1024 / 1024:.1f} MB")
         print(f"Index File: {stats['index_exists']}")
         print(f"Metadata File: {stats['metadata_exists']}")
+        print(f"Title Index Vectors: {title_store.get_stats()['total_vectors']}")
+        for label, store in (("Descriptions", vector_store), ("Titles", title_store)):
+            build = store.last_build
+            print(f"{label}: {build['reused']} embeddings reused, {build['recomputed']} recomputed")
         print("="*70)
         
         print("\n📁 Files created:")
-        print(f"   - ./vector_stores/books.faiss")
-        print(f"   - ./vector_stores/books_metadata.json")
+        print(f"   - ./vector_stores/books/{stats['build_id']}/ (index.faiss, ids.npy + ids_sorted.npy + ids_order.npy, index.json, vectors.npy)")
+        print(f"   - ./vector_stores/books.current (points to the build above)")
+        print(f"   - ./vector_stores/titles/{title_store.get_stats()['build_id']}/ (+ titles.current)")
         
         print("\n🎉 Done! The vector store is ready to use.")
         print("   Copy the vector_stores/ directory to your Docker container")
@@ -25,17 +25,86 @@ class Config:
     OPENAI_MODEL = os.getenv('OPENAI_MODEL', 'gpt-4')
     OPENAI_TEMPERATURE = float(os.getenv('OPENAI_TEMPERATURE', '0.3'))
     OPENAI_MAX_TOKENS = int(os.getenv('OPENAI_MAX_TOKENS', '300'))
+    # OpenAI-compatible endpoint (empty = api.openai.com), e.g. a local stub_openai_server.py
+    OPENAI_BASE_URL = os.getenv('OPENAI_BASE_URL', '')
+    # Per-request timeout of the OpenAI client (bounds background generations too)
+    OPENAI_TIMEOUT_SECONDS = float(os.getenv('OPENAI_TIMEOUT_SECONDS', '20'))
+    # Send a hedged second request once a call exceeds this latency percentile (0 = no hedging)
+    OPENAI_HEDGE_PERCENTILE = float(os.getenv('OPENAI_HEDGE_PERCENTILE', '95'))
+    
+    # Longest a search waits for a generated description before falling back to
+    # the title (0 = no limit); the generation still completes and is cached
+    DESCRIPTION_DEADLINE_SECONDS = float(os.getenv('DESCRIPTION_DEADLINE_SECONDS', '8'))
+    # Time kept free after the description step for embedding and search
+    SEARCH_RESERVE_SECONDS = float(os.getenv('SEARCH_RESERVE_SECONDS', '1'))
+    
+    # Batch generation: concurrent calls, request/token budgets per minute (0 = unlimited), retries
+    OPENAI_BATCH_CONCURRENCY = int(os.getenv('OPENAI_BATCH_CONCURRENCY', '8'))
+    OPENAI_RPM_LIMIT = float(os.getenv('OPENAI_RPM_LIMIT', '500'))
+    OPENAI_TPM_LIMIT = float(os.getenv('OPENAI_TPM_LIMIT', '200000'))
+    OPENAI_BATCH_MAX_RETRIES = int(os.getenv('OPENAI_BATCH_MAX_RETRIES', '5'))
+    # Titles packed into one bulk request (1 = one request per title)
+    OPENAI_BULK_SIZE = int(os.getenv('OPENAI_BULK_SIZE', '10'))
     
     # Embedding Model Configuration
     EMBEDDING_MODEL = os.getenv('EMBEDDING_MODEL', 'all-MiniLM-L6-v2')
+    # torch (sentence-transformers) or onnx (exported int8 model, see export_onnx_model.py)
+    EMBEDDING_BACKEND = os.getenv('EMBEDDING_BACKEND', 'torch').lower()
+    ONNX_MODEL_PATH = Path(os.getenv('ONNX_MODEL_PATH')) if os.getenv('ONNX_MODEL_PATH') \
+        else _BASE_DIR / 'models' / f"{EMBEDDING_MODEL.split('/')[-1]}-onnx"
     
     # Vector Store Configuration
     # Use environment variable if set, otherwise use absolute path to ds/vector_stores
     VECTOR_STORE_PATH = Path(os.getenv('VECTOR_STORE_PATH')) if os.getenv('VECTOR_STORE_PATH') else _BASE_DIR / 'vector_stores'
     CACHE_PATH = Path(os.getenv('CACHE_PATH')) if os.getenv('CACHE_PATH') else _BASE_DIR / 'cache'
     
+    # How often (seconds) the resident index checks the files on disk for a newer build
+    INDEX_RELOAD_CHECK_SECONDS = float(os.getenv('INDEX_RELOAD_CHECK_SECONDS', '30'))
+
+    # FAISS index type built by build_vector_store.py: flat (exact), hnsw, ivf,
+    # or the quantized sq8, pq and ivfpq
+    INDEX_TYPE = os.getenv('INDEX_TYPE', 'flat').lower()
+    # HNSW graph degree and build/search beam widths (higher = better recall, slower)
+    HNSW_M = int(os.getenv('HNSW_M', '32'))
+    HNSW_EF_CONSTRUCTION = int(os.getenv('HNSW_EF_CONSTRUCTION', '200'))
+    HNSW_EF_SEARCH = int(os.getenv('HNSW_EF_SEARCH', '64'))
+    # IVF list count (0 = derived from the collection size) and lists probed per query
+    IVF_NLIST = int(os.getenv('IVF_NLIST', '0'))
+    IVF_NPROBE = int(os.getenv('IVF_NPROBE', '16'))
+    # PQ sub-quantizers (must divide the embedding dim) and bits per code
+    PQ_M = int(os.getenv('PQ_M', '48'))
+    PQ_NBITS = int(os.getenv('PQ_NBITS', '8'))
+    # Candidates per result re-ranked with exact vectors for quantized indexes (0 = off)
+    RERANK_FACTOR = int(os.getenv('RERANK_FACTOR', '4'))
+    # memory: each process reads its own index copy, mmap: processes share the page cache
+    INDEX_LOAD_MODE = os.getenv('INDEX_LOAD_MODE', 'memory').lower()
+    
+    # Query embedding cache: in-memory LRU capacity (0 = off) and optional SQLite tier in CACHE_PATH
+    EMBEDDING_CACHE_MAX_ENTRIES = int(os.getenv('EMBEDDING_CACHE_MAX_ENTRIES', '4096'))
+    EMBEDDING_CACHE_DISK = os.getenv('EMBEDDING_CACHE_DISK', 'false').lower() in ('1', 'true', 'yes')
+    # SQLite tier bounds: entry limit (0 = unlimited) and days an unused entry is kept (0 = forever)
+    EMBEDDING_CACHE_DISK_MAX_ENTRIES = int(os.getenv('EMBEDDING_CACHE_DISK_MAX_ENTRIES', '100000'))
+    EMBEDDING_CACHE_DISK_MAX_AGE_DAYS = float(os.getenv('EMBEDDING_CACHE_DISK_MAX_AGE_DAYS', '30'))
+    # Index builds reuse document embeddings stored by (model, description hash) in
+    # CACHE_PATH/index_embeddings.sqlite, so rebuilds only encode new or changed texts
+    INDEX_EMBEDDING_CACHE = os.getenv('INDEX_EMBEDDING_CACHE', 'true').lower() in ('1', 'true', 'yes')
+    # Micro-batching of concurrent query encodes (max batch size 1 = encode each query directly)
+    EMBEDDING_BATCH_MAX_SIZE = int(os.getenv('EMBEDDING_BATCH_MAX_SIZE', '32'))
+    EMBEDDING_BATCH_MAX_WAIT_MS = float(os.getenv('EMBEDDING_BATCH_MAX_WAIT_MS', '5'))
+
+    # Description cache (SQLite): entry limit (0 = unlimited) and lifetime in days (0 = forever)
+    DESCRIPTION_CACHE_MAX_ENTRIES = int(os.getenv('DESCRIPTION_CACHE_MAX_ENTRIES', '100000'))
+    DESCRIPTION_CACHE_MAX_AGE_DAYS = float(os.getenv('DESCRIPTION_CACHE_MAX_AGE_DAYS', '0'))
+    
     # Recommendation Settings
     TOP_K_RESULTS = int(os.getenv('TOP_K_RESULTS', '5'))
+    # Query path for titles without a stored vector: description (LLM description ->
+    # description index), title (raw query -> title index) or auto (title index,
+    # fused with the description path when its best match scores below TITLE_MATCH_MIN_SCORE)
+    SEARCH_MODE = os.getenv('SEARCH_MODE', 'auto').lower()
+    TITLE_MATCH_MIN_SCORE = float(os.getenv('TITLE_MATCH_MIN_SCORE', '0.65'))
+    # Reciprocal rank fusion constant (higher = flatter rank weighting)
+    RRF_K = int(os.getenv('RRF_K', '60'))
     
     @classmethod
     def validate(cls):
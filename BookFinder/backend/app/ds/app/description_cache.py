@@ -0,0 +1,181 @@
+"""
+Persistent description cache
+SQLite-backed (WAL mode) store of generated descriptions, safe for concurrent
+worker processes, with O(1) writes and size/age-based eviction
+"""
+import json
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+try:
+    from .config import config
+except ImportError:
+    from config import config
+
+# Initialize logger
+logger = logging.getLogger(__name__)
+
+
+class DescriptionCache:
+    """
+    **Description cache shared safely across processes.**
+
+    Every write is a single-row upsert in a SQLite database in WAL mode, so
+    readers never block writers and concurrent workers cannot lose each
+    other's entries. Entries older than `max_age_days` are treated as misses,
+    and the least recently used entries beyond `max_entries` are evicted
+    periodically. An existing JSON cache file is imported on first use.
+    """
+
+    # Writes between eviction passes
+    EVICTION_INTERVAL = 100
+    # Minimum seconds between last-access updates of an entry (keeps hits read-only)
+    TOUCH_INTERVAL_SECONDS = 3600
+
+    def __init__(self, db_path: Path, max_entries: Optional[int] = None,
+                 max_age_days: Optional[float] = None, legacy_json_path: Optional[Path] = None):
+        """
+        **Open (and if needed create) the cache database.**
+
+        Args:
+            db_path: SQLite database file
+            max_entries: Most entries kept (default: config.DESCRIPTION_CACHE_MAX_ENTRIES, 0 = unlimited)
+            max_age_days: Entry lifetime (default: config.DESCRIPTION_CACHE_MAX_AGE_DAYS, 0 = forever)
+            legacy_json_path: JSON cache file of earlier versions to import
+        """
+        self.db_path = db_path
+        self.max_entries = config.DESCRIPTION_CACHE_MAX_ENTRIES if max_entries is None else max_entries
+        self.max_age_days = config.DESCRIPTION_CACHE_MAX_AGE_DAYS if max_age_days is None else max_age_days
+        self._lock = threading.Lock()
+        self._writes = 0
+        self.hits = 0
+        self.misses = 0
+
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(str(db_path), timeout=30, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS descriptions ("
+            "key TEXT PRIMARY KEY, description TEXT NOT NULL, "
+            "created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS idx_descriptions_accessed ON descriptions (accessed_at)")
+        self._db.commit()
+
+        if legacy_json_path is not None and legacy_json_path.exists():
+            self._migrate_json(legacy_json_path)
+
+    def _migrate_json(self, json_path: Path):
+        """**Import a legacy JSON cache file** and rename it so it is imported only once."""
+        try:
+            with open(json_path, 'r', encoding='utf-8') as f:
+                entries = json.load(f)
+            now = time.time()
+            with self._lock, self._db:
+                self._db.executemany(
+                    "INSERT OR IGNORE INTO descriptions (key, description, created_at, accessed_at) "
+                    "VALUES (?, ?, ?, ?)",
+                    [(key, description, now, now) for key, description in entries.items()]
+                )
+            json_path.replace(json_path.with_name(json_path.name + ".migrated"))
+            logger.info(f"Migrated {len(entries)} descriptions from {json_path}")
+        except FileNotFoundError:
+            pass  # another worker migrated it first
+        except Exception as e:
+            logger.warning(f"Could not migrate description cache {json_path}: {e}")
+
+    def _expiry_cutoff(self) -> float:
+        """Creation time before which entries are expired (0 = nothing expires)"""
+        return time.time() - self.max_age_days * 86400 if self.max_age_days > 0 else 0.0
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        **Return the cached description for a key**, or None if missing or expired.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Cached description or None
+        """
+        with self._lock:
+            try:
+                row = self._db.execute(
+                    "SELECT description, created_at, accessed_at FROM descriptions WHERE key = ?", (key,)
+                ).fetchone()
+                if row is None or row[1] < self._expiry_cutoff():
+                    self.misses += 1
+                    return None
+
+                now = time.time()
+                if now - row[2] > self.TOUCH_INTERVAL_SECONDS:
+                    with self._db:
+                        self._db.execute("UPDATE descriptions SET accessed_at = ? WHERE key = ?", (now, key))
+                self.hits += 1
+                return row[0]
+            except sqlite3.Error as e:
+                logger.warning(f"Description cache read failed: {e}")
+                self.misses += 1
+                return None
+
+    def set(self, key: str, description: str):
+        """
+        **Store a description** (single-row upsert).
+
+        Args:
+            key: Cache key
+            description: Description text
+        """
+        now = time.time()
+        with self._lock:
+            try:
+                with self._db:
+                    self._db.execute(
+                        "INSERT OR REPLACE INTO descriptions (key, description, created_at, accessed_at) "
+                        "VALUES (?, ?, ?, ?)",
+                        (key, description, now, now)
+                    )
+                self._writes += 1
+                if self._writes % self.EVICTION_INTERVAL == 0:
+                    self._evict()
+            except sqlite3.Error as e:
+                logger.warning(f"Description cache write failed: {e}")
+
+    def _evict(self):
+        """**Delete expired entries and trim to `max_entries`** (caller holds the lock)."""
+        with self._db:
+            cutoff = self._expiry_cutoff()
+            if cutoff:
+                self._db.execute("DELETE FROM descriptions WHERE created_at < ?", (cutoff,))
+            if self.max_entries > 0:
+                self._db.execute(
+                    "DELETE FROM descriptions WHERE key IN ("
+                    "SELECT key FROM descriptions ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,)
+                )
+
+    def clear(self):
+        """**Delete all cached descriptions.**"""
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM descriptions")
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM descriptions").fetchone()[0]
+
+    def get_stats(self) -> dict:
+        """**Get cache size, limits and hit/miss counters.**"""
+        lookups = self.hits + self.misses
+        return {
+            "total_cached": len(self),
+            "max_entries": self.max_entries,
+            "max_age_days": self.max_age_days,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+        }
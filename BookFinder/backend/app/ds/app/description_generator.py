@@ -2,21 +2,35 @@
 Description Generator using OpenAI API
 Generates book descriptions/plot summaries from titles with caching
 """
-import json
 import hashlib
+import json
 import logging
-from typing import Optional
-from openai import OpenAI
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError, as_completed
+from typing import Callable, Optional
+from openai import APIConnectionError, APITimeoutError, InternalServerError, OpenAI, RateLimitError
 from pathlib import Path
 
 try:
     from .config import config
+    from .description_cache import DescriptionCache
+    from .hedging import LatencyTracker, hedged_call, timed
+    from .rate_limiter import RateLimiter
+    from .single_flight import SingleFlight
 except ImportError:
     from config import config
+    from description_cache import DescriptionCache
+    from hedging import LatencyTracker, hedged_call, timed
+    from rate_limiter import RateLimiter
+    from single_flight import SingleFlight
 
 # Initialize logger
 logger = logging.getLogger(__name__)
 
+# Transient API errors worth retrying in batch mode
+RETRYABLE_ERRORS = (RateLimitError, APITimeoutError, APIConnectionError, InternalServerError)
+
 
 class DescriptionGenerator:
     """
@@ -44,6 +58,19 @@ Output only the description. No extra text.
 
 Book Title: {title}"""
     
+    BULK_PROMPT_TEMPLATE = """You are a warm, clear, and insightful book-description assistant.
+For each book in the JSON array below (titles may be in Armenian or English), provide a concise English summary of the book.
+Focus on the core plot and main themes, the emotional tone and character journeys, and the genre and what makes the book meaningful or distinctive.
+
+Write in a natural, human-friendly style, but keep the wording straightforward so it can be used for semantic vector embeddings.
+Limit each description to under 200 words.
+
+If a book is not recognized, describe a closely related book with similar themes, tone, and genre so the result remains relevant for recommendation purposes.
+
+Output only a JSON array of {count} objects, one per input book and in the same order, each of the form {{"id": <input id>, "description": "<description>"}}. No extra text.
+
+Books: {books}"""
+    
     def __init__(self):
         """**Initialize the description generator with OpenAI client.**"""
         logger.info("Initializing DescriptionGenerator...")
@@ -54,78 +81,268 @@ Book Title: {title}"""
         else:
             logger.info("OpenAI API key found")
             try:
-                # Simple initialization - remove timeout and max_retries if causing issues
-                self.client = OpenAI(api_key=config.OPENAI_API_KEY)
+                # OPENAI_BASE_URL points the client at a compatible endpoint (e.g. stub_openai_server.py)
+                self.client = OpenAI(
+                    api_key=config.OPENAI_API_KEY,
+                    base_url=config.OPENAI_BASE_URL or None,
+                    timeout=config.OPENAI_TIMEOUT_SECONDS
+                )
                 logger.info("OpenAI client initialized successfully")
             except Exception as e:
                 logger.error(f"Error initializing OpenAI client: {e}")
                 logger.warning("Falling back to mock descriptions")
                 self.client = None
         
-        self.cache_path = config.get_cache_path('descriptions')
+        self.cache_path = config.CACHE_PATH / "descriptions_cache.sqlite"
         logger.debug(f"Cache path: {self.cache_path}")
-        self.cache = self._load_cache()
+        self.cache = DescriptionCache(self.cache_path, legacy_json_path=config.get_cache_path('descriptions'))
         logger.info(f"Loaded {len(self.cache)} cached descriptions")
-
-    def _load_cache(self) -> dict:
-        """**Load cached descriptions from disk.**"""
-        if self.cache_path.exists():
-            try:
-                with open(self.cache_path, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            except Exception as e:
-                logger.warning(f"Could not load cache: {e}")
-                return {}
-        return {}
+        
+        # Concurrent misses for the same title share one generation
+        self._in_flight = SingleFlight()
+        # Request/token budgets for batch generation
+        self.rate_limiter = RateLimiter(config.OPENAI_RPM_LIMIT, config.OPENAI_TPM_LIMIT)
+        self.bulk_requests = 0
+        self.bulk_fallbacks = 0
+        
+        # Generations outliving their caller's deadline finish here and fill the cache
+        self._background = ThreadPoolExecutor(max_workers=16, thread_name_prefix="describe-bg")
+        # Interactive API calls and their hedges
+        self._requests = ThreadPoolExecutor(max_workers=16, thread_name_prefix="openai")
+        self.latency = LatencyTracker()
+        self.hedged_requests = 0
+        self.deadline_fallbacks = 0
+        # Failed API calls (answered without a description, nothing cached)
+        self.failures = 0
     
-    def _save_cache(self):
-        """**Save cached descriptions to disk.**"""
-        try:
-            with open(self.cache_path, 'w', encoding='utf-8') as f:
-                json.dump(self.cache, f, indent=2, ensure_ascii=False)
-            logger.debug(f"Cache saved ({len(self.cache)} entries)")
-        except Exception as e:
-            logger.warning(f"Could not save cache: {e}")
+    @staticmethod
+    def cache_title(title: str) -> str:
+        """**Normalize a title the way cache keys do** (titles equal after this share a description)."""
+        return title.lower().strip()
     
     def _get_cache_key(self, title: str) -> str:
         """**Generate a cache key from the book title.**"""
-        return hashlib.md5(title.lower().strip().encode()).hexdigest()
+        return hashlib.md5(self.cache_title(title).encode()).hexdigest()
     
     def _generate_mock_description(self, title: str) -> str:
         """**Generate a mock description when API is not available.**"""
         return f"A compelling story about {title}. This book explores themes of adventure, " \
                f"personal growth, and the human condition through an engaging narrative."
     
-    def generate_description(self, title: str, use_cache: bool = True) -> str:
+    def _get_cached(self, title: str, cache_key: str, use_cache: bool) -> Optional[str]:
+        """**Return the cached description for a title**, or None on a miss."""
+        cached_desc = self.cache.get(cache_key) if use_cache else None
+        if cached_desc is not None:
+            logger.debug(f"Cache HIT for '{title}'")
+            logger.debug(f"Description preview: {cached_desc[:100]}...")
+            return cached_desc
+        logger.debug(f"Cache MISS for '{title}' - need to generate")
+        return None
+    
+    def generate_description(
+        self,
+        title: str,
+        use_cache: bool = True,
+        deadline: Optional[float] = None
+    ) -> Optional[str]:
         """
         **Generate a description for a single book title.**
         
+        Concurrent calls for the same (normalized) title are coalesced: only
+        one generation runs and the other callers receive its result.
+        
+        With a `deadline`, the caller waits at most until then and gets None
+        if the generation is not done; the generation keeps running in the
+        background and caches its result for the next search.
+        
         Args:
             title: Book title to generate description for
             use_cache: Whether to use cached results
+            deadline: `time.monotonic()` value to return by (None = wait for the result)
             
         Returns:
-            Generated description string
+            Generated description string, or None if the API call failed or
+            the deadline passed
         """
         logger.info(f"Processing book title: '{title}'")
         
         # Check cache first
         cache_key = self._get_cache_key(title)
-        if use_cache and cache_key in self.cache:
-            logger.debug(f"Cache HIT for '{title}'")
-            cached_desc = self.cache[cache_key]
-            logger.debug(f"Description preview: {cached_desc[:100]}...")
+        cached_desc = self._get_cached(title, cache_key, use_cache)
+        if cached_desc is not None:
             return cached_desc
+        if deadline is None:
+            return self._in_flight.do(cache_key, self._generate_and_cache, title, cache_key, use_cache)
         
-        logger.debug(f"Cache MISS for '{title}' - need to generate")
+        future = self._background.submit(
+            self._in_flight.do, cache_key, self._generate_and_cache, title, cache_key, use_cache
+        )
+        try:
+            return future.result(timeout=max(0.0, deadline - time.monotonic()))
+        except FutureTimeoutError:
+            return self._deadline_fallback(title)
+    
+    def _deadline_fallback(self, title: str) -> None:
+        """**Answer a generation that missed its deadline** (no description)."""
+        self.deadline_fallbacks += 1
+        logger.warning(f"Description for '{title}' missed its deadline "
+                       f"(generation continues in background)")
+        return None
+    
+    def _complete(self, prompt: str, max_tokens: int, rate_limited: bool = False) -> str:
+        """
+        **Run one chat completion and return the response text.**
+        
+        Interactive calls are hedged: once a call runs longer than the
+        OPENAI_HEDGE_PERCENTILE latency of recent calls, a second identical
+        request is sent and the first answer wins. In batch mode
+        (`rate_limited`) the call instead waits for the request/token budget
+        and transient errors (rate limits, timeouts, connection and server
+        errors) are retried with jittered exponential backoff.
+        
+        Args:
+            prompt: User message
+            max_tokens: Completion token limit
+            rate_limited: Apply the rate limiter and batch retries
+            
+        Returns:
+            Response text
+        """
+        messages = [
+            {
+                "role": "system",
+                "content": "You are a helpful book information assistant."
+            },
+            {
+                "role": "user",
+                "content": prompt
+            }
+        ]
+        if not rate_limited:
+            request = timed(lambda: self.client.chat.completions.create(
+                model=config.OPENAI_MODEL,
+                messages=messages,
+                temperature=config.OPENAI_TEMPERATURE,
+                max_tokens=max_tokens
+            ), self.latency)
+            hedge_after = (self.latency.percentile(config.OPENAI_HEDGE_PERCENTILE)
+                           if config.OPENAI_HEDGE_PERCENTILE > 0 else None)
+            response, hedged = hedged_call(self._requests, request, hedge_after)
+            if hedged:
+                self.hedged_requests += 1
+            return response.choices[0].message.content.strip()
+        
+        # Rough token estimate (~4 characters per token) plus the completion budget
+        estimated_tokens = sum(len(m["content"]) for m in messages) // 4 + max_tokens
+        client = self.client.with_options(max_retries=0)
+        for attempt in range(config.OPENAI_BATCH_MAX_RETRIES + 1):
+            self.rate_limiter.acquire(estimated_tokens)
+            try:
+                response = client.chat.completions.create(
+                    model=config.OPENAI_MODEL,
+                    messages=messages,
+                    temperature=config.OPENAI_TEMPERATURE,
+                    max_tokens=max_tokens
+                )
+            except RETRYABLE_ERRORS as e:
+                if attempt == config.OPENAI_BATCH_MAX_RETRIES:
+                    raise
+                delay = min(60.0, 2 ** attempt) * random.uniform(0.5, 1.5)
+                logger.warning(f"{type(e).__name__}, retrying in {delay:.1f}s "
+                               f"(attempt {attempt + 1}/{config.OPENAI_BATCH_MAX_RETRIES})")
+                time.sleep(delay)
+                continue
+            if response.usage is not None:
+                self.rate_limiter.record_usage(estimated_tokens, response.usage.total_tokens)
+            return response.choices[0].message.content.strip()
+    
+    def _request_description(self, title: str, rate_limited: bool = False) -> str:
+        """**Request a description for one title from the OpenAI API.**"""
+        return self._complete(self.PROMPT_TEMPLATE.format(title=title), config.OPENAI_MAX_TOKENS, rate_limited)
+    
+    def _request_bulk_descriptions(self, titles: list[str]) -> dict[int, str]:
+        """
+        **Request descriptions for several titles in one (rate-limited) completion.**
+        
+        Titles are sent as a JSON array of `{"id", "title"}` objects and the
+        model answers with a JSON array of `{"id", "description"}` objects.
+        
+        Args:
+            titles: Book titles
+            
+        Returns:
+            Valid descriptions by position in `titles` (may be incomplete)
+        """
+        books = json.dumps([{"id": i, "title": title} for i, title in enumerate(titles)], ensure_ascii=False)
+        prompt = self.BULK_PROMPT_TEMPLATE.format(count=len(titles), books=books)
+        content = self._complete(prompt, config.OPENAI_MAX_TOKENS * len(titles), rate_limited=True)
+        return self._parse_bulk_response(content, len(titles))
+    
+    @staticmethod
+    def _parse_bulk_response(content: str, count: int) -> dict[int, str]:
+        """
+        **Validate and split a bulk response.**
+        
+        Tolerates markdown code fences and text around the array; items with
+        an unknown id, a duplicate id or an empty description are dropped.
+        
+        Args:
+            content: Response text
+            count: Number of titles sent
+            
+        Returns:
+            Descriptions by input id
+        """
+        start, end = content.find("["), content.rfind("]")
+        try:
+            items = json.loads(content[start:end + 1]) if 0 <= start < end else None
+        except json.JSONDecodeError:
+            items = None
+        if not isinstance(items, list):
+            logger.warning("Bulk response is not a JSON array")
+            return {}
+        
+        descriptions = {}
+        for item in items:
+            if not isinstance(item, dict):
+                continue
+            item_id, description = item.get("id"), item.get("description")
+            if (isinstance(item_id, int) and 0 <= item_id < count and item_id not in descriptions
+                    and isinstance(description, str) and description.strip()):
+                descriptions[item_id] = description.strip()
+        return descriptions
+    
+    def _generate_and_cache(self, title: str, cache_key: str, use_cache: bool = True,
+                            rate_limited: bool = False) -> Optional[str]:
+        """
+        **Generate a description (OpenAI or mock) and cache it.**
+        
+        Mock descriptions are only used when no API key is configured. A
+        failed API call caches nothing and returns None, so the search falls
+        back to the title and is not cached as a complete response.
+        
+        Args:
+            title: Book title
+            cache_key: Cache key of the title
+            use_cache: Whether to use cached results
+            rate_limited: Apply the batch rate limiter and retries to the API call
+            
+        Returns:
+            Generated description string, or None if the API call failed
+        """
+        # A generation that finished just before this one started (here or in
+        # another worker process) has already filled the cache
+        if use_cache:
+            cached_desc = self.cache.get(cache_key)
+            if cached_desc is not None:
+                return cached_desc
         
         # If no API client, return mock description
         if self.client is None:
             logger.info(f"Using MOCK description (no API client) for '{title}'")
             description = self._generate_mock_description(title)
             logger.debug(f"Mock description: {description[:100]}...")
-            self.cache[cache_key] = description
-            self._save_cache()
+            self.cache.set(cache_key, description)
             return description
         
         # Generate using OpenAI
@@ -133,67 +350,140 @@ Book Title: {title}"""
             logger.info(f"Calling OpenAI API for '{title}'")
             logger.debug(f"Model: {config.OPENAI_MODEL}, Temperature: {config.OPENAI_TEMPERATURE}")
             
-            response = self.client.chat.completions.create(
-                model=config.OPENAI_MODEL,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are a helpful book information assistant."
-                    },
-                    {
-                        "role": "user",
-                        "content": self.PROMPT_TEMPLATE.format(title=title)
-                    }
-                ],
-                temperature=config.OPENAI_TEMPERATURE,
-                max_tokens=config.OPENAI_MAX_TOKENS
-            )
-            
-            description = response.choices[0].message.content.strip()
+            description = self._request_description(title, rate_limited)
             
             logger.info(f"OpenAI API response received for '{title}'")
             logger.debug(f"Generated description:\n{'-'*70}\n{description}\n{'-'*70}")
             
             # Cache the result
-            self.cache[cache_key] = description
-            self._save_cache()
+            self.cache.set(cache_key, description)
             
             return description
             
         except Exception as e:
-            logger.error(f"Error calling OpenAI API: {e}", exc_info=True)
-            logger.warning(f"Falling back to mock description for '{title}'")
-            description = self._generate_mock_description(title)
-            logger.debug(f"Mock description: {description[:100]}...")
-            return description
+            logger.error(f"Error calling OpenAI API for '{title}': {e}", exc_info=True)
+            self.failures += 1
+            return None
     
-    def batch_generate_descriptions(self, titles: list[str], use_cache: bool = True) -> dict[str, str]:
+    def _generate_chunk(self, chunk: list[tuple[str, str]], use_cache: bool) -> dict[str, Optional[str]]:
         """
-        **Generate descriptions for multiple book titles.**
+        **Generate and cache descriptions for a chunk of uncached titles.**
+        
+        Chunks of several titles go out as one bulk request; titles missing
+        from (or invalid in) the bulk response, and single-title chunks, are
+        generated with individual rate-limited calls.
         
         Args:
-            titles: List of book titles
+            chunk: (title, cache_key) pairs
             use_cache: Whether to use cached results
             
         Returns:
-            Dictionary mapping titles to descriptions
+            Dictionary mapping titles to descriptions (None where generation failed)
         """
         results = {}
-        for title in titles:
-            results[title] = self.generate_description(title, use_cache)
+        if len(chunk) > 1 and self.client is not None:
+            try:
+                bulk = self._request_bulk_descriptions([title for title, _ in chunk])
+            except Exception as e:
+                logger.error(f"Bulk request for {len(chunk)} titles failed: {e}")
+                bulk = {}
+            for i, (title, cache_key) in enumerate(chunk):
+                if i in bulk:
+                    self.cache.set(cache_key, bulk[i])
+                    results[title] = bulk[i]
+            self.bulk_requests += 1
+            self.bulk_fallbacks += len(chunk) - len(results)
+            if len(results) < len(chunk):
+                logger.warning(f"Bulk response covered {len(results)}/{len(chunk)} titles, "
+                               f"generating the rest individually")
+        
+        for title, cache_key in chunk:
+            if title not in results:
+                results[title] = self._in_flight.do(
+                    cache_key, self._generate_and_cache, title, cache_key, use_cache, True
+                )
         return results
     
+    def batch_generate_descriptions(
+        self,
+        titles: list[str],
+        use_cache: bool = True,
+        max_workers: Optional[int] = None,
+        progress_callback: Optional[Callable[[int, int], None]] = None,
+        bulk_size: Optional[int] = None
+    ) -> dict[str, str]:
+        """
+        **Generate descriptions for multiple book titles concurrently.**
+        
+        Cached titles are answered directly; the rest are packed `bulk_size`
+        titles per request and generated by a pool of `max_workers` threads,
+        within the OPENAI_RPM_LIMIT / OPENAI_TPM_LIMIT budgets and with
+        retries of transient API errors.
+        
+        Args:
+            titles: List of book titles
+            use_cache: Whether to use cached results
+            max_workers: Concurrent API calls (default: config.OPENAI_BATCH_CONCURRENCY)
+            progress_callback: Called as `progress_callback(done, total)` as titles complete
+            bulk_size: Titles per request (default: config.OPENAI_BULK_SIZE, 1 = one call per title)
+            
+        Returns:
+            Dictionary mapping titles to descriptions (titles whose generation
+            failed are left out)
+        """
+        results = {}
+        pending = []
+        for title in dict.fromkeys(titles):
+            cache_key = self._get_cache_key(title)
+            cached_desc = self.cache.get(cache_key) if use_cache else None
+            if cached_desc is not None:
+                results[title] = cached_desc
+            else:
+                pending.append((title, cache_key))
+        
+        total = len(results) + len(pending)
+        logger.info(f"Batch generation: {len(results)} cached, {len(pending)} to generate")
+        if progress_callback:
+            progress_callback(len(results), total)
+        if not pending:
+            return results
+        
+        max_workers = max_workers or config.OPENAI_BATCH_CONCURRENCY
+        bulk_size = max(1, bulk_size or config.OPENAI_BULK_SIZE)
+        chunks = [pending[i:i + bulk_size] for i in range(0, len(pending), bulk_size)]
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="describe") as executor:
+            futures = [executor.submit(self._generate_chunk, chunk, use_cache) for chunk in chunks]
+            for future in as_completed(futures):
+                before = len(results)
+                results.update(future.result())
+                done = len(results)
+                if progress_callback:
+                    progress_callback(done, total)
+                if done // 100 > before // 100 or done == total:
+                    logger.info(f"Batch generation progress: {done}/{total}")
+        failed = sum(1 for description in results.values() if description is None)
+        if failed:
+            logger.warning(f"Batch generation: {failed}/{total} titles failed")
+        return {title: results[title] for title in dict.fromkeys(titles) if results[title] is not None}
+    
     def clear_cache(self):
         """**Clear all cached descriptions.**"""
-        self.cache = {}
-        if self.cache_path.exists():
-            self.cache_path.unlink()
+        self.cache.clear()
         logger.info("Description cache cleared")
     
     def get_cache_stats(self) -> dict:
         """**Get statistics about the description cache.**"""
         return {
-            "total_cached": len(self.cache),
+            **self.cache.get_stats(),
+            "generations": self._in_flight.get_stats(),
+            "bulk": {"requests": self.bulk_requests, "fallbacks": self.bulk_fallbacks},
+            "latency": {
+                "p50_seconds": self.latency.percentile(50),
+                "p95_seconds": self.latency.percentile(95),
+                "hedged_requests": self.hedged_requests,
+                "deadline_fallbacks": self.deadline_fallbacks
+            },
+            "failures": self.failures,
             "cache_file": str(self.cache_path),
             "cache_exists": self.cache_path.exists()
         }
@@ -0,0 +1,140 @@
+"""
+Embedding model backends
+Loads the sentence embedding model either through PyTorch (sentence-transformers)
+or as an exported, int8-quantized ONNX model run by ONNX Runtime on CPU.
+Both produce interchangeable embeddings, so an index built with one backend
+is searchable with the other
+"""
+import json
+import logging
+import numpy as np
+from pathlib import Path
+from typing import List, Optional, Union
+
+try:
+    from .config import config
+except ImportError:
+    from config import config
+
+# Initialize logger
+logger = logging.getLogger(__name__)
+
+# torch: sentence-transformers on PyTorch, onnx: exported ONNX model on ONNX Runtime
+EMBEDDING_BACKENDS = ("torch", "onnx")
+
+# Description of an exported model, written by export_onnx_model.py
+ONNX_CONFIG_FILE = "embedding_config.json"
+
+
+class OnnxEmbeddingModel:
+    """
+    Sentence embeddings from an exported ONNX transformer
+
+    Reproduces the sentence-transformers pipeline of the exported model:
+    tokenization (HF `tokenizers`), the transformer (ONNX Runtime) and mean
+    pooling over the attention mask. Implements the parts of the
+    SentenceTransformer interface used by VectorStore.
+    """
+
+    def __init__(self, model_dir: Path, n_threads: Optional[int] = None):
+        """
+        Load an exported model
+
+        Args:
+            model_dir: Directory written by export_onnx_model.py
+            n_threads: ONNX Runtime intra-op threads (default: runtime decides)
+        """
+        import onnxruntime as ort
+        from tokenizers import Tokenizer
+
+        with open(model_dir / ONNX_CONFIG_FILE, 'r', encoding='utf-8') as f:
+            info = json.load(f)
+        self.model_name = info["model_name"]
+        self.embedding_dim = info["embedding_dim"]
+        self.max_seq_length = info["max_seq_length"]
+        self.output_name = info["output_name"]
+
+        self.tokenizer = Tokenizer.from_file(str(model_dir / "tokenizer.json"))
+        self.tokenizer.enable_truncation(max_length=self.max_seq_length)
+        self.tokenizer.enable_padding(pad_id=info["pad_token_id"], pad_token=info["pad_token"])
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if n_threads:
+            options.intra_op_num_threads = n_threads
+        self.session = ort.InferenceSession(
+            str(model_dir / info["model_file"]), options, providers=["CPUExecutionProvider"]
+        )
+        self.input_names = {model_input.name for model_input in self.session.get_inputs()}
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return self.embedding_dim
+
+    def encode(self, sentences: Union[str, List[str]], batch_size: int = 32,
+               convert_to_numpy: bool = True, show_progress_bar: bool = False, **kwargs) -> np.ndarray:
+        """
+        Embed texts (mean-pooled, not normalized)
+
+        Args:
+            sentences: Text or list of texts
+            batch_size: Texts per ONNX Runtime call
+
+        Returns:
+            float32 array of shape (n, embedding_dim), or (embedding_dim,) for a single string
+        """
+        single = isinstance(sentences, str)
+        texts = [sentences] if single else list(sentences)
+
+        batches = []
+        for start in range(0, len(texts), batch_size):
+            encodings = self.tokenizer.encode_batch(texts[start:start + batch_size])
+            attention_mask = np.array([e.attention_mask for e in encodings], dtype=np.int64)
+            feeds = {
+                "input_ids": np.array([e.ids for e in encodings], dtype=np.int64),
+                "attention_mask": attention_mask
+            }
+            if "token_type_ids" in self.input_names:
+                feeds["token_type_ids"] = np.array([e.type_ids for e in encodings], dtype=np.int64)
+
+            token_embeddings = self.session.run([self.output_name], feeds)[0]
+            mask = attention_mask[..., None].astype(np.float32)
+            pooled = (token_embeddings * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+            batches.append(pooled.astype(np.float32))
+
+        embeddings = np.vstack(batches) if batches else np.empty((0, self.embedding_dim), dtype=np.float32)
+        return embeddings[0] if single else embeddings
+
+
+def load_embedding_model(model_name: str, backend: Optional[str] = None):
+    """
+    Load the embedding model with the configured backend
+
+    The PyTorch stack is only imported for the torch backend, which keeps
+    startup time and memory of ONNX deployments low.
+
+    Args:
+        model_name: sentence-transformers model name
+        backend: torch or onnx (default: config.EMBEDDING_BACKEND)
+
+    Returns:
+        Model exposing encode() and get_sentence_embedding_dimension()
+    """
+    backend = (backend or config.EMBEDDING_BACKEND).lower()
+    if backend not in EMBEDDING_BACKENDS:
+        raise ValueError(f"Unknown embedding backend '{backend}'. Choose one of: {', '.join(EMBEDDING_BACKENDS)}")
+
+    if backend == "onnx":
+        model_dir = config.ONNX_MODEL_PATH
+        if not (model_dir / ONNX_CONFIG_FILE).exists():
+            raise FileNotFoundError(
+                f"No exported ONNX model in {model_dir}. Run export_onnx_model.py first."
+            )
+        model = OnnxEmbeddingModel(model_dir)
+        if model.model_name != model_name:
+            raise ValueError(
+                f"ONNX model in {model_dir} was exported from '{model.model_name}', not '{model_name}'"
+            )
+        return model
+
+    from sentence_transformers import SentenceTransformer
+    return SentenceTransformer(model_name)
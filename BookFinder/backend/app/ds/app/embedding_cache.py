@@ -0,0 +1,347 @@
+"""
+Embedding cache
+Bounded in-memory LRU of text embeddings with an optional size/age-bounded
+SQLite tier on disk, so repeated texts (cached LLM descriptions, popular
+queries) are encoded once
+"""
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+import numpy as np
+from collections import OrderedDict
+from pathlib import Path
+from typing import List, Optional, Sequence
+
+try:
+    from .config import config
+except ImportError:
+    from config import config
+
+# Initialize logger
+logger = logging.getLogger(__name__)
+
+
+def normalize_text(text: str) -> str:
+    """Whitespace-normalized text, so formatting differences share a cache entry"""
+    return " ".join(text.split())
+
+
+class EmbeddingCache:
+    """
+    LRU cache of normalized float32 embeddings
+
+    Keys are a SHA-256 of the model name and the whitespace-normalized text, so
+    entries of different models never mix. With a disk path, entries are also
+    written to a SQLite file and memory misses fall back to it, which keeps
+    embeddings across restarts and shares them between worker processes.
+    Disk entries unused for `disk_max_age_days` or beyond the
+    `disk_max_entries` most recently used are evicted on open and periodically.
+    """
+
+    # Disk rows written between eviction passes
+    EVICTION_INTERVAL = 1000
+    # Minimum seconds between last-access updates of a disk entry (keeps hits read-only)
+    TOUCH_INTERVAL_SECONDS = 3600
+
+    def __init__(self, model_name: str, max_entries: Optional[int] = None,
+                 disk_path: Optional[Path] = None, disk_max_entries: Optional[int] = None,
+                 disk_max_age_days: Optional[float] = None):
+        """
+        Initialize the cache
+
+        Args:
+            model_name: Embedding model the cached vectors belong to
+            max_entries: In-memory capacity (default: config.EMBEDDING_CACHE_MAX_ENTRIES, 0 = off)
+            disk_path: SQLite file for the persistent tier (None = memory only)
+            disk_max_entries: Most disk entries kept (default: config.EMBEDDING_CACHE_DISK_MAX_ENTRIES, 0 = unlimited)
+            disk_max_age_days: Days a disk entry is kept unused (default: config.EMBEDDING_CACHE_DISK_MAX_AGE_DAYS, 0 = forever)
+        """
+        self.model_name = model_name
+        self.max_entries = config.EMBEDDING_CACHE_MAX_ENTRIES if max_entries is None else max_entries
+        self.disk_path = disk_path
+        self.disk_max_entries = (config.EMBEDDING_CACHE_DISK_MAX_ENTRIES
+                                 if disk_max_entries is None else disk_max_entries)
+        self.disk_max_age_days = (config.EMBEDDING_CACHE_DISK_MAX_AGE_DAYS
+                                  if disk_max_age_days is None else disk_max_age_days)
+        self._entries = OrderedDict()  # key -> embedding
+        self._lock = threading.Lock()
+        self._disk_writes = 0
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.disk_evictions = 0
+
+        self._db: Optional[sqlite3.Connection] = None
+        if disk_path is not None:
+            try:
+                disk_path.parent.mkdir(parents=True, exist_ok=True)
+                self._db = sqlite3.connect(str(disk_path), timeout=5, check_same_thread=False)
+                self._db.execute("PRAGMA journal_mode=WAL")
+                self._db.execute(
+                    "CREATE TABLE IF NOT EXISTS embeddings ("
+                    "key TEXT PRIMARY KEY, vector BLOB NOT NULL, accessed_at REAL NOT NULL DEFAULT 0)"
+                )
+                # Files of earlier versions have no access times; their rows are evicted first
+                columns = [row[1] for row in self._db.execute("PRAGMA table_info(embeddings)")]
+                if "accessed_at" not in columns:
+                    self._db.execute("ALTER TABLE embeddings ADD COLUMN accessed_at REAL NOT NULL DEFAULT 0")
+                self._db.execute("CREATE INDEX IF NOT EXISTS idx_embeddings_accessed ON embeddings (accessed_at)")
+                self._db.commit()
+                self._evict_disk()
+            except sqlite3.Error as e:
+                logger.warning(f"Embedding disk cache unavailable ({e}), using memory only")
+                self._db = None
+
+    def make_key(self, text: str) -> str:
+        """Cache key of a text for this cache's model"""
+        payload = f"{self.model_name}\0{normalize_text(text)}".encode('utf-8')
+        return hashlib.sha256(payload).hexdigest()
+
+    def _remember(self, key: str, embedding: np.ndarray):
+        """Insert into the in-memory LRU (caller holds the lock)"""
+        self._entries[key] = embedding
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def _expiry_cutoff(self) -> float:
+        """Last-access time before which disk entries are expired (0 = nothing expires)"""
+        return time.time() - self.disk_max_age_days * 86400 if self.disk_max_age_days > 0 else 0.0
+
+    def _evict_disk(self):
+        """Delete expired disk entries and trim to `disk_max_entries` (caller holds the lock)"""
+        with self._db:
+            deleted = 0
+            cutoff = self._expiry_cutoff()
+            if cutoff:
+                deleted += self._db.execute("DELETE FROM embeddings WHERE accessed_at < ?", (cutoff,)).rowcount
+            if self.disk_max_entries > 0:
+                deleted += self._db.execute(
+                    "DELETE FROM embeddings WHERE key IN ("
+                    "SELECT key FROM embeddings ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)",
+                    (self.disk_max_entries,)
+                ).rowcount
+        self.disk_evictions += deleted
+
+    def _wrote_disk(self, rows: int):
+        """Count disk writes and run an eviction pass every EVICTION_INTERVAL rows (caller holds the lock)"""
+        before = self._disk_writes // self.EVICTION_INTERVAL
+        self._disk_writes += rows
+        if self._disk_writes // self.EVICTION_INTERVAL != before:
+            self._evict_disk()
+
+    def _touch(self, rows: Sequence[tuple]):
+        """Refresh the access time of disk hits last touched over TOUCH_INTERVAL_SECONDS ago (caller holds the lock)"""
+        now = time.time()
+        stale = [(now, key) for key, accessed_at in rows if now - accessed_at > self.TOUCH_INTERVAL_SECONDS]
+        if stale:
+            with self._db:
+                self._db.executemany("UPDATE embeddings SET accessed_at = ? WHERE key = ?", stale)
+
+    def get(self, text: str) -> Optional[np.ndarray]:
+        """
+        Cached embedding of a text
+
+        Args:
+            text: Text that was embedded
+
+        Returns:
+            Read-only embedding of shape (dim,), or None on a miss
+        """
+        key = self.make_key(text)
+        with self._lock:
+            embedding = self._entries.get(key)
+            if embedding is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return embedding
+
+            if self._db is not None:
+                try:
+                    row = self._db.execute(
+                        "SELECT vector, accessed_at FROM embeddings WHERE key = ?", (key,)
+                    ).fetchone()
+                    if row is not None:
+                        self._touch([(key, row[1])])
+                except sqlite3.Error as e:
+                    logger.warning(f"Embedding disk cache read failed: {e}")
+                    row = None
+                if row is not None:
+                    embedding = np.frombuffer(row[0], dtype='float32')
+                    if self.max_entries > 0:
+                        self._remember(key, embedding)
+                    self.disk_hits += 1
+                    return embedding
+
+            self.misses += 1
+            return None
+
+    def set(self, text: str, embedding: np.ndarray):
+        """
+        Store the embedding of a text
+
+        Args:
+            text: Text that was embedded
+            embedding: Normalized embedding of shape (dim,) or (1, dim)
+        """
+        if self.max_entries <= 0 and self._db is None:
+            return
+        key = self.make_key(text)
+        embedding = np.array(embedding, dtype='float32').reshape(-1)
+        embedding.setflags(write=False)
+        with self._lock:
+            if self.max_entries > 0:
+                self._remember(key, embedding)
+            if self._db is not None:
+                try:
+                    self._db.execute(
+                        "INSERT OR REPLACE INTO embeddings (key, vector, accessed_at) VALUES (?, ?, ?)",
+                        (key, embedding.tobytes(), time.time())
+                    )
+                    self._db.commit()
+                    self._wrote_disk(1)
+                except sqlite3.Error as e:
+                    logger.warning(f"Embedding disk cache write failed: {e}")
+
+    def get_many(self, texts: Sequence[str]) -> List[Optional[np.ndarray]]:
+        """
+        Cached embeddings of many texts, with batched disk lookups
+
+        Args:
+            texts: Texts that were embedded
+
+        Returns:
+            Embedding of shape (dim,) or None for each text
+        """
+        keys = [self.make_key(text) for text in texts]
+        results: List[Optional[np.ndarray]] = [None] * len(keys)
+        with self._lock:
+            missing = {}
+            for i, key in enumerate(keys):
+                embedding = self._entries.get(key)
+                if embedding is not None:
+                    self._entries.move_to_end(key)
+                    results[i] = embedding
+                    self.hits += 1
+                else:
+                    missing.setdefault(key, []).append(i)
+
+            if self._db is not None and missing:
+                pending = list(missing)
+                try:
+                    # Stay below SQLite's bound-parameter limit
+                    for start in range(0, len(pending), 500):
+                        chunk = pending[start:start + 500]
+                        rows = self._db.execute(
+                            f"SELECT key, vector, accessed_at FROM embeddings "
+                            f"WHERE key IN ({','.join('?' * len(chunk))})",
+                            chunk
+                        ).fetchall()
+                        self._touch([(key, accessed_at) for key, _, accessed_at in rows])
+                        for key, vector, _ in rows:
+                            embedding = np.frombuffer(vector, dtype='float32')
+                            if self.max_entries > 0:
+                                self._remember(key, embedding)
+                            for i in missing.pop(key):
+                                results[i] = embedding
+                                self.disk_hits += 1
+                except sqlite3.Error as e:
+                    logger.warning(f"Embedding disk cache read failed: {e}")
+
+            self.misses += sum(len(positions) for positions in missing.values())
+        return results
+
+    def set_many(self, texts: Sequence[str], embeddings: np.ndarray):
+        """
+        Store the embeddings of many texts (one disk transaction)
+
+        Args:
+            texts: Texts that were embedded
+            embeddings: Normalized embeddings of shape (len(texts), dim)
+        """
+        if self.max_entries <= 0 and self._db is None:
+            return
+        embeddings = np.asarray(embeddings, dtype='float32').reshape(len(texts), -1)
+        keys = [self.make_key(text) for text in texts]
+        with self._lock:
+            if self.max_entries > 0:
+                for key, embedding in zip(keys, embeddings):
+                    embedding = embedding.copy()
+                    embedding.setflags(write=False)
+                    self._remember(key, embedding)
+            if self._db is not None:
+                try:
+                    now = time.time()
+                    with self._db:
+                        self._db.executemany(
+                            "INSERT OR REPLACE INTO embeddings (key, vector, accessed_at) VALUES (?, ?, ?)",
+                            [(key, embedding.tobytes(), now) for key, embedding in zip(keys, embeddings)]
+                        )
+                    self._wrote_disk(len(keys))
+                except sqlite3.Error as e:
+                    logger.warning(f"Embedding disk cache write failed: {e}")
+
+    def retain(self, texts: Sequence[str]) -> int:
+        """
+        Drop every entry except those of the given texts
+
+        Args:
+            texts: Texts whose embeddings are kept
+
+        Returns:
+            Number of disk entries deleted
+        """
+        keys = {self.make_key(text) for text in texts}
+        with self._lock:
+            for key in [key for key in self._entries if key not in keys]:
+                del self._entries[key]
+            if self._db is None:
+                return 0
+            try:
+                with self._db:
+                    self._db.execute("CREATE TEMP TABLE IF NOT EXISTS retained (key TEXT PRIMARY KEY)")
+                    self._db.execute("DELETE FROM retained")
+                    self._db.executemany("INSERT INTO retained (key) VALUES (?)", [(key,) for key in keys])
+                    deleted = self._db.execute(
+                        "DELETE FROM embeddings WHERE key NOT IN (SELECT key FROM retained)"
+                    ).rowcount
+                    self._db.execute("DELETE FROM retained")
+            except sqlite3.Error as e:
+                logger.warning(f"Embedding disk cache prune failed: {e}")
+                return 0
+            self.disk_evictions += deleted
+            return deleted
+
+    def clear(self):
+        """Drop all cached embeddings (memory and disk)"""
+        with self._lock:
+            self._entries.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM embeddings")
+                self._db.commit()
+        logger.info("Embedding cache cleared")
+
+    def get_stats(self) -> dict:
+        """
+        Cache statistics for monitoring
+
+        Returns:
+            Dictionary with size, capacity, hit/miss/eviction counters and hit rate
+        """
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "disk_path": str(self.disk_path) if self._db is not None else None,
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "disk_evictions": self.disk_evictions,
+                "hit_rate": round((self.hits + self.disk_hits) / lookups, 4) if lookups else 0.0
+            }
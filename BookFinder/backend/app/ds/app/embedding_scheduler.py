@@ -0,0 +1,135 @@
+"""
+Embedding scheduler
+Micro-batches concurrent encode requests: texts arriving within a few
+milliseconds of each other are embedded in one model call and the results
+are handed back to each caller
+"""
+import logging
+import queue
+import threading
+import time
+import numpy as np
+from concurrent.futures import Future
+from typing import Callable, List, Optional
+
+try:
+    from .config import config
+except ImportError:
+    from config import config
+
+# Initialize logger
+logger = logging.getLogger(__name__)
+
+
+class EmbeddingScheduler:
+    """
+    Collects concurrent encode requests and embeds them as one batch
+
+    A single worker thread takes the first queued request, gathers more for
+    up to `max_wait_ms` (or until `max_batch_size` texts), encodes them with
+    one `encode_batch` call and resolves every caller's future. When no other
+    caller is waiting the batch is dispatched immediately, so an idle service
+    pays no batching delay; under load, requests queue up while the previous
+    batch is encoding and form the next batch on their own.
+    """
+
+    def __init__(self, encode_batch: Callable[[List[str]], np.ndarray],
+                 max_batch_size: Optional[int] = None, max_wait_ms: Optional[float] = None):
+        """
+        Initialize the scheduler and start its worker thread
+
+        Args:
+            encode_batch: Function embedding a list of texts into an (n, dim) array
+            max_batch_size: Most texts per batch (default: config.EMBEDDING_BATCH_MAX_SIZE)
+            max_wait_ms: Longest time a batch waits for more texts (default: config.EMBEDDING_BATCH_MAX_WAIT_MS)
+        """
+        self.encode_batch = encode_batch
+        self.max_batch_size = max(1, max_batch_size or config.EMBEDDING_BATCH_MAX_SIZE)
+        self.max_wait = (config.EMBEDDING_BATCH_MAX_WAIT_MS if max_wait_ms is None else max_wait_ms) / 1000
+        self._queue: "queue.Queue[tuple]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._waiting = 0  # callers inside encode()
+        self.batches = 0
+        self.texts = 0
+        self.max_batch_seen = 0
+
+        self._worker = threading.Thread(target=self._run, name="embedding-scheduler", daemon=True)
+        self._worker.start()
+
+    def encode(self, text: str) -> np.ndarray:
+        """
+        Embed one text as part of the next batch (blocks until it is encoded)
+
+        Args:
+            text: Text to embed
+
+        Returns:
+            Embedding of shape (dim,)
+        """
+        future: Future = Future()
+        with self._lock:
+            self._waiting += 1
+        try:
+            self._queue.put((text, future))
+            return future.result()
+        finally:
+            with self._lock:
+                self._waiting -= 1
+
+    def _collect_batch(self) -> list:
+        """Block for the first request, then gather more until the batch is full or the wait is over"""
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+                continue
+            except queue.Empty:
+                pass
+            remaining = deadline - time.monotonic()
+            with self._lock:
+                others_waiting = self._waiting > len(batch)
+            if remaining <= 0 or not others_waiting:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        """Worker loop: encode batches and resolve the callers' futures"""
+        while True:
+            batch = self._collect_batch()
+            texts = [text for text, _ in batch]
+            try:
+                embeddings = self.encode_batch(texts)
+            except Exception as e:
+                logger.warning(f"Batch encoding of {len(texts)} texts failed: {e}")
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+
+            with self._lock:
+                self.batches += 1
+                self.texts += len(texts)
+                self.max_batch_seen = max(self.max_batch_seen, len(texts))
+            for (_, future), embedding in zip(batch, embeddings):
+                future.set_result(embedding)
+
+    def get_stats(self) -> dict:
+        """
+        Batching statistics for monitoring
+
+        Returns:
+            Dictionary with batch and text counts and the average/largest batch size
+        """
+        with self._lock:
+            return {
+                "max_batch_size": self.max_batch_size,
+                "max_wait_ms": self.max_wait * 1000,
+                "batches": self.batches,
+                "texts": self.texts,
+                "avg_batch_size": round(self.texts / self.batches, 2) if self.batches else 0.0,
+                "largest_batch": self.max_batch_seen
+            }
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Export the embedding model to ONNX
+Writes the transformer as an ONNX graph, quantizes its weights to int8 and
+saves the tokenizer, for EMBEDDING_BACKEND=onnx. Run once per model, then
+check parity with benchmark_embeddings.py
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+
+# Add app to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from config import config
+from embedding_backends import ONNX_CONFIG_FILE
+
+
+def export(model_name: str, output_dir: Path, quantize: bool = True, opset: int = 14) -> Path:
+    """
+    Export a sentence-transformers model for the ONNX backend
+
+    Args:
+        model_name: sentence-transformers model name
+        output_dir: Directory for model, tokenizer and embedding_config.json
+        quantize: Quantize weights to int8 (dynamic quantization)
+        opset: ONNX opset version
+
+    Returns:
+        Path of the model file used by the ONNX backend
+    """
+    import torch
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+    from sentence_transformers import SentenceTransformer
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+    sentence_model = SentenceTransformer(model_name, device="cpu")
+    transformer = sentence_model[0]
+    pooling = sentence_model[1]
+    if not getattr(pooling, "pooling_mode_mean_tokens", False):
+        raise ValueError(f"'{model_name}' does not use mean pooling, which is what the ONNX backend implements")
+
+    auto_model = transformer.auto_model.eval()
+    tokenizer = transformer.tokenizer
+
+    # Trace the transformer with a small batch; batch and sequence axes stay dynamic
+    dummy = tokenizer(["A short example sentence.", "Another one"], padding=True, return_tensors="pt")
+    input_names = [name for name in ("input_ids", "attention_mask", "token_type_ids") if name in dummy]
+    dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in input_names}
+    dynamic_axes["token_embeddings"] = {0: "batch", 1: "sequence"}
+
+    fp32_path = output_dir / "model.onnx"
+    print(f"Exporting {model_name} to {fp32_path}...")
+    with torch.no_grad():
+        torch.onnx.export(
+            auto_model,
+            tuple(dummy[name] for name in input_names),
+            str(fp32_path),
+            input_names=input_names,
+            output_names=["token_embeddings"],
+            dynamic_axes=dynamic_axes,
+            opset_version=opset
+        )
+
+    model_path = fp32_path
+    if quantize:
+        model_path = output_dir / "model_int8.onnx"
+        print(f"Quantizing weights to int8: {model_path}...")
+        quantize_dynamic(str(fp32_path), str(model_path), weight_type=QuantType.QInt8)
+
+    tokenizer.save_pretrained(str(output_dir))
+    with open(output_dir / ONNX_CONFIG_FILE, 'w', encoding='utf-8') as f:
+        json.dump({
+            "model_name": model_name,
+            "model_file": model_path.name,
+            "output_name": "token_embeddings",
+            "embedding_dim": sentence_model.get_sentence_embedding_dimension(),
+            "max_seq_length": sentence_model.max_seq_length,
+            "pad_token_id": tokenizer.pad_token_id,
+            "pad_token": tokenizer.pad_token,
+            "quantized": quantize
+        }, f, indent=2)
+    return model_path
+
+
+def main():
+    """Export the configured embedding model"""
+    parser = argparse.ArgumentParser(description="Export the embedding model to (int8) ONNX")
+    parser.add_argument("--model", default=config.EMBEDDING_MODEL, help="sentence-transformers model name")
+    parser.add_argument("--output-dir", type=Path, default=config.ONNX_MODEL_PATH, help="Output directory")
+    parser.add_argument("--no-quantize", action="store_true", help="Keep float32 weights")
+    args = parser.parse_args()
+
+    try:
+        model_path = export(args.model, args.output_dir, quantize=not args.no_quantize)
+        print(f"\n✅ ONNX model written: {model_path} ({model_path.stat().st_size / 1024 / 1024:.1f} MB)")
+        print(f"   Set EMBEDDING_BACKEND=onnx (and ONNX_MODEL_PATH={args.output_dir}) to use it")
+        return 0
+    except Exception as e:
+        print(f"\n❌ ERROR: Failed to export model")
+        print(f"   {type(e).__name__}: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
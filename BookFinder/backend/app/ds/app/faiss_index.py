@@ -0,0 +1,290 @@
+"""
+FAISS index construction and loading
+Builds the index type selected in config (exact, approximate or quantized) for
+normalized embeddings, reads it into memory or memory-maps it, applies its
+search-time parameters and re-ranks quantized search results with the exact vectors
+"""
+import logging
+import math
+import numpy as np
+import faiss
+from pathlib import Path
+from typing import Optional, Tuple
+
+try:
+    from .config import config
+except ImportError:
+    from config import config
+
+# Initialize logger
+logger = logging.getLogger(__name__)
+
+# flat: exact brute-force search, hnsw: graph-based ANN, ivf: inverted lists with nprobe,
+# sq8: 8-bit scalar quantization (4x smaller), pq: product quantization,
+# ivfpq: inverted lists over product-quantized codes
+INDEX_TYPES = ("flat", "hnsw", "ivf", "sq8", "pq", "ivfpq")
+
+# Index types storing lossy codes; their results are re-ranked with the exact vectors
+QUANTIZED_INDEX_TYPES = ("sq8", "pq", "ivfpq")
+
+# memory: read the index into process memory, mmap: share one copy through the page cache
+INDEX_LOAD_MODES = ("memory", "mmap")
+
+
+def get_index_params(index_type: Optional[str] = None) -> dict:
+    """
+    Build and search parameters for an index type, taken from config
+
+    Args:
+        index_type: One of INDEX_TYPES (default: config.INDEX_TYPE)
+
+    Returns:
+        Dict with 'index_type' and the parameters relevant to it
+    """
+    index_type = (index_type or config.INDEX_TYPE).lower()
+    if index_type not in INDEX_TYPES:
+        raise ValueError(f"Unknown index type '{index_type}'. Choose one of: {', '.join(INDEX_TYPES)}")
+
+    params = {"index_type": index_type}
+    if index_type == "hnsw":
+        params.update(
+            hnsw_m=config.HNSW_M,
+            hnsw_ef_construction=config.HNSW_EF_CONSTRUCTION,
+            hnsw_ef_search=config.HNSW_EF_SEARCH
+        )
+    if index_type in ("ivf", "ivfpq"):
+        params.update(
+            ivf_nlist=config.IVF_NLIST,
+            ivf_nprobe=config.IVF_NPROBE
+        )
+    if index_type in ("pq", "ivfpq"):
+        params.update(
+            pq_m=config.PQ_M,
+            pq_nbits=config.PQ_NBITS
+        )
+    return params
+
+
+def get_search_params() -> dict:
+    """Search-time parameters from config, applied to every loaded index"""
+    return {
+        "hnsw_ef_search": config.HNSW_EF_SEARCH,
+        "ivf_nprobe": config.IVF_NPROBE
+    }
+
+
+def default_nlist(n_vectors: int) -> int:
+    """
+    Number of IVF lists for a collection size
+
+    Uses the common 4*sqrt(n) rule, capped so every list gets at least
+    39 training points (below that FAISS k-means warns and degrades).
+    """
+    return max(1, min(int(4 * math.sqrt(n_vectors)), n_vectors // 39))
+
+
+def _pq_nbits(params: dict, n_vectors: int) -> int:
+    """Bits per PQ code, reduced for collections smaller than the 2^nbits centroids to train"""
+    nbits = params["pq_nbits"]
+    while nbits > 1 and n_vectors < (1 << nbits):
+        nbits -= 1
+    params["pq_nbits"] = nbits
+    return nbits
+
+
+def build_index(embeddings: np.ndarray, params: dict) -> faiss.Index:
+    """
+    Build an inner-product FAISS index over normalized embeddings
+
+    Args:
+        embeddings: Normalized embeddings of shape (n, dim)
+        params: Parameters from get_index_params(); the resolved IVF list
+            count and PQ code size are written back into it
+
+    Returns:
+        Populated FAISS index, ready for searching
+    """
+    embeddings = np.ascontiguousarray(embeddings, dtype='float32')
+    n_vectors, dim = embeddings.shape
+    index_type = params["index_type"]
+
+    if index_type == "flat":
+        index = faiss.IndexFlatIP(dim)
+    elif index_type == "hnsw":
+        index = faiss.IndexHNSWFlat(dim, params["hnsw_m"], faiss.METRIC_INNER_PRODUCT)
+        index.hnsw.efConstruction = params["hnsw_ef_construction"]
+    elif index_type == "ivf":
+        nlist = min(params.get("ivf_nlist") or default_nlist(n_vectors), n_vectors)
+        params["ivf_nlist"] = nlist
+        quantizer = faiss.IndexFlatIP(dim)
+        index = faiss.IndexIVFFlat(quantizer, dim, nlist, faiss.METRIC_INNER_PRODUCT)
+        logger.info(f"Training IVF index with {nlist} lists on {n_vectors} vectors")
+        index.train(embeddings)
+    elif index_type == "sq8":
+        index = faiss.IndexScalarQuantizer(dim, faiss.ScalarQuantizer.QT_8bit, faiss.METRIC_INNER_PRODUCT)
+        index.train(embeddings)
+    elif index_type == "pq":
+        if dim % params["pq_m"]:
+            raise ValueError(f"PQ_M={params['pq_m']} must divide the embedding dimension {dim}")
+        index = faiss.IndexPQ(dim, params["pq_m"], _pq_nbits(params, n_vectors), faiss.METRIC_INNER_PRODUCT)
+        logger.info(f"Training PQ index ({params['pq_m']}x{params['pq_nbits']} bits) on {n_vectors} vectors")
+        index.train(embeddings)
+    elif index_type == "ivfpq":
+        if dim % params["pq_m"]:
+            raise ValueError(f"PQ_M={params['pq_m']} must divide the embedding dimension {dim}")
+        nlist = min(params.get("ivf_nlist") or default_nlist(n_vectors), n_vectors)
+        params["ivf_nlist"] = nlist
+        quantizer = faiss.IndexFlatIP(dim)
+        index = faiss.IndexIVFPQ(quantizer, dim, nlist, params["pq_m"], _pq_nbits(params, n_vectors),
+                                 faiss.METRIC_INNER_PRODUCT)
+        logger.info(f"Training IVF-PQ index with {nlist} lists on {n_vectors} vectors")
+        index.train(embeddings)
+    else:
+        raise ValueError(f"Unknown index type '{index_type}'. Choose one of: {', '.join(INDEX_TYPES)}")
+
+    index.add(embeddings)
+    prepare_index(index, params)
+    return index
+
+
+def prepare_index(index: faiss.Index, params: dict) -> faiss.Index:
+    """
+    Apply search-time parameters and enable vector reconstruction
+
+    Sets efSearch on HNSW indexes and nprobe on IVF indexes, and gives IVF
+    indexes a direct map so stored vectors can be looked up by row
+    ("more like this", batch kNN). Parameters that do not apply are ignored.
+
+    Args:
+        index: Built or loaded FAISS index
+        params: Dict with optional 'hnsw_ef_search' and 'ivf_nprobe'
+
+    Returns:
+        The same index
+    """
+    if not isinstance(index, faiss.Index):
+        return index
+    ivf = faiss.try_extract_index_ivf(index)
+    if ivf is not None:
+        if params.get("ivf_nprobe"):
+            ivf.nprobe = min(params["ivf_nprobe"], ivf.nlist)
+        if ivf.direct_map.no():
+            ivf.make_direct_map()
+
+    if hasattr(index, "hnsw") and params.get("hnsw_ef_search"):
+        index.hnsw.efSearch = params["hnsw_ef_search"]
+    return index
+
+
+class MmapFlatIndex:
+    """
+    Read-only exact inner-product index over memory-mapped vectors
+
+    FAISS reads flat indexes into private process memory, even with
+    IO_FLAG_MMAP. Searching the memory-mapped books_vectors.npy directly
+    instead lets every worker process on a node share one copy of the vectors
+    through the OS page cache, and "loading" only maps the file.
+
+    Implements the part of the faiss.Index interface used by VectorStore.
+    """
+
+    # Queries scored per matrix product, bounding the (queries x ntotal) score matrix
+    QUERY_BLOCK_SIZE = 64
+
+    def __init__(self, vectors: np.ndarray):
+        self.vectors = vectors
+        self.ntotal, self.d = vectors.shape
+
+    def search(self, queries: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Exact top-k by inner product, shaped like faiss.Index.search"""
+        k = min(k, self.ntotal)
+        similarities = np.empty((len(queries), k), dtype='float32')
+        indices = np.empty((len(queries), k), dtype='int64')
+        for start in range(0, len(queries), self.QUERY_BLOCK_SIZE):
+            block = slice(start, start + self.QUERY_BLOCK_SIZE)
+            scores = queries[block] @ self.vectors.T
+            if k < self.ntotal:
+                top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+            else:
+                top = np.broadcast_to(np.arange(self.ntotal), scores.shape)
+            top_scores = np.take_along_axis(scores, top, axis=1)
+            order = np.argsort(-top_scores, axis=1)
+            similarities[block] = np.take_along_axis(top_scores, order, axis=1)
+            indices[block] = np.take_along_axis(top, order, axis=1)
+        return similarities, indices
+
+    def reconstruct(self, row: int) -> np.ndarray:
+        """Stored vector of one row"""
+        return np.array(self.vectors[row], dtype='float32')
+
+    def reconstruct_n(self, start: int, n: int) -> np.ndarray:
+        """Stored vectors of n consecutive rows"""
+        return np.array(self.vectors[start:start + n], dtype='float32')
+
+
+def read_index(index_path: Path, index_type: str, vectors: Optional[np.ndarray] = None,
+               load_mode: Optional[str] = None):
+    """
+    Load a saved index in the configured load mode
+
+    In mmap mode a flat index is served from the memory-mapped exact vectors
+    (the FAISS file is not read at all) and other index types are opened with
+    IO_FLAG_MMAP, which maps the inverted lists of IVF indexes. Index types
+    FAISS cannot map (HNSW graphs, sq8/pq codes) are read into memory.
+
+    Args:
+        index_path: Path of the .faiss file
+        index_type: Type recorded when the index was built
+        vectors: Memory-mapped exact vectors, if available
+        load_mode: memory or mmap (default: config.INDEX_LOAD_MODE)
+
+    Returns:
+        Loaded index (a faiss.Index or MmapFlatIndex)
+    """
+    load_mode = (load_mode or config.INDEX_LOAD_MODE).lower()
+    if load_mode not in INDEX_LOAD_MODES:
+        raise ValueError(f"Unknown index load mode '{load_mode}'. Choose one of: {', '.join(INDEX_LOAD_MODES)}")
+
+    if load_mode == "mmap":
+        if index_type == "flat" and vectors is not None:
+            return MmapFlatIndex(vectors)
+        try:
+            return faiss.read_index(str(index_path), faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY)
+        except RuntimeError as e:
+            logger.warning(f"Memory-mapped read of {index_path} failed ({e}), reading it into memory")
+    return faiss.read_index(str(index_path))
+
+
+def search_index(index, queries: np.ndarray, k: int,
+                 vectors: Optional[np.ndarray] = None, rerank_factor: int = 0) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Search an index, optionally re-ranking candidates with exact vectors
+
+    With `vectors` and `rerank_factor` > 1, the index returns `k * rerank_factor`
+    candidates whose exact inner products are then computed from `vectors`
+    (typically a memory map, so only the candidate rows are read). This
+    recovers the recall lost to quantization at a small CPU cost.
+
+    Args:
+        index: FAISS index
+        queries: Normalized float32 queries of shape (n, dim)
+        k: Number of results per query
+        vectors: Exact vectors aligned with the index rows (None = no re-ranking)
+        rerank_factor: Candidates fetched per requested result
+
+    Returns:
+        (similarities, indices) arrays of shape (n, k), like faiss.Index.search
+    """
+    if vectors is None or rerank_factor <= 1:
+        return index.search(queries, k)
+
+    _, candidates = index.search(queries, min(k * rerank_factor, index.ntotal))
+    similarities = np.full((len(queries), k), -np.inf, dtype='float32')
+    indices = np.full((len(queries), k), -1, dtype='int64')
+    for row, (query, candidate_ids) in enumerate(zip(queries, candidates)):
+        candidate_ids = candidate_ids[candidate_ids >= 0]
+        exact = vectors[candidate_ids] @ query
+        best = np.argsort(-exact)[:k]
+        similarities[row, :len(best)] = exact[best]
+        indices[row, :len(best)] = candidate_ids[best]
+    return similarities, indices
@@ -0,0 +1,92 @@
+"""
+Hedged requests
+Tracks the latency distribution of a remote call and, once a call runs longer
+than a high percentile of it, starts a second identical call and takes
+whichever answers first
+"""
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Executor, wait
+from typing import Any, Callable, Optional, Tuple
+
+# Initialize logger
+logger = logging.getLogger(__name__)
+
+
+class LatencyTracker:
+    """
+    **Sliding window of recent call latencies.**
+
+    Percentiles are only reported once `min_samples` latencies were recorded,
+    so hedging does not start from a cold, unrepresentative window.
+    """
+
+    def __init__(self, window: int = 200, min_samples: int = 20):
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self.min_samples = min_samples
+
+    def record(self, seconds: float):
+        """**Record the latency of a successful call.**"""
+        with self._lock:
+            self._samples.append(seconds)
+
+    def percentile(self, p: float) -> Optional[float]:
+        """
+        **Latency below which `p` percent of recorded calls finished.**
+
+        Returns:
+            Seconds, or None while fewer than `min_samples` calls were recorded
+        """
+        with self._lock:
+            if len(self._samples) < self.min_samples:
+                return None
+            ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * p / 100))]
+
+
+def hedged_call(executor: Executor, fn: Callable[[], Any], hedge_after: Optional[float]) -> Tuple[Any, bool]:
+    """
+    **Run `fn`, hedging with a second call if the first is slow.**
+
+    The losing call is not cancelled (a blocking HTTP request cannot be); its
+    result is discarded. If one call fails, the other one's outcome is used.
+
+    Args:
+        executor: Pool running the calls
+        fn: Call without arguments
+        hedge_after: Seconds before the hedge is sent (None = no hedging)
+
+    Returns:
+        (result, whether a hedge was sent)
+    """
+    if hedge_after is None:
+        return fn(), False
+
+    first = executor.submit(fn)
+    done, _ = wait([first], timeout=hedge_after)
+    if done:
+        return first.result(), False
+
+    logger.info(f"Call exceeded {hedge_after:.2f}s, sending hedged request")
+    pending = {first, executor.submit(fn)}
+    error = None
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            if future.exception() is None:
+                return future.result(), True
+            error = future.exception()
+    raise error
+
+
+def timed(fn: Callable[[], Any], tracker: LatencyTracker) -> Callable[[], Any]:
+    """**Wrap `fn` so the latency of each successful call is recorded in `tracker`.**"""
+    def call():
+        start = time.monotonic()
+        result = fn()
+        tracker.record(time.monotonic() - start)
+        return result
+    return call
@@ -0,0 +1,33 @@
+"""
+ISBN normalization
+Canonical ISBN / book ID form shared by the DS package, the backend and the
+ETL service (its image copies this file at build time), so every component
+joins books on the same key. Standard library only.
+"""
+
+
+def normalize_isbn(isbn) -> str:
+    """
+    Canonical form of an ISBN / book ID
+    
+    Undoes float formatting introduced by pandas ('5170390688.0' -> '5170390688'),
+    drops hyphens and spaces and uppercases the 'X' check digit.
+    
+    Args:
+        isbn: ISBN as string, int or float (None/NaN give '')
+        
+    Returns:
+        Canonical ISBN string
+    """
+    if isbn is None:
+        return ''
+    if isinstance(isbn, float):
+        if isbn != isbn:  # NaN
+            return ''
+        if isbn.is_integer():
+            isbn = int(isbn)
+    
+    text = str(isbn).strip()
+    if text.endswith('.0') and text[:-2].isdigit():
+        text = text[:-2]
+    return text.replace('-', '').replace(' ', '').upper()
@@ -0,0 +1,95 @@
+"""
+Rate limiting for LLM API calls
+Token buckets enforcing requests-per-minute and tokens-per-minute budgets
+across all threads of a process
+"""
+import logging
+import threading
+import time
+
+# Initialize logger
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """
+    **Token bucket refilled continuously at `per_minute / 60` tokens per second.**
+
+    Starts full, so a burst of up to one minute's budget is allowed.
+    """
+
+    def __init__(self, per_minute: float):
+        self.rate = per_minute / 60.0
+        self.capacity = float(per_minute)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def refill(self, now: float):
+        """**Add the tokens accrued since the last refill.**"""
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float) -> float:
+        """**Seconds until `amount` tokens are available** (0 if they are now)."""
+        amount = min(amount, self.capacity)
+        return max(0.0, (amount - self.tokens) / self.rate)
+
+
+class RateLimiter:
+    """
+    **Requests-per-minute and tokens-per-minute limiter.**
+
+    `acquire()` blocks until both budgets allow the request, then charges it.
+    A limit of 0 disables that budget.
+    """
+
+    def __init__(self, requests_per_minute: float, tokens_per_minute: float):
+        """
+        **Initialize the limiter.**
+
+        Args:
+            requests_per_minute: Request budget (0 = unlimited)
+            tokens_per_minute: Token budget (0 = unlimited)
+        """
+        self._requests = TokenBucket(requests_per_minute) if requests_per_minute > 0 else None
+        self._tokens = TokenBucket(tokens_per_minute) if tokens_per_minute > 0 else None
+        self._lock = threading.Lock()
+        self.waited_seconds = 0.0
+
+    def acquire(self, tokens: int = 0):
+        """
+        **Block until one request of `tokens` tokens fits both budgets.**
+
+        Args:
+            tokens: Estimated tokens of the request (prompt + completion)
+        """
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                wait = 0.0
+                for bucket, amount in ((self._requests, 1), (self._tokens, tokens)):
+                    if bucket is not None:
+                        bucket.refill(now)
+                        wait = max(wait, bucket.wait_time(amount))
+                if wait == 0.0:
+                    if self._requests is not None:
+                        self._requests.tokens -= 1
+                    if self._tokens is not None:
+                        self._tokens.tokens -= min(tokens, self._tokens.capacity)
+                    return
+                self.waited_seconds += wait
+            time.sleep(wait)
+
+    def record_usage(self, estimated_tokens: int, actual_tokens: int):
+        """
+        **Correct the token budget** once the actual usage of a request is known.
+
+        Args:
+            estimated_tokens: Tokens charged by acquire()
+            actual_tokens: Tokens reported by the API
+        """
+        if self._tokens is None:
+            return
+        with self._lock:
+            self._tokens.refill(time.monotonic())
+            self._tokens.tokens -= actual_tokens - estimated_tokens
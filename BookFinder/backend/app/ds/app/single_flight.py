@@ -0,0 +1,83 @@
+"""
+Single-flight request coalescing
+Runs at most one call per key at a time; concurrent callers with the same key
+wait for the in-flight call and share its result
+"""
+import logging
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Tuple
+
+# Initialize logger
+logger = logging.getLogger(__name__)
+
+
+class SingleFlight:
+    """
+    **Per-key request coalescing for threads.**
+
+    The first caller for a key (the leader) runs the function; callers
+    arriving while it runs block on a shared future and receive the
+    leader's result (or exception) instead of repeating the work.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[str, Future] = {}
+        self.leaders = 0
+        self.coalesced = 0
+
+    def _join(self, key: str) -> Tuple[Future, bool]:
+        """**Return the in-flight future for a key** and whether the caller leads it."""
+        with self._lock:
+            future = self._calls.get(key)
+            if future is not None:
+                self.coalesced += 1
+                return future, False
+            future = Future()
+            self._calls[key] = future
+            self.leaders += 1
+            return future, True
+
+    def _finish(self, key: str, future: Future, result: Any = None, error: BaseException = None):
+        """**Publish the leader's outcome** and allow the next call for the key."""
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+        with self._lock:
+            if self._calls.get(key) is future:
+                del self._calls[key]
+
+    def do(self, key: str, fn: Callable, *args, **kwargs) -> Any:
+        """
+        **Run `fn` once per key among concurrent threads.**
+
+        Args:
+            key: Coalescing key
+            fn: Function to run if no call for the key is in flight
+            *args, **kwargs: Arguments for fn
+
+        Returns:
+            Result of the (possibly shared) call
+        """
+        future, leader = self._join(key)
+        if not leader:
+            logger.debug(f"Joining in-flight call for key {key}")
+            return future.result()
+        try:
+            result = fn(*args, **kwargs)
+        except BaseException as e:
+            self._finish(key, future, error=e)
+            raise
+        self._finish(key, future, result)
+        return result
+
+    def get_stats(self) -> dict:
+        """**Get the number of executed and coalesced calls.**"""
+        with self._lock:
+            return {
+                "in_flight": len(self._calls),
+                "executed": self.leaders,
+                "coalesced": self.coalesced
+            }
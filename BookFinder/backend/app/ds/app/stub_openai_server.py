@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Local stub of the OpenAI chat completions API
+Answers /v1/chat/completions with canned descriptions after a configurable
+latency (bulk prompts answered with a JSON array, optionally dropping items)
+and injects rate-limit errors, for exercising batch generation without
+API spend. Point the DS service at it with OPENAI_BASE_URL=http://localhost:8089/v1
+"""
+import argparse
+import json
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def describe(title: str) -> str:
+    """Canned description of a title"""
+    return f"A stub description of {title}: a story of discovery, conflict and growth."
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Minimal chat completions endpoint"""
+
+    latency_ms = 200.0
+    error_rate = 0.0
+    drop_rate = 0.0
+    requests = 0
+    lock = threading.Lock()
+
+    def log_message(self, format, *args):
+        pass  # keep the console quiet under load
+
+    def _send(self, status: int, payload: dict):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        request = json.loads(self.rfile.read(length) or b"{}")
+        with StubHandler.lock:
+            StubHandler.requests += 1
+
+        if not self.path.endswith("/chat/completions"):
+            self._send(404, {"error": {"message": "Not found"}})
+            return
+
+        time.sleep(random.uniform(0.5, 1.5) * self.latency_ms / 1000)
+        if random.random() < self.error_rate:
+            self._send(429, {"error": {"message": "Rate limit reached (stub)", "type": "rate_limit_error"}})
+            return
+
+        prompt = request["messages"][-1]["content"]
+        if "Books:" in prompt:
+            books = json.loads(prompt.rsplit("Books:", 1)[-1])
+            content = json.dumps([
+                {"id": book["id"], "description": describe(book["title"])}
+                for book in books if random.random() >= self.drop_rate
+            ], ensure_ascii=False)
+        else:
+            content = describe(prompt.rsplit("Book Title:", 1)[-1].strip())
+        prompt_tokens = len(prompt) // 4
+        completion_tokens = len(content) // 4
+        self._send(200, {
+            "id": f"chatcmpl-stub-{StubHandler.requests}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": request.get("model", "stub"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop"
+            }],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens
+            }
+        })
+
+
+def main():
+    """Run the stub server until interrupted"""
+    parser = argparse.ArgumentParser(description="Stub OpenAI chat completions server")
+    parser.add_argument("--port", type=int, default=8089, help="Port to listen on")
+    parser.add_argument("--latency-ms", type=float, default=200.0, help="Mean response latency")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with 429")
+    parser.add_argument("--drop-rate", type=float, default=0.0,
+                        help="Fraction of titles left out of bulk responses")
+    args = parser.parse_args()
+
+    StubHandler.latency_ms = args.latency_ms
+    StubHandler.error_rate = args.error_rate
+    StubHandler.drop_rate = args.drop_rate
+    server = ThreadingHTTPServer(("127.0.0.1", args.port), StubHandler)
+    print(f"Stub OpenAI server on http://127.0.0.1:{args.port}/v1 "
+          f"(latency ~{args.latency_ms:.0f} ms, error rate {args.error_rate:.0%})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print(f"\nServed {StubHandler.requests} requests")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,6 +6,11 @@ import csv
 from pathlib import Path
 from typing import List, Dict, Optional
 
+try:
+    from .isbn import normalize_isbn  # re-exported for existing imports
+except ImportError:
+    from isbn import normalize_isbn
+
 
 def load_books_from_csv(file_path: str, encoding: str = 'utf-8') -> List[Dict]:
     """
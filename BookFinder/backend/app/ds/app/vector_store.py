@@ -1,54 +1,163 @@
 """
 Vector Store using FAISS
 Handles embedding generation, indexing, and similarity search for book descriptions
+(and for book titles, in a second store sharing the embedding model)
 Loads data from a single CSV file with bookid and description columns
 """
 import json
 import logging
+import os
+import shutil
+import threading
+import time
+import uuid
 import numpy as np
 import pandas as pd
 import faiss
 from pathlib import Path
-from typing import List, Optional, Tuple
-from sentence_transformers import SentenceTransformer
+from typing import Iterable, Iterator, List, NamedTuple, Optional, Tuple
 
 try:
+    from .book_ids import BookIds, sorted_paths
     from .config import config
+    from .embedding_backends import load_embedding_model
+    from .embedding_cache import EmbeddingCache
+    from .embedding_scheduler import EmbeddingScheduler
+    from .faiss_index import (
+        QUANTIZED_INDEX_TYPES, MmapFlatIndex, build_index, get_index_params, get_search_params,
+        prepare_index, read_index, search_index
+    )
+    from .utils import normalize_isbn
 except ImportError:
+    from book_ids import BookIds, sorted_paths
     from config import config
+    from embedding_backends import load_embedding_model
+    from embedding_cache import EmbeddingCache
+    from embedding_scheduler import EmbeddingScheduler
+    from faiss_index import (
+        QUANTIZED_INDEX_TYPES, MmapFlatIndex, build_index, get_index_params, get_search_params,
+        prepare_index, read_index, search_index
+    )
+    from utils import normalize_isbn
 
 # Initialize logger
 logger = logging.getLogger(__name__)
 
 
+class IndexFiles(NamedTuple):
+    """Files of one saved index build"""
+    build_id: Optional[str]  # None = flat layout of indexes saved before build directories
+    index: Path
+    ids: Path
+    legacy_ids: Path
+    info: Path
+    vectors: Path
+
+
+def current_build(name: str) -> Optional[str]:
+    """Build ID the `<name>.current` pointer names, or None if there is no pointer"""
+    try:
+        return (config.VECTOR_STORE_PATH / f"{name}.current").read_text(encoding='utf-8').strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def index_files(name: str, build_id: Optional[str]) -> IndexFiles:
+    """
+    Paths of an index build
+    
+    Builds live in VECTOR_STORE_PATH/<name>/<build_id>/ and are never
+    modified once published; without a build ID, the flat files of indexes
+    saved before build directories existed are returned.
+    """
+    if build_id is None:
+        base = config.VECTOR_STORE_PATH
+        return IndexFiles(None, base / f"{name}.faiss", base / f"{name}_ids.npy", base / f"{name}_metadata.json",
+                          base / f"{name}_index.json", base / f"{name}_vectors.npy")
+    build_dir = config.VECTOR_STORE_PATH / name / build_id
+    return IndexFiles(build_id, build_dir / "index.faiss", build_dir / "ids.npy", build_dir / "metadata.json",
+                      build_dir / "index.json", build_dir / "vectors.npy")
+
+
+def current_index_files(name: str) -> IndexFiles:
+    """Paths of the build currently published for an index"""
+    return index_files(name, current_build(name))
+
+
+def title_text(title: str, author: Optional[str] = None) -> str:
+    """Text embedded for a book in the title index: "<title> by <author>" """
+    title = str(title).strip()
+    if author is None or pd.isna(author) or not str(author).strip():
+        return title
+    return f"{title} by {str(author).strip()}"
+
+
 class VectorStore:
     """
     Manages FAISS vector index for book descriptions
     Loads data from CSV file with bookid and descr columns
     """
     
-    def __init__(self, embedding_model: Optional[str] = None):
+    def __init__(self, embedding_model: Optional[str] = None, name: str = "books",
+                 model_from: Optional["VectorStore"] = None):
         """
         Initialize vector store
         
         Args:
             embedding_model: Name of sentence transformer model to use
+            name: File name prefix of the index ("books" = description index, "titles" = title index)
+            model_from: Store whose embedding model, embedding cache and batching are reused
         """
-        print(f"\n[VectorStore] Initializing vector store...")
-        self.model_name = embedding_model or config.EMBEDDING_MODEL
-        
-        print(f"[VectorStore] Loading embedding model: {self.model_name}...")
-        self.model = SentenceTransformer(self.model_name)
-        self.embedding_dim = self.model.get_sentence_embedding_dimension()
-        print(f"[VectorStore] ✓ Model loaded (embedding dim: {self.embedding_dim})")
-        
-        self.index: Optional[faiss.IndexFlatIP] = None  # Inner Product (for cosine similarity)
-        self.metadata: List[dict] = []
-        
-        self.index_path = config.VECTOR_STORE_PATH / "books.faiss"
-        self.metadata_path = config.VECTOR_STORE_PATH / "books_metadata.json"
-        print(f"[VectorStore] Index path: {self.index_path}")
-        print(f"[VectorStore] Metadata path: {self.metadata_path}\n")
+        print(f"\n[VectorStore] Initializing vector store '{name}'...")
+        self.name = name
+        if model_from is not None:
+            self.model_name = model_from.model_name
+            self.embedding_backend = model_from.embedding_backend
+            self.model = model_from.model
+            self.embedding_dim = model_from.embedding_dim
+            self.embedding_cache = model_from.embedding_cache
+            self.embedding_scheduler = model_from.embedding_scheduler
+            print(f"[VectorStore] ✓ Sharing embedding model {self.model_name} ({self.embedding_backend})")
+        else:
+            self.model_name = embedding_model or config.EMBEDDING_MODEL
+            self.embedding_backend = config.EMBEDDING_BACKEND
+            
+            print(f"[VectorStore] Loading embedding model: {self.model_name} ({self.embedding_backend})...")
+            self.model = load_embedding_model(self.model_name, self.embedding_backend)
+            self.embedding_dim = self.model.get_sentence_embedding_dimension()
+            print(f"[VectorStore] ✓ Model loaded (embedding dim: {self.embedding_dim})")
+            
+            # Query embeddings are cached: descriptions repeat often thanks to the description cache
+            disk_path = config.CACHE_PATH / "embeddings_cache.sqlite" if config.EMBEDDING_CACHE_DISK else None
+            self.embedding_cache = EmbeddingCache(f"{self.model_name}@{self.embedding_backend}", disk_path=disk_path)
+            # Concurrent cache misses are encoded together in micro-batches
+            self.embedding_scheduler: Optional[EmbeddingScheduler] = None
+            if config.EMBEDDING_BATCH_MAX_SIZE > 1:
+                self.embedding_scheduler = EmbeddingScheduler(self._encode_batch)
+        
+        self.index: Optional[faiss.Index] = None  # Inner Product (for cosine similarity)
+        self.index_params: dict = {"index_type": "flat"}
+        self.book_ids = BookIds()  # row <-> book_id mapping
+        self._vectors: Optional[np.ndarray] = None  # exact float32 vectors (memory-mapped once loaded)
+        
+        # Each save writes a new build directory under builds_path; the one-line
+        # pointer file naming the current build is swapped in with one rename
+        self.builds_path = config.VECTOR_STORE_PATH / name
+        self.pointer_path = config.VECTOR_STORE_PATH / f"{name}.current"
+        print(f"[VectorStore] Index builds: {self.builds_path}")
+        print(f"[VectorStore] Current build pointer: {self.pointer_path}\n")
+        
+        # Resident index state: index, book IDs and vectors are swapped atomically under
+        # _swap_lock, _reload_lock serializes disk reloads triggered by ensure_index()
+        self._swap_lock = threading.Lock()
+        self._reload_lock = threading.Lock()
+        self._loaded_version: Optional[tuple] = None
+        self._last_version_check: Optional[float] = None
+        self._reported_missing = False
+        
+        # Document embeddings reused across index builds (opened on the first build)
+        self._document_cache: Optional[EmbeddingCache] = None
+        self.last_build: Optional[dict] = None
     
     def _normalize_embeddings(self, embeddings: np.ndarray) -> np.ndarray:
         """
@@ -63,99 +172,368 @@ class VectorStore:
         norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
         return embeddings / (norms + 1e-8)
     
-    def create_index(self, descriptions: List[str], metadata: List[dict]):
+    def create_index(self, descriptions: List[str], metadata: List[dict], index_type: Optional[str] = None):
         """
         Create FAISS index from book descriptions
         
         Args:
             descriptions: List of book descriptions to embed
             metadata: List of metadata dicts (must include 'book_id' field)
+            index_type: flat, hnsw or ivf (default: config.INDEX_TYPE)
         """
         if len(descriptions) != len(metadata):
             raise ValueError("Descriptions and metadata must have same length")
         
         print(f"\n[VectorStore] Creating index for {len(descriptions)} books")
         
-        # Generate embeddings
-        print(f"[VectorStore] Generating embeddings using {self.model_name}...")
-        embeddings = self.model.encode(
-            descriptions,
-            convert_to_numpy=True,
-            show_progress_bar=True
-        )
-        print(f"[VectorStore] ✓ Generated {len(embeddings)} embeddings")
-        
-        # Normalize for cosine similarity
-        print(f"[VectorStore] Normalizing embeddings for cosine similarity...")
-        embeddings = self._normalize_embeddings(embeddings)
-        print(f"[VectorStore] ✓ Embeddings normalized")
+        # Generate (or reuse) normalized embeddings
+        embeddings = self._embed_documents(descriptions)
+        if self._document_cache is not None:
+            # A full build uses every current description, so other stored
+            # vectors belong to removed or changed ones and would be kept forever
+            pruned = self._document_cache.retain(descriptions)
+            if pruned:
+                print(f"[VectorStore] Pruned {pruned} unused cached embeddings")
         
         # Create FAISS index (Inner Product for cosine similarity with normalized vectors)
-        print(f"[VectorStore] Creating FAISS index (IndexFlatIP)...")
-        self.index = faiss.IndexFlatIP(self.embedding_dim)
-        self.index.add(embeddings.astype('float32'))
+        params = get_index_params(index_type)
+        print(f"[VectorStore] Creating FAISS index ({params['index_type']})...")
+        index = build_index(embeddings, params)
         
-        self.metadata = metadata
+        self._swap(index, BookIds.from_metadata(metadata), params, vectors=embeddings)
         
-        print(f"[VectorStore] ✓ Index created with {self.index.ntotal} vectors\n")
+        print(f"[VectorStore] ✓ Index created with {index.ntotal} vectors\n")
+    
+    def _embed_documents(self, texts: List[str]) -> np.ndarray:
+        """
+        Normalized embeddings of texts to index, reusing those of earlier builds
+        
+        Embeddings are looked up by (model, hash of the text) in
+        CACHE_PATH/index_embeddings.sqlite; only new or changed texts are
+        encoded. The reused/recomputed counts are kept in `last_build`.
+        
+        Args:
+            texts: Texts to embed
+            
+        Returns:
+            Normalized float32 embeddings of shape (len(texts), embedding_dim)
+        """
+        if config.INDEX_EMBEDDING_CACHE and self._document_cache is None:
+            # Every catalog row must be reusable, so no size/age bound; create_index prunes it instead
+            self._document_cache = EmbeddingCache(
+                f"{self.model_name}@{self.embedding_backend}", max_entries=0,
+                disk_path=config.CACHE_PATH / "index_embeddings.sqlite",
+                disk_max_entries=0, disk_max_age_days=0
+            )
+        cached = self._document_cache.get_many(texts) if self._document_cache else [None] * len(texts)
+        
+        # Texts still to encode, each once even if several books share it
+        missing = {}
+        for i, embedding in enumerate(cached):
+            if embedding is None:
+                missing.setdefault(texts[i], []).append(i)
+        print(f"[VectorStore] Reusing {len(texts) - sum(map(len, missing.values()))} cached embeddings, "
+              f"encoding {len(missing)} new or changed texts")
+        
+        embeddings = np.empty((len(texts), self.embedding_dim), dtype='float32')
+        for i, embedding in enumerate(cached):
+            if embedding is not None:
+                embeddings[i] = embedding
+        if missing:
+            print(f"[VectorStore] Generating embeddings using {self.model_name}...")
+            new_texts = list(missing)
+            encoded = self.model.encode(
+                new_texts,
+                convert_to_numpy=True,
+                show_progress_bar=True
+            )
+            # Normalize for cosine similarity
+            encoded = self._normalize_embeddings(encoded).astype('float32')
+            for text, embedding in zip(new_texts, encoded):
+                embeddings[missing[text]] = embedding
+            if self._document_cache is not None:
+                self._document_cache.set_many(new_texts, encoded)
+            print(f"[VectorStore] ✓ Generated {len(encoded)} embeddings")
+        
+        recomputed = sum(map(len, missing.values()))
+        self.last_build = {"rows": len(texts), "reused": len(texts) - recomputed, "recomputed": recomputed}
+        return embeddings
     
     def save_index(self):
-        """Save FAISS index and metadata to disk"""
+        """
+        Save FAISS index and metadata to disk
+        
+        All files go into a new build directory, then the `<name>.current`
+        pointer is replaced with one atomic rename: a running service polling
+        ensure_index() sees either the old build or the complete new one,
+        never a mix. The previous KEPT_BUILDS builds are kept for workers
+        still loading them, older ones are deleted.
+        """
         if self.index is None:
             raise ValueError("No index to save. Create an index first.")
+        if isinstance(self.index, MmapFlatIndex):
+            raise ValueError("Index is memory-mapped read-only (INDEX_LOAD_MODE=mmap). Rebuild it instead.")
         
         print(f"\n[VectorStore] Saving index...")
         
-        # Ensure directories exist
-        self.index_path.parent.mkdir(parents=True, exist_ok=True)
-        self.metadata_path.parent.mkdir(parents=True, exist_ok=True)
+        # Sortable by save time (UTC), unique across hosts writing the same store
+        now_ns = time.time_ns()
+        build_id = (f"{time.strftime('%Y%m%d-%H%M%S', time.gmtime(now_ns // 10**9))}"
+                    f".{now_ns % 10**9:09d}-{uuid.uuid4().hex[:6]}")
+        files = index_files(self.name, build_id)
+        files.index.parent.mkdir(parents=True, exist_ok=True)
         
         # Save FAISS index
-        faiss.write_index(self.index, str(self.index_path))
-        print(f"[VectorStore] ✓ Index saved to {self.index_path}")
+        faiss.write_index(self.index, str(files.index))
+        
+        # Save exact vectors (used for re-ranking and lookups with quantized indexes)
+        if self._vectors is not None:
+            with open(files.vectors, 'wb') as f:
+                np.save(f, np.asarray(self._vectors, dtype='float32'))
+        
+        # Save book IDs (with their sorted copy for lookups by ID)
+        self.book_ids.save(files.ids)
+        
+        # Save index description (type and build parameters)
+        with open(files.info, 'w', encoding='utf-8') as f:
+            json.dump({
+                **self.index_params,
+                "build_id": build_id,
+                "model": self.model_name,
+                "embedding_backend": self.embedding_backend,
+                "embedding_dim": self.embedding_dim,
+                "total_vectors": self.index.ntotal
+            }, f, indent=2)
+        
+        # Publish the build
+        pointer_tmp = self.pointer_path.with_name(f"{self.pointer_path.name}.{build_id}.tmp")
+        pointer_tmp.write_text(build_id, encoding='utf-8')
+        os.replace(pointer_tmp, self.pointer_path)
+        self._loaded_version = (build_id,)
+        self._prune_builds(build_id)
+        print(f"[VectorStore] ✓ Index saved as build {build_id} in {files.index.parent}\n")
+    
+    KEPT_BUILDS = 2  # published builds kept on disk, including the current one
+    
+    def _prune_builds(self, current: str):
+        """Delete build directories older than the KEPT_BUILDS most recent ones"""
+        builds = sorted((path for path in self.builds_path.iterdir() if path.is_dir()),
+                        key=lambda path: path.name, reverse=True)
+        for path in builds[self.KEPT_BUILDS:]:
+            if path.name != current:
+                shutil.rmtree(path, ignore_errors=True)
+    
+    def _get_files_version(self) -> Optional[tuple]:
+        """
+        Version of the on-disk index
         
-        # Save metadata
-        with open(self.metadata_path, 'w', encoding='utf-8') as f:
-            json.dump(self.metadata, f, indent=2, ensure_ascii=False)
-        print(f"[VectorStore] ✓ Metadata saved to {self.metadata_path}\n")
+        Returns:
+            (build_id,) of the current build; for flat indexes saved before
+            build directories, (mtime_ns, size) of the index and metadata
+            files; None if no index is on disk
+        """
+        build_id = current_build(self.name)
+        if build_id is not None:
+            return (build_id,)
+        files = index_files(self.name, None)
+        try:
+            index_stat = files.index.stat()
+            metadata_stat = self._metadata_file(files).stat()
+        except FileNotFoundError:
+            return None
+        return (
+            index_stat.st_mtime_ns, index_stat.st_size,
+            metadata_stat.st_mtime_ns, metadata_stat.st_size
+        )
+    
+    @staticmethod
+    def _metadata_file(files: IndexFiles) -> Path:
+        """Book ID file to read: ids.npy, or the metadata JSON of indexes built before it"""
+        if not files.ids.exists() and files.legacy_ids.exists():
+            return files.legacy_ids
+        return files.ids
+    
+    def _swap(self, index: Optional[faiss.Index], book_ids: BookIds, index_params: dict,
+              version: Optional[tuple] = None, vectors: Optional[np.ndarray] = None):
+        """Replace the resident index, book IDs, index parameters and exact vectors as one unit"""
+        with self._swap_lock:
+            self.index = index
+            self.book_ids = book_ids
+            self.index_params = index_params
+            self._vectors = vectors
+            self._loaded_version = version
+    
+    def _snapshot(self) -> Tuple[Optional[faiss.Index], BookIds, Optional[np.ndarray], dict]:
+        """Return a consistent (index, book IDs, vectors, index parameters) tuple for a single query"""
+        with self._swap_lock:
+            return self.index, self.book_ids, self._vectors, self.index_params
+    
+    @staticmethod
+    def _rerank_factor(index_params: dict) -> int:
+        """Candidates re-ranked per result: only quantized indexes need exact re-ranking"""
+        if index_params.get("index_type") in QUANTIZED_INDEX_TYPES:
+            return config.RERANK_FACTOR
+        return 0
     
     def load_index(self) -> bool:
         """
         Load FAISS index and metadata from disk
         
+        The pointer is read once and every file comes from the build it
+        names, whose index description must carry the same build ID. The new
+        index is read completely before it replaces the resident one, so
+        concurrent searches keep using the previous index until the swap.
+        With INDEX_LOAD_MODE=mmap the files are memory-mapped instead, so all
+        worker processes share one copy and loading takes milliseconds.
+        
         Returns:
             True if loaded successfully, False otherwise
         """
-        if not self.index_path.exists() or not self.metadata_path.exists():
+        version = self._get_files_version()
+        files = index_files(self.name, version[0] if version and len(version) == 1 else None)
+        metadata_file = self._metadata_file(files)
+        if not files.index.exists() or not metadata_file.exists():
             print(f"[VectorStore] Index files not found")
             return False
         
         try:
             print(f"\n[VectorStore] Loading index from disk...")
             
-            # Load FAISS index
-            self.index = faiss.read_index(str(self.index_path))
-            print(f"[VectorStore] ✓ FAISS index loaded")
+            index_params = self._load_index_info(files)
+            if index_params.get("build_id") != files.build_id:
+                print(f"[VectorStore] ✗ Build {files.build_id} has index description of build "
+                      f"{index_params.get('build_id')}, keeping current index")
+                return False
+            # Indexes are interchangeable between embedding backends, but not between models
+            if index_params.get("model", self.model_name) != self.model_name:
+                print(f"[VectorStore] ⚠ Index was built with '{index_params['model']}', "
+                      f"queries are embedded with '{self.model_name}'")
+            
+            # Memory-map the exact vectors: pages are shared between processes
+            # and only the rows touched by re-ranking/lookups are read
+            vectors = None
+            if files.vectors.exists():
+                vectors = np.load(files.vectors, mmap_mode='r')
+                if vectors.ndim != 2 or vectors.shape[1] != self.embedding_dim:
+                    print(f"[VectorStore] ✗ Vectors file does not match the model, ignoring it")
+                    vectors = None
+            
+            # Load FAISS index and apply the configured search parameters
+            index = read_index(files.index, index_params["index_type"], vectors)
+            index = prepare_index(index, get_search_params())
+            print(f"[VectorStore] ✓ FAISS index loaded ({index_params['index_type']}, "
+                  f"{config.INDEX_LOAD_MODE})")
             
-            # Load metadata
-            with open(self.metadata_path, 'r', encoding='utf-8') as f:
-                self.metadata = json.load(f)
-            print(f"[VectorStore] ✓ Metadata loaded")
+            if vectors is not None and len(vectors) != index.ntotal:
+                print(f"[VectorStore] ✗ Vectors file does not match the index, ignoring it")
+                vectors = None
             
-            print(f"[VectorStore] ✓ Loaded index with {self.index.ntotal} vectors\n")
+            # Load book IDs (the legacy JSON format is normalized on load, since
+            # indexes built before ISBN normalization store float-formatted IDs)
+            if metadata_file == files.legacy_ids:
+                book_ids = BookIds.load_json(metadata_file)
+            else:
+                book_ids = BookIds.load(metadata_file)
+            print(f"[VectorStore] ✓ Book IDs loaded ({metadata_file.name})")
+            
+            if index.ntotal != len(book_ids):
+                print(f"[VectorStore] ✗ Index/metadata size mismatch "
+                      f"({index.ntotal} vs {len(book_ids)}), keeping current index")
+                return False
+            
+            self._swap(index, book_ids, index_params, version, vectors)
+            
+            print(f"[VectorStore] ✓ Loaded index with {index.ntotal} vectors\n")
             return True
         
         except Exception as e:
             print(f"[VectorStore] ✗ Error loading index: {e}")
             return False
     
-    def search(self, query_description: str, top_k: int = 5) -> List[Tuple[dict, float]]:
+    @staticmethod
+    def _load_index_info(files: IndexFiles) -> dict:
+        """Read the index description written by save_index (indexes built before it are flat)"""
+        if not files.info.exists():
+            return {"index_type": "flat"}
+        with open(files.info, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    
+    def ensure_index(self) -> bool:
+        """
+        Make sure a resident index is available for searching
+        
+        Loads the index on first use and afterwards only checks the files'
+        version (at most every INDEX_RELOAD_CHECK_SECONDS), hot-swapping in
+        a newer index when build_vector_store.py has written one. While no
+        index is on disk, the files are looked for at the same interval and
+        their absence is reported once.
+        
+        Returns:
+            True if an index is available, False otherwise
+        """
+        if self._last_version_check is not None and \
+                time.monotonic() - self._last_version_check < config.INDEX_RELOAD_CHECK_SECONDS:
+            return self.index is not None
+        
+        with self._reload_lock:
+            self._last_version_check = time.monotonic()
+            version = self._get_files_version()
+            if version is None and self.index is None:
+                if not self._reported_missing:
+                    print(f"[VectorStore] Index files not found for '{self.name}', "
+                          f"checking again every {config.INDEX_RELOAD_CHECK_SECONDS}s")
+                    self._reported_missing = True
+                return False
+            self._reported_missing = False
+            if self.index is not None and (version is None or version == self._loaded_version):
+                return True
+            
+            if self.index is not None:
+                print(f"[VectorStore] Index files changed on disk, reloading...")
+            return self.load_index() or self.index is not None
+    
+    def _encode_batch(self, texts: List[str]) -> np.ndarray:
+        """Embed several query texts in one model call (normalized float32, shape (n, dim))"""
+        embeddings = self.model.encode(
+            texts,
+            batch_size=len(texts),
+            convert_to_numpy=True
+        )
+        return self._normalize_embeddings(embeddings).astype('float32')
+    
+    def encode_query(self, text: str) -> np.ndarray:
+        """
+        Embed a single query text, served from the embedding cache when possible
+        
+        Cache misses go through the embedding scheduler, which encodes
+        concurrent queries together in one batch.
+        
+        Args:
+            text: Text to embed
+            
+        Returns:
+            Normalized float32 embedding of shape (1, embedding_dim)
+        """
+        cached = self.embedding_cache.get(text)
+        if cached is not None:
+            return cached.reshape(1, -1)
+        
+        if self.embedding_scheduler is not None:
+            query_embedding = self.embedding_scheduler.encode(text).reshape(1, -1)
+        else:
+            query_embedding = self._encode_batch([text])
+        self.embedding_cache.set(text, query_embedding)
+        return query_embedding
+    
+    def search(self, query_description: str, top_k: int = 5,
+               exclude_ids: Optional[Iterable[str]] = None) -> List[Tuple[dict, float]]:
         """
         Search for similar books using description
         
         Args:
             query_description: Description to search for
             top_k: Number of top results to return
+            exclude_ids: Book IDs to leave out of the results
             
         Returns:
             List of tuples (metadata, similarity_score)
@@ -168,29 +546,138 @@ class VectorStore:
         
         # Generate query embedding
         print(f"[VectorStore] Generating query embedding...")
-        query_embedding = self.model.encode(
-            [query_description],
-            convert_to_numpy=True
-        )
-        query_embedding = self._normalize_embeddings(query_embedding)
+        query_embedding = self.encode_query(query_description)
         print(f"[VectorStore] ✓ Query embedding generated")
         
-        # Search
-        top_k = min(top_k, self.index.ntotal)
+        return self.search_by_vector(query_embedding, top_k, exclude_ids)
+    
+    def search_by_vector(self, query_embedding: np.ndarray, top_k: int = 5,
+                         exclude_ids: Optional[Iterable[str]] = None) -> List[Tuple[dict, float]]:
+        """
+        Search for similar books using an already normalized embedding
+        
+        Args:
+            query_embedding: Normalized query embedding of shape (1, embedding_dim)
+            top_k: Number of top results to return
+            exclude_ids: Book IDs to leave out of the results
+            
+        Returns:
+            List of tuples (metadata, similarity_score)
+        """
+        index, book_ids, vectors, index_params = self._snapshot()
+        if index is None:
+            raise ValueError("No index loaded. Load or create an index first.")
+        exclude_ids = set(exclude_ids or ())
+        
+        # Search (fetch extra neighbors to make up for excluded books)
+        search_k = min(top_k + len(exclude_ids), index.ntotal)
         print(f"[VectorStore] Searching FAISS index...")
-        similarities, indices = self.index.search(query_embedding.astype('float32'), top_k)
+        similarities, indices = search_index(
+            index, query_embedding.astype('float32'), search_k, vectors, self._rerank_factor(index_params)
+        )
         print(f"[VectorStore] ✓ Search complete")
         
         # Prepare results
         results = []
         for idx, similarity in zip(indices[0], similarities[0]):
-            if idx < len(self.metadata):
-                results.append((self.metadata[idx], float(similarity)))
+            if not 0 <= idx < len(book_ids):
+                continue
+            book_id = book_ids.get(idx)
+            if book_id not in exclude_ids:
+                results.append(({"book_id": book_id}, float(similarity)))
+        results = results[:top_k]
         
         print(f"[VectorStore] ✓ Returning {len(results)} results\n")
         return results
     
-    def load_from_csv(self, csv_path: str, bookid_col: str = 'bookid', descr_col: str = 'descr'):
+    def search_similar_to_book(self, book_id: str, top_k: int = 5) -> Optional[List[Tuple[dict, float]]]:
+        """
+        Find the nearest neighbors of an indexed book ("more like this")
+        
+        Uses the book's stored vector directly, so no text is embedded.
+        
+        Args:
+            book_id: Canonical ISBN of the book
+            top_k: Number of similar books to return
+            
+        Returns:
+            List of tuples (metadata, similarity_score) without the book itself,
+            or None if the book is not in the index
+        """
+        vector = self.get_vector(book_id)
+        if vector is None:
+            return None
+        return self.search_by_vector(vector, top_k=top_k, exclude_ids=[book_id])
+    
+    def batch_knn(self, top_n: int = 10, chunk_size: int = 1024,
+                  n_threads: Optional[int] = None) -> Iterator[Tuple[str, List[Tuple[str, float]]]]:
+        """
+        Nearest neighbors of every indexed book, computed in chunked batch queries
+        
+        Each chunk of stored vectors is searched as one matrix query, which FAISS
+        parallelizes over its OpenMP threads.
+        
+        Args:
+            top_n: Number of neighbors per book (the book itself is excluded)
+            chunk_size: Number of query vectors per batch
+            n_threads: Number of FAISS threads (default: FAISS decides)
+            
+        Yields:
+            Tuples (book_id, [(neighbor_book_id, similarity_score), ...])
+        """
+        index, book_ids, vectors, index_params = self._snapshot()
+        if index is None:
+            raise ValueError("No index loaded. Load or create an index first.")
+        rerank_factor = self._rerank_factor(index_params)
+        if n_threads:
+            faiss.omp_set_num_threads(n_threads)
+        
+        total = index.ntotal
+        search_k = min(top_n + 1, total)
+        print(f"[VectorStore] Computing top-{top_n} neighbors for {total} books...")
+        for start in range(0, total, chunk_size):
+            end = min(start + chunk_size, total)
+            if vectors is not None:
+                chunk = np.ascontiguousarray(vectors[start:end], dtype='float32')
+            else:
+                chunk = index.reconstruct_n(start, end - start)
+            similarities, indices = search_index(index, chunk, search_k, vectors, rerank_factor)
+            for offset in range(end - start):
+                book_id = book_ids.get(start + offset)
+                neighbors = []
+                for idx, similarity in zip(indices[offset], similarities[offset]):
+                    if not 0 <= idx < len(book_ids):
+                        continue
+                    neighbor_id = book_ids.get(idx)
+                    if neighbor_id != book_id:
+                        neighbors.append((neighbor_id, float(similarity)))
+                yield book_id, neighbors[:top_n]
+            print(f"[VectorStore] ✓ {end}/{total} books processed")
+    
+    def has_book(self, book_id: str) -> bool:
+        """Check whether a book's vector is in the resident index"""
+        return book_id in self._snapshot()[1]
+    
+    def get_vector(self, book_id: str) -> Optional[np.ndarray]:
+        """
+        Get the stored (normalized) vector of a book
+        
+        Args:
+            book_id: Canonical ISBN of the book
+            
+        Returns:
+            Embedding of shape (1, embedding_dim), or None if the book is not indexed
+        """
+        index, book_ids, vectors, _ = self._snapshot()
+        row = book_ids.row_of(book_id)
+        if index is None or row is None:
+            return None
+        if vectors is not None:
+            return np.array(vectors[row], dtype='float32').reshape(1, -1)
+        return index.reconstruct(row).reshape(1, -1)
+    
+    def load_from_csv(self, csv_path: str, bookid_col: str = 'bookid', descr_col: str = 'descr',
+                      index_type: Optional[str] = None):
         """
         Load books from CSV file and create index
         
@@ -198,18 +685,9 @@ class VectorStore:
             csv_path: Path to CSV file
             bookid_col: Name of the book ID column (default: 'bookid')
             descr_col: Name of the description column (default: 'descr')
+            index_type: flat, hnsw or ivf (default: config.INDEX_TYPE)
         """
-        print(f"\n[VectorStore] Loading data from CSV: {csv_path}")
-        
-        # Read CSV file
-        df = pd.read_csv(csv_path)
-        print(f"[VectorStore] ✓ Loaded {len(df)} rows from CSV")
-        
-        # Validate columns exist
-        if bookid_col not in df.columns:
-            raise ValueError(f"Column '{bookid_col}' not found in CSV. Available columns: {list(df.columns)}")
-        if descr_col not in df.columns:
-            raise ValueError(f"Column '{descr_col}' not found in CSV. Available columns: {list(df.columns)}")
+        df = self._read_csv(csv_path, bookid_col, [bookid_col, descr_col])
         
         # Filter out rows with missing descriptions
         df = df.dropna(subset=[descr_col])
@@ -217,24 +695,80 @@ class VectorStore:
         
         # Prepare data
         descriptions = df[descr_col].astype(str).tolist()
-        metadata = [{"book_id": str(row[bookid_col])} for _, row in df.iterrows()]
+        metadata = [{"book_id": normalize_isbn(book_id)} for book_id in df[bookid_col]]
         
         # Create index
-        self.create_index(descriptions, metadata)
+        self.create_index(descriptions, metadata, index_type)
         
         # Save to disk
         self.save_index()
         
         print(f"[VectorStore] ✓ Index created and saved from CSV\n")
     
+    def load_titles_from_csv(self, csv_path: str, bookid_col: str = 'ISBN', title_col: str = 'title',
+                             author_col: Optional[str] = 'author', index_type: Optional[str] = None):
+        """
+        Load books from CSV file and create a title index
+        
+        Each book is embedded as "<title> by <author>", so raw search queries
+        can be matched without generating a description first.
+        
+        Args:
+            csv_path: Path to CSV file
+            bookid_col: Name of the book ID column (default: 'ISBN')
+            title_col: Name of the title column (default: 'title')
+            author_col: Name of the author column, None to embed titles only (default: 'author')
+            index_type: flat, hnsw or ivf (default: config.INDEX_TYPE)
+        """
+        columns = [bookid_col, title_col] + ([author_col] if author_col else [])
+        df = self._read_csv(csv_path, bookid_col, columns)
+        
+        # Filter out rows with missing titles
+        df = df.dropna(subset=[title_col])
+        print(f"[VectorStore] ✓ {len(df)} books with titles")
+        
+        authors = df[author_col] if author_col else [None] * len(df)
+        texts = [title_text(title, author) for title, author in zip(df[title_col], authors)]
+        metadata = [{"book_id": normalize_isbn(book_id)} for book_id in df[bookid_col]]
+        
+        self.create_index(texts, metadata, index_type)
+        self.save_index()
+        
+        print(f"[VectorStore] ✓ Title index created and saved from CSV\n")
+    
+    @staticmethod
+    def _read_csv(csv_path: str, bookid_col: str, columns: List[str]) -> pd.DataFrame:
+        """Read the book CSV and check that the required columns exist"""
+        print(f"\n[VectorStore] Loading data from CSV: {csv_path}")
+        
+        # Read CSV file
+        df = pd.read_csv(csv_path, dtype={bookid_col: str})
+        print(f"[VectorStore] ✓ Loaded {len(df)} rows from CSV")
+        
+        # Validate columns exist
+        for column in columns:
+            if column not in df.columns:
+                raise ValueError(f"Column '{column}' not found in CSV. Available columns: {list(df.columns)}")
+        return df
+    
     def get_stats(self) -> dict:
         """Get statistics about the vector store"""
+        files = current_index_files(self.name)
         return {
+            "name": self.name,
             "model": self.model_name,
+            "embedding_backend": self.embedding_backend,
             "embedding_dim": self.embedding_dim,
+            "index_type": self.index_params.get("index_type"),
+            "load_mode": config.INDEX_LOAD_MODE,
             "total_vectors": self.index.ntotal if self.index else 0,
-            "index_exists": self.index_path.exists(),
-            "metadata_exists": self.metadata_path.exists()
+            "build_id": files.build_id,
+            "index_size_bytes": files.index.stat().st_size if files.index.exists() else 0,
+            "index_exists": files.index.exists(),
+            "metadata_exists": self._metadata_file(files).exists(),
+            "embedding_cache": self.embedding_cache.get_stats(),
+            "embedding_batching": self.embedding_scheduler.get_stats() if self.embedding_scheduler else None,
+            "last_build": self.last_build
         }
     
     def add_books(self, descriptions: List[str], metadata: List[dict]):
@@ -247,33 +781,34 @@ class VectorStore:
         """
         if self.index is None:
             raise ValueError("No index loaded. Load or create an index first.")
+        if isinstance(self.index, MmapFlatIndex):
+            raise ValueError("Index is memory-mapped read-only (INDEX_LOAD_MODE=mmap). Rebuild it instead.")
         
         if len(descriptions) != len(metadata):
             raise ValueError("Descriptions and metadata must have same length")
         
         print(f"Adding {len(descriptions)} new books to index")
         
-        # Generate embeddings
-        embeddings = self.model.encode(
-            descriptions,
-            convert_to_numpy=True,
-            show_progress_bar=True
-        )
-        embeddings = self._normalize_embeddings(embeddings)
+        # Generate (or reuse) normalized embeddings
+        embeddings = self._embed_documents(descriptions)
         
         # Add to index
-        self.index.add(embeddings.astype('float32'))
-        self.metadata.extend(metadata)
+        self.index.add(embeddings)
+        book_ids = self.book_ids.extend(entry.get("book_id") for entry in metadata)
+        vectors = np.vstack([self._vectors, embeddings]) if self._vectors is not None else None
+        self._swap(self.index, book_ids, self.index_params, self._loaded_version, vectors)
         
         print(f"Index now has {self.index.ntotal} vectors")
     
     def delete_index(self):
-        """Delete the index and metadata files"""
-        if self.index_path.exists():
-            self.index_path.unlink()
-        if self.metadata_path.exists():
-            self.metadata_path.unlink()
-        self.index = None
-        self.metadata = []
+        """Delete the index and metadata files (all builds and the flat legacy files)"""
+        if self.pointer_path.exists():
+            self.pointer_path.unlink()
+        shutil.rmtree(self.builds_path, ignore_errors=True)
+        flat_files = index_files(self.name, None)
+        for path in (*flat_files[1:], *sorted_paths(flat_files.ids)):
+            if path.exists():
+                path.unlink()
+        self._swap(None, BookIds(), {"index_type": "flat"})
         print(f"Deleted index files")
 
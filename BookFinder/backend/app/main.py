@@ -39,7 +39,7 @@ app.add_middleware(SessionMiddleware, secret_key=API_SECRET_KEY)
 # Startup event to preload DS service
 @app.on_event("startup")
 async def startup_event():
-    """Preload the DS service and vector store on startup"""
+    """Preload the DS service, vector store and title index on startup"""
     logger.info("Preloading Data Science service and vector store...")
     try:
         from services.books_service import _get_ds_service
@@ -48,6 +48,13 @@ async def startup_event():
     except Exception as e:
         logger.error(f"✗ Failed to preload DS service: {e}")
         logger.warning("DS service will be loaded on first search request")
+    try:
+        from services.title_index import get_title_index
+        get_title_index().get_snapshot()
+        logger.info("✓ Title index preloaded successfully")
+    except Exception as e:
+        logger.error(f"✗ Failed to preload title index: {e}")
+        logger.warning("Title index will be built on first search request")
 
 app.include_router(auth.router, prefix="/api")
 app.include_router(books.router, prefix="/api")
@@ -1,13 +1,18 @@
-from fastapi import APIRouter, Query
+from fastapi import APIRouter, Depends, HTTPException, Query
+from core.security import verify_service_secret
 from schemas.book_schema import FullBookInfo
-from services.books_service import get_books_service
-# from services.similarity_service import get_books_similarity_service
+from services.books_service import (
+    get_books_service_async,
+    get_search_cache_stats_service,
+    refresh_catalog_service
+)
+from services.similarity_service import get_more_like_this_service
 from typing import List, Dict, Any
 
 router = APIRouter(prefix="/books", tags=["Books"])
 
 @router.get("/search", response_model=List[FullBookInfo])
-def get_books(search_query: str = Query(..., description="Search term for books")):
+async def get_books(search_query: str = Query(..., description="Search term for books")):
     """
     **Search for books using a 3-step process:** *exact → fuzzy → semantic*.
 
@@ -17,5 +22,59 @@ def get_books(search_query: str = Query(..., description="Search term for books"
     Each book includes the following fields:
     - **match_type**: `"exact"`, `"fuzzy"`, `"semantic"`, or `"external"`.
     - **is_recommendation**: `true` for recommended books, `false` for main search results.
+
+    The lexical (*exact → fuzzy*) and semantic stages run concurrently.
+    """
+    return await get_books_service_async(search_query)
+
+
+@router.get("/{isbn}/similar", response_model=List[FullBookInfo])
+def get_similar_books(
+    isbn: str,
+    top_k: int = Query(5, ge=1, le=50, description="Number of similar books to return")
+):
+    """
+    **Get books similar to a given book** (*"more like this"*).
+
+    Neighbors are read from the precomputed `book_similarity` table; books that
+    were not precomputed fall back to a kNN search on their stored vector, so the
+    request never needs description generation or embedding. The book itself is excluded.
+
+    All returned books have **match_type** `"semantic"` and **is_recommendation** `true`.
+    Responds with **404** if the book is not in the vector index.
+    """
+    results = get_more_like_this_service(isbn, top_k)
+    if results is None:
+        raise HTTPException(status_code=404, detail=f"Book {isbn} not found in the vector index")
+    return results
+
+
+@router.post("/refresh", dependencies=[Depends(verify_service_secret)])
+def refresh_catalog() -> Dict[str, Any]:
+    """
+    **Invalidate in-memory catalog data** after the catalog was reloaded.
+
+    Called by the ETL service once it has (re)populated the database, so that
+    the next search rebuilds the title index from the current `book` table.
+    Also drops cached search responses, so call it after price updates too.
+
+    Requires the shared `CATALOG_REFRESH_SECRET` in the `X-Service-Secret`
+    header (**401** otherwise, and always while the secret is not configured).
+
+    Only the worker process receiving the request is cleared. Other workers
+    pick up the new catalog when their title index and cached responses
+    expire (`TITLE_INDEX_TTL_SECONDS`, `SEARCH_CACHE_TTL_SECONDS`).
+    """
+    return refresh_catalog_service()
+
+
+@router.get("/cache/stats")
+def get_search_cache_stats() -> Dict[str, Any]:
+    """
+    **Search result cache statistics** for monitoring.
+
+    Returns the number of cached queries, the configured limits and the
+    hit/miss/eviction counters with the resulting hit rate, plus the same
+    counters for the query embedding cache once semantic search is loaded.
     """
-    return get_books_service(search_query)
\ No newline at end of file
+    return get_search_cache_stats_service()
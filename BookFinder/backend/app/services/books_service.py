@@ -1,33 +1,50 @@
 from schemas.book_schema import BookInfo, BookStoreInfo, FullBookInfo
 import requests
+import asyncio
 import logging
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Optional, Tuple
-from db.postgres_service import get_allBooks, get_book_by_isbn, get_stores_for_book
+from typing import Any, List, Optional, Tuple
+from db.postgres_service import (
+    get_book_by_isbn, get_books_by_isbns, get_stores_for_book, get_stores_for_books, log_search_query
+)
 from db.postgres import get_db
+from core.config import SEARCH_DEADLINE_SECONDS, SEMANTIC_SEARCH_WORKERS
+from services.title_index import TitleIndex, get_title_index, normalize_title
+from services.search_cache import get_search_cache
+from services.text_distance import levenshtein_distance
 from difflib import SequenceMatcher
 
 # Add DS to path and import
 DS_PATH = Path(__file__).parent.parent / "ds"
 sys.path.insert(0, str(DS_PATH))
 from app.book_recommender import BookRecommendationService
+from app.description_generator import DescriptionGenerator
+from app.utils import normalize_isbn
 
 logger = logging.getLogger(__name__)
 
 # Initialize DS service once
 _ds_service = None
 
+# Semantic stages block on the LLM for seconds; they get their own threads so the
+# default pool running the database stages and search logging stays responsive
+_SEMANTIC_EXECUTOR = ThreadPoolExecutor(max_workers=SEMANTIC_SEARCH_WORKERS, thread_name_prefix="semantic")
+
 def _get_ds_service():
     global _ds_service
     if _ds_service is None:
         _ds_service = BookRecommendationService()
-        if not _ds_service.vector_store.load_index():
+        if not _ds_service.vector_store.ensure_index():
             raise ValueError("Vector store not found")
+        # Optional: without a title index, searches use the description path
+        _ds_service.title_store.ensure_index()
     return _ds_service
 
 
-def build_full_book_info(book, db_session, match_type=None, is_recommendation=False) -> FullBookInfo:
+def build_full_book_info(book, db_session, match_type=None, is_recommendation=False, store_inventories=None) -> FullBookInfo:
     """
     **Build a `FullBookInfo` object** with complete bookstore information for a book.
 
@@ -39,12 +56,14 @@ def build_full_book_info(book, db_session, match_type=None, is_recommendation=Fa
         db_session (Session): Active database session.
         match_type (str | None): Type of match (**"exact"**, **"fuzzy"**, **"semantic"**, **"external"**).
         is_recommendation (bool): Indicates if this book is a *recommendation*.
+        store_inventories (list | None): Pre-fetched inventory entries (with stores loaded); queried if omitted.
 
     Returns:
         FullBookInfo: Complete bookstore information and metadata.
     """
     # Get all stores for this book
-    store_inventories = get_stores_for_book(db_session, book.ISBN)
+    if store_inventories is None:
+        store_inventories = get_stores_for_book(db_session, book.ISBN)
     
     # Build store info list
     stores = []
@@ -89,22 +108,51 @@ def build_full_book_info(book, db_session, match_type=None, is_recommendation=Fa
     return full_book_info
 
 
-def calculate_cer(s1: str, s2: str) -> float:
+def build_full_book_infos(matches: List[Tuple[Any, Optional[str], bool]], db_session) -> List[FullBookInfo]:
+    """
+    **Build `FullBookInfo` objects for several books** with one inventory query.
+
+    Inventories and their stores for all books are loaded together, instead of
+    one inventory query (plus lazy store loads) per book.
+
+    Args:
+        matches: List of (book, match_type, is_recommendation) tuples, in result order.
+        db_session (Session): Active database session.
+
+    Returns:
+        List of FullBookInfo in the same order as `matches`.
+    """
+    inventories_by_isbn = get_stores_for_books(db_session, [book.ISBN for book, _, _ in matches])
+    return [
+        build_full_book_info(
+            book,
+            db_session,
+            match_type=match_type,
+            is_recommendation=is_recommendation,
+            store_inventories=inventories_by_isbn.get(book.ISBN, [])
+        )
+        for book, match_type, is_recommendation in matches
+    ]
+
+
+def calculate_cer(s1: str, s2: str, max_cer: Optional[float] = None) -> float:
     """
     **Calculate Character Error Rate (CER)** between two strings.
 
     CER is based on Levenshtein distance normalized by the length of the longer string.
     Useful for fuzzy matching to handle typos or small variations in search queries.
+    With `max_cer`, the distance computation stops as soon as the CER is known to exceed it.
 
     Args:
         s1: First string
         s2: Second string
+        max_cer: Optional bound; CERs above it are reported as 1.0 instead of computed exactly
 
     Returns:
         CER value between 0 (*identical*) and 1 (*completely different*).
     """
-    s1 = s1.lower().strip()
-    s2 = s2.lower().strip()
+    s1 = normalize_title(s1)
+    s2 = normalize_title(s2)
     
     if not s1 or not s2:
         return 1.0
@@ -112,29 +160,27 @@ def calculate_cer(s1: str, s2: str) -> float:
     if s1 == s2:
         return 0.0
     
-    # Calculate Levenshtein distance
-    len1, len2 = len(s1), len(s2)
-    if len1 > len2:
-        s1, s2 = s2, s1
-        len1, len2 = len2, len1
+    longest = max(len(s1), len(s2))
+    max_distance = None
+    if max_cer is not None and max_cer < 1.0:
+        # Largest distance whose CER is still within max_cer
+        max_distance = int(max_cer * longest)
+        while (max_distance + 1) / longest <= max_cer:
+            max_distance += 1
+        while max_distance > 0 and max_distance / longest > max_cer:
+            max_distance -= 1
     
-    current_row = range(len1 + 1)
-    for i in range(1, len2 + 1):
-        previous_row, current_row = current_row, [i] + [0] * len1
-        for j in range(1, len1 + 1):
-            add, delete, change = previous_row[j] + 1, current_row[j-1] + 1, previous_row[j-1]
-            if s1[j-1] != s2[i-1]:
-                change += 1
-            current_row[j] = min(add, delete, change)
+    levenshtein = levenshtein_distance(s1, s2, max_distance)
+    if max_distance is not None and levenshtein > max_distance:
+        return 1.0
     
     # Normalize by the length of the longer string
-    levenshtein_distance = current_row[len1]
-    cer = levenshtein_distance / max(len1, len2)
+    cer = levenshtein / longest
     
     return cer
 
 
-def fuzzy_search_with_cer(search_query: str, all_books: List, threshold: float = 0.3) -> Optional[Tuple[any, float]]:
+def fuzzy_search_with_cer(search_query: str, title_index: TitleIndex, threshold: float = 0.3) -> Optional[Tuple[str, float]]:
     """
     **Perform a fuzzy search using CER** to find the best matching book.
 
@@ -143,33 +189,194 @@ def fuzzy_search_with_cer(search_query: str, all_books: List, threshold: float =
 
     Args:
         search_query: User's search query
-        all_books: List of all books to search through
+        title_index: In-memory index of catalog titles
         threshold: Maximum CER to consider a match (default 0.3 = 30% error allowed)
 
     Returns:
-        Tuple of (best_matching_book, cer_score) or None if no match below threshold
+        Tuple of (ISBN of best matching book, cer_score) or None if no match below threshold
     """
     logger.info(f"Fuzzy CER search for: '{search_query}' (threshold: {threshold})")
     
-    search_query = search_query.lower().strip()
+    search_query = normalize_title(search_query)
+    snapshot = title_index.get_snapshot()
     best_match = None
     best_cer = float('inf')
     
-    for book in all_books:
-        cer = calculate_cer(search_query, book.title)
+    # Only titles that can still be within the threshold are scored
+    candidates = title_index.fuzzy_candidates(search_query, threshold, snapshot)
+    logger.info(f"Scoring {len(candidates)} of {len(snapshot.titles)} titles")
+    
+    for position in candidates:
+        # Candidates that cannot beat the current best are abandoned early
+        cer = calculate_cer(search_query, snapshot.titles[position], max_cer=min(threshold, best_cer))
         
         if cer < best_cer:
             best_cer = cer
-            best_match = book
+            best_match = position
     
     if best_cer <= threshold:
-        logger.info(f"Fuzzy match found: '{best_match.title}' (CER: {best_cer:.3f})")
-        return (best_match, best_cer)
+        logger.info(f"Fuzzy match found: '{snapshot.titles[best_match]}' (CER: {best_cer:.3f})")
+        return (snapshot.isbns[best_match], best_cer)
     else:
         logger.info(f"No fuzzy match below threshold (best CER: {best_cer:.3f})")
         return None
 
-def get_books_service(search_query: str) -> List[FullBookInfo]:
+def match_title(search_query: str) -> Tuple[Optional[str], Optional[str]]:
+    """
+    **Resolve a query to a catalog book:** exact title match, then fuzzy (CER-based) match.
+
+    Uses only the in-memory title index and runs once per search; the result
+    feeds both the lexical stage (which fetches the matched row) and the
+    semantic stage (which uses the book's stored vector instead of an LLM
+    description).
+
+    Args:
+        search_query: User's search query
+
+    Returns:
+        Tuple of (ISBN of the matched book or None, `'exact'` / `'fuzzy'` / None)
+    """
+    title_index = get_title_index()
+    
+    # Step 1: Try exact match (normalized)
+    logger.info("Step 1: Trying exact match (normalized)...")
+    exact_isbn = search_book_exact(search_query, title_index)
+    if exact_isbn:
+        return exact_isbn, 'exact'
+    logger.info("No exact match found")
+    
+    # Step 2: Try fuzzy search (CER)
+    logger.info("Step 2: Trying fuzzy search (CER-based)...")
+    fuzzy_result = fuzzy_search_with_cer(search_query, title_index, threshold=0.3)
+    if fuzzy_result:
+        return fuzzy_result[0], 'fuzzy'
+    logger.info("No fuzzy match found below threshold")
+    return None, None
+
+
+def find_primary_match(catalog_isbn: Optional[str], match_type: Optional[str],
+                       db_session) -> Tuple[Optional[Any], Optional[str]]:
+    """
+    **Lexical search stage:** fetch the book matched by `match_title`.
+
+    Args:
+        catalog_isbn: ISBN of the matched book, or None
+        match_type: `'exact'`, `'fuzzy'` or None
+        db_session (Session): Active database session.
+
+    Returns:
+        Tuple of (matched book or None, `'exact'` / `'fuzzy'` / None)
+    """
+    book = get_book_by_isbn(db_session, catalog_isbn) if catalog_isbn else None
+    if book:
+        logger.info(f"✓ {match_type.capitalize()} match found: '{book.title}'")
+        return book, match_type
+    return None, None
+
+
+def merge_search_results(
+    search_query: str,
+    primary_match: Optional[Any],
+    match_type: Optional[str],
+    ds_isbns: List[str],
+    db_session
+) -> List[FullBookInfo]:
+    """
+    **Merge the lexical and semantic stages** into the final result list.
+
+    The primary match (if any) comes first, followed by semantic recommendations
+    deduplicated by ISBN. Falls back to the external API only if nothing was found.
+
+    Args:
+        search_query: User's search query
+        primary_match: Book from the exact/fuzzy stage, or None
+        match_type: `'exact'`, `'fuzzy'` or None
+        ds_isbns: Canonical ISBNs from the semantic stage
+        db_session (Session): Active database session.
+
+    Returns:
+        List of FullBookInfo (see `get_books_service_async`)
+    """
+    matches = []  # (book, match_type, is_recommendation), store info is attached in one batch
+    seen_isbns = set()  # Track ISBNs to prevent duplicates
+    
+    if primary_match:
+        matches.append((primary_match, match_type, False))
+        seen_isbns.add(normalize_isbn(primary_match.ISBN))
+    
+    if ds_isbns:
+        logger.info(f"✓ Found {len(ds_isbns)} similar books via DS")
+        logger.info(f"ISBNs from DS: {ds_isbns}")
+        
+        # Resolve all DS ISBNs with one query
+        books_by_isbn = resolve_books_by_isbn(db_session, ds_isbns)
+        
+        for isbn in ds_isbns:
+            # Skip if already added (exact or fuzzy match)
+            if isbn in seen_isbns:
+                logger.info(f"Skipping duplicate ISBN: {isbn}")
+                continue
+            
+            book = books_by_isbn.get(isbn)
+            if book:
+                logger.info(f"✓ Found book: {book.title} (ISBN: '{isbn}')")
+                matches.append((book, 'semantic', True))
+                seen_isbns.add(isbn)
+            else:
+                logger.warning(f"✗ Book not found in DB for ISBN: '{isbn}'")
+        
+        # Update match_type if no exact/fuzzy match was found
+        if not match_type:
+            match_type = 'semantic'
+    else:
+        logger.info("No DS matches found")
+    
+    # Fetch store inventories for all matched books at once
+    results = build_full_book_infos(matches, db_session)
+    
+    # Step 4: Fall back to external API only if NO results at all
+    if not results:
+        logger.info("Step 4: No results found, falling back to external API...")
+        try:
+            external_results = search_book_from_api(search_query)
+            if external_results:
+                logger.info(f"✓ Found {len(external_results)} results from external API")
+                results = external_results
+                match_type = 'external'
+        except Exception as e:
+            logger.error(f"External API search failed: {e}")
+    
+    logger.info(f"Search complete: {len(results)} results, type: {match_type}")
+    return results
+
+
+def _cache_search_results(search_query: str, results: List[FullBookInfo], complete: bool = True) -> None:
+    """
+    **Store a search response in the result cache.**
+
+    Empty and incomplete responses (semantic stage failed or fell back to a
+    title-only query) are not cached, so a transient DS, LLM or external API
+    problem is not served again until the entry expires.
+    """
+    if results and complete:
+        get_search_cache().set(search_query, results)
+
+
+def _run_with_session(stage, *args):
+    """
+    **Run a search stage with its own database session.**
+
+    Sessions are not thread-safe, so every stage offloaded to a worker thread
+    opens (and closes) a session of its own.
+    """
+    db = next(get_db())
+    try:
+        return stage(*args, db)
+    finally:
+        db.close()
+
+
+async def get_books_service_async(search_query: str) -> List[FullBookInfo]:
     """
     **Main book search function** that always includes similar books.
 
@@ -179,6 +386,15 @@ def get_books_service(search_query: str) -> List[FullBookInfo]:
     3. **Semantic search** via DS service (always runs for recommendations)
     4. **External API fallback** if no results are found
 
+    The title match (exact + fuzzy, in memory) runs once; then fetching the
+    matched row and the semantic stage (stored vector, or description
+    generation and embedding, and FAISS search) run at the same time, so
+    latency is bounded by the slower of the two instead of their sum. The
+    semantic stage runs on its own executor, so requests blocked on the LLM
+    cannot starve the default pool running the database stages, and it gets
+    a SEARCH_DEADLINE_SECONDS budget, so a slow LLM cannot hold the response
+    past the frontend's timeout.
+
     Returns:
         List of FullBookInfo with metadata:
         - If exact/fuzzy match found: primary match + similar books (*no duplicates*)
@@ -188,152 +404,219 @@ def get_books_service(search_query: str) -> List[FullBookInfo]:
     """
     logger.info(f"Search initiated for query: '{search_query}'")
     
-    results = []
-    match_type = None
-    seen_isbns = set()  # Track ISBNs to prevent duplicates
+    cached = get_search_cache().get(search_query)
+    if cached is not None:
+        logger.info(f"Search cache HIT for query: '{search_query}'")
+        _log_search_in_background(search_query, _primary_isbn(cached))
+        return cached
     
-    # Get database session
-    db = next(get_db())
+    deadline = time.monotonic() + SEARCH_DEADLINE_SECONDS
+    catalog_isbn, title_match_type = await asyncio.to_thread(match_title, search_query)
+    
+    logger.info("Running lexical and semantic search stages concurrently...")
+    (primary_match, match_type), (ds_isbns, complete) = await asyncio.gather(
+        asyncio.to_thread(_run_with_session, find_primary_match, catalog_isbn, title_match_type),
+        asyncio.get_running_loop().run_in_executor(
+            _SEMANTIC_EXECUTOR, search_book_ids_with_ds, search_query, 5, catalog_isbn, deadline
+        )
+    )
     
+    results = await asyncio.to_thread(
+        _run_with_session, merge_search_results, search_query, primary_match, match_type, ds_isbns
+    )
+    
+    _cache_search_results(search_query, results, complete)
+    _log_search_in_background(search_query, primary_match.ISBN if primary_match else None)
+    return results
+
+
+# Length of the `search_query.search_term` column
+MAX_LOGGED_TERM_LENGTH = 50
+
+
+def _primary_isbn(results: List[FullBookInfo]) -> Optional[str]:
+    """**ISBN of the exact/fuzzy primary match** of a search response, or None."""
+    for result in results:
+        if not result.is_recommendation and result.match_type in ('exact', 'fuzzy'):
+            return result.isbn
+    return None
+
+
+def _log_search_in_background(search_query: str, matched_isbn: Optional[str]) -> None:
+    """
+    **Log a search (cached or not) off the response path.**
+
+    Unmatched queries, ranked by how often they are searched, are what
+    warm_description_cache.py pre-generates descriptions for.
+    """
+    asyncio.get_running_loop().run_in_executor(None, _log_search, search_query, matched_isbn)
+
+
+def _log_search(search_query: str, matched_isbn: Optional[str]) -> None:
+    """
+    **Record a search** in the `search_query` table.
+
+    The term is stored as the description cache normalizes it, so a
+    description generated from the logged term is found by the query's
+    later searches. Terms longer than the column are not logged: a
+    truncated term would warm a description no search ever looks up.
+    Failures are only logged, so search logging can never fail a search.
+    """
+    term = DescriptionGenerator.cache_title(search_query)
+    if not term or len(term) > MAX_LOGGED_TERM_LENGTH:
+        return
     try:
-        # Get all books from database
-        all_books = get_allBooks(db)
-        logger.info(f"Loaded {len(all_books)} books from database")
-        
-        # Step 1: Try exact match (lowercase)
-        logger.info("Step 1: Trying exact match (lowercase)...")
-        exact_match = search_book_exact(search_query, all_books)
-        
-        if exact_match:
-            logger.info(f"✓ Exact match found: '{exact_match.title}'")
-            results.append(build_full_book_info(exact_match, db, match_type='exact', is_recommendation=False))
-            seen_isbns.add(exact_match.ISBN)
-            match_type = 'exact'
-        else:
-            logger.info("No exact match found")
-            
-            # Step 2: Try fuzzy search (CER)
-            logger.info("Step 2: Trying fuzzy search (CER-based)...")
-            fuzzy_result = fuzzy_search_with_cer(search_query, all_books, threshold=0.3)
-            
-            if fuzzy_result:
-                book, cer_score = fuzzy_result
-                logger.info(f"✓ Fuzzy match found: '{book.title}' (CER: {cer_score:.3f})")
-                results.append(build_full_book_info(book, db, match_type='fuzzy', is_recommendation=False))
-                seen_isbns.add(book.ISBN)
-                match_type = 'fuzzy'
-            else:
-                logger.info("No fuzzy match found below threshold")
-        
-        # Step 3: ALWAYS get similar books from DS semantic search
-        logger.info("Step 3: Getting similar books via DS semantic search...")
-        ds_isbns = search_book_ids_with_ds(search_query, top_k=5)
-        
-        if ds_isbns:
-            logger.info(f"✓ Found {len(ds_isbns)} similar books via DS")
-            logger.info(f"ISBNs from DS: {ds_isbns}")
-            
-            for isbn in ds_isbns:
-                # Skip if already added (exact or fuzzy match)
-                if isbn in seen_isbns:
-                    logger.info(f"Skipping duplicate ISBN: {isbn}")
-                    continue
-                
-                logger.info(f"Looking up ISBN: '{isbn}' (type: {type(isbn).__name__}, len: {len(isbn)})")
-                book = get_book_by_isbn(db, isbn)
-                if book:
-                    logger.info(f"✓ Found book: {book.title} (DB ISBN: '{book.ISBN}', type: {type(book.ISBN).__name__})")
-                    results.append(build_full_book_info(book, db, match_type='semantic', is_recommendation=True))
-                    seen_isbns.add(isbn)
-                else:
-                    logger.warning(f"✗ Book not found in DB for ISBN: '{isbn}'")
-                    # Try alternative: check if book exists in all_books list
-                    for db_book in all_books:
-                        if db_book.ISBN == isbn or str(db_book.ISBN) == isbn:
-                            logger.info(f"Found in all_books! DB ISBN: '{db_book.ISBN}' (type: {type(db_book.ISBN).__name__})")
-                            break
-                    else:
-                        # Check with stripped version
-                        isbn_stripped = isbn.rstrip('.0') if isbn.endswith('.0') else isbn
-                        logger.info(f"Trying stripped ISBN: '{isbn_stripped}'")
-                        book = get_book_by_isbn(db, isbn_stripped)
-                        if book:
-                            logger.info(f"✓ Found with stripped ISBN! Book: {book.title}")
-                            results.append(build_full_book_info(book, db, match_type='semantic', is_recommendation=True))
-                            seen_isbns.add(isbn)
-                            seen_isbns.add(isbn_stripped)
-            
-            # Update match_type if no exact/fuzzy match was found
-            if not match_type:
-                match_type = 'semantic'
-        else:
-            logger.info("No DS matches found")
-        
-        # Step 4: Fall back to external API only if NO results at all
-        if not results:
-            logger.info("Step 4: No results found, falling back to external API...")
-            try:
-                external_results = search_book_from_api(search_query)
-                if external_results:
-                    logger.info(f"✓ Found {len(external_results)} results from external API")
-                    results = external_results
-                    match_type = 'external'
-            except Exception as e:
-                logger.error(f"External API search failed: {e}")
-        
-        logger.info(f"Search complete: {len(results)} results, type: {match_type}")
-        return results
-        
-    finally:
-        db.close()
+        _run_with_session(lambda db: log_search_query(db, term=term, matched_book_isbn=matched_isbn))
+    except Exception as e:
+        logger.warning(f"Could not log search query '{search_query}': {e}")
 
 
-def search_book_exact(search_query: str, all_books: List) -> Optional[any]:
+def search_book_exact(search_query: str, title_index: TitleIndex) -> Optional[str]:
     """
     **Search for an exact book title match** (case-insensitive).
 
     Args:
         search_query: User's search query
-        all_books: List of all books from the database
+        title_index: In-memory index of catalog titles
 
     Returns:
-        Matching book or None if not found
+        ISBN of the matching book or None if not found
     """
-    query_lower = search_query.lower().strip()
-    
-    for book in all_books:
-        if book.title.lower().strip() == query_lower:
-            return book
-    
-    return None
+    return title_index.lookup_exact(search_query)
 
-def search_book_ids_with_ds(search_query: str, top_k: int = 10) -> List[str]:
+def refresh_catalog_service() -> dict:
+    """
+    **Invalidate in-memory catalog data** so it is rebuilt from the database.
+
+    Clears the title index and the search result cache of this worker process
+    only; other workers refresh when their entries expire
+    (`TITLE_INDEX_TTL_SECONDS`, `SEARCH_CACHE_TTL_SECONDS`). Call it whenever
+    books or prices change.
+
+    Returns:
+        Confirmation message
+    """
+    get_title_index().invalidate()
+    get_search_cache().invalidate()
+    logger.info("Catalog caches invalidated")
+    return {"message": "Catalog caches invalidated"}
+
+def resolve_books_by_isbn(db_session, isbns: List[str]) -> dict:
+    """
+    **Resolve canonical ISBNs to books** with a single bulk query.
+
+    Rows loaded before ISBN normalization may still store the float-formatted
+    form (`5170390688.0`), so both spellings are looked up and matched by their
+    canonical ISBN.
+
+    Args:
+        db_session (Session): Active database session.
+        isbns: Canonical ISBNs (see `normalize_isbn`)
+
+    Returns:
+        Dictionary mapping canonical ISBN to Book
+    """
+    lookup = set(isbns) | {f"{isbn}.0" for isbn in isbns}
+    return {normalize_isbn(book.ISBN): book for book in get_books_by_isbns(db_session, list(lookup))}
+
+def get_search_cache_stats_service() -> dict:
+    """
+    **Get search result cache statistics.**
+
+    Once the semantic search service is loaded, the query embedding cache
+    statistics are included under `embedding_cache`.
+
+    Returns:
+        Dictionary with cache size, hit/miss counters and hit rate
+    """
+    stats = get_search_cache().get_stats()
+    if _ds_service is not None:
+        stats["embedding_cache"] = _ds_service.vector_store.embedding_cache.get_stats()
+    return stats
+
+def search_book_ids_with_ds(
+    search_query: str,
+    top_k: int = 10,
+    catalog_isbn: Optional[str] = None,
+    deadline: Optional[float] = None
+) -> Tuple[List[str], bool]:
     """
     **Get ISBNs from DS semantic search.**
 
-    ISBNs are returned as-is from the DS service, representing the top `k` similar books.
+    ISBNs are returned in canonical form (see `normalize_isbn`), representing the top `k` similar books.
+    If the query matches a catalog book, its stored vector (or stored description)
+    is used and the LLM description step is skipped.
 
     Args:
         search_query: User's search query
         top_k: Maximum number of similar books to return
+        catalog_isbn: ISBN of the catalog book matching the query, if any
+        deadline: `time.monotonic()` value by which the results are needed
 
     Returns:
-        List of ISBN strings
+        Tuple of (list of ISBN strings, whether the search ran at full quality,
+        i.e. did not fail or fall back to a title-only query)
     """
     try:
         ds_service = _get_ds_service()
-        recommendations = ds_service.find_similar_books(query_title=search_query, top_k=top_k)
+        catalog_book_id = normalize_isbn(catalog_isbn) if catalog_isbn else None
+        
+        # Books missing from the index fall back to their stored description
+        catalog_description = None
+        if catalog_book_id and not ds_service.vector_store.has_book(catalog_book_id):
+            db = next(get_db())
+            try:
+                book = get_book_by_isbn(db, catalog_isbn)
+                catalog_description = book.description if book else None
+            finally:
+                db.close()
+        
+        recommendations = ds_service.find_similar_books(
+            query_title=search_query,
+            top_k=top_k,
+            catalog_book_id=catalog_book_id,
+            catalog_description=catalog_description,
+            deadline=deadline
+        )
         
         isbns = []
         for rec in recommendations:
-            isbn = str(rec.get('book_id', ''))
+            isbn = normalize_isbn(rec.get('book_id'))
             if isbn:
                 isbns.append(isbn)
         
-        return isbns
+        return isbns, all(rec.get('query_source') != 'title' for rec in recommendations)
     except Exception as e:
         logger.error(f"DS search failed: {e}")
-        return []
+        return [], False
+
+def get_similar_books_service(isbn: str, top_k: int = 5) -> Optional[List[FullBookInfo]]:
+    """
+    **Get books similar to a known book** ("more like this").
+
+    Neighbors come straight from the book's stored vector in the DS index,
+    so no description is generated and nothing is embedded.
+
+    Args:
+        isbn: ISBN of the reference book
+        top_k: Maximum number of similar books to return
+
+    Returns:
+        List of FullBookInfo marked as semantic recommendations,
+        or None if the book is not in the vector index
+    """
+    recommendations = _get_ds_service().find_books_similar_to(normalize_isbn(isbn), top_k=top_k)
+    if recommendations is None:
+        return None
+    
+    isbns = [normalize_isbn(rec.get('book_id')) for rec in recommendations]
+    db = next(get_db())
+    try:
+        books_by_isbn = resolve_books_by_isbn(db, isbns)
+        matches = [(books_by_isbn[i], 'semantic', True) for i in isbns if i in books_by_isbn]
+        return build_full_book_infos(matches, db)
+    finally:
+        db.close()
 
 def get_dummy_stores() -> List[BookStoreInfo]:
     """
@@ -0,0 +1,124 @@
+import logging
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Optional
+from core.config import SEARCH_CACHE_MAX_ENTRIES, SEARCH_CACHE_TTL_SECONDS
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_query(search_query: str) -> str:
+    """
+    **Normalize a search query into a cache key.**
+
+    Applies Unicode NFKC normalization, case folding and whitespace collapsing,
+    so `"  Harry  POTTER "` and `"harry potter"` share a cache entry. Title
+    matching normalizes with the same function (`normalize_title`), so a
+    cached response is always the one its normalized query would produce.
+
+    Args:
+        search_query: Raw search query
+
+    Returns:
+        Normalized query string
+    """
+    return " ".join(unicodedata.normalize("NFKC", search_query).casefold().split())
+
+
+class SearchResultCache:
+    """
+    **Size-bounded LRU cache with TTL** for complete search responses.
+
+    Entries expire after `ttl_seconds`; when full, the least recently used
+    entry is evicted. Hit/miss/eviction counters are kept for monitoring.
+    """
+
+    def __init__(self, max_entries: int = SEARCH_CACHE_MAX_ENTRIES, ttl_seconds: int = SEARCH_CACHE_TTL_SECONDS):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()  # key -> (expires_at, value)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, search_query: str) -> Optional[Any]:
+        """
+        **Return the cached response for a query**, or None on a miss or expired entry.
+
+        Args:
+            search_query: Raw search query
+
+        Returns:
+            Cached response or None
+        """
+        key = normalize_query(search_query)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, search_query: str, value: Any) -> None:
+        """
+        **Store the response for a query**, evicting the least recently used entry if full.
+
+        Args:
+            search_query: Raw search query
+            value: Response to cache
+        """
+        if self.max_entries <= 0:
+            return
+        key = normalize_query(search_query)
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self) -> None:
+        """**Drop all cached responses** (e.g. after the catalog or prices changed)."""
+        with self._lock:
+            self._entries.clear()
+        logger.info("Search result cache invalidated")
+
+    def get_stats(self) -> dict:
+        """
+        **Get cache statistics** for monitoring.
+
+        Returns:
+            Dictionary with size, limits, hit/miss/eviction counters and hit rate
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+            }
+
+
+# Initialize the search result cache once per process
+_search_cache = SearchResultCache()
+
+
+def get_search_cache() -> SearchResultCache:
+    """
+    **Return the process-wide `SearchResultCache`.**
+
+    Returns:
+        The shared SearchResultCache instance
+    """
+    return _search_cache
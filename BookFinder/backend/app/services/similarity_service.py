@@ -0,0 +1,132 @@
+import logging
+from typing import List, Optional
+from core.config import SIMILARITY_TOP_N
+from db.postgres import get_db
+from db.postgres_service import get_all_isbns, get_similar_books, replace_similarities
+from schemas.book_schema import FullBookInfo
+from services.books_service import (
+    _get_ds_service,
+    build_full_book_infos,
+    get_similar_books_service,
+    normalize_isbn,
+    resolve_books_by_isbn
+)
+
+logger = logging.getLogger(__name__)
+
+# Extra neighbors fetched per book to make up for ones missing from the database
+NEIGHBOR_SLACK = 5
+
+
+def rebuild_similarity_table(top_n: int = SIMILARITY_TOP_N, chunk_size: int = 1024, n_threads: Optional[int] = None) -> dict:
+    """
+    **Precompute the `book_similarity` table** from the FAISS index.
+
+    Runs a batched all-books kNN over the stored vectors and replaces the table
+    with the top `top_n` neighbors of every book in one bulk transaction.
+    Index book IDs are mapped to the ISBNs stored in the `book` table; books
+    that are not in the database are skipped, as are repeated index entries
+    of a book already processed (counted separately).
+
+    Args:
+        top_n: Number of neighbors stored per book
+        chunk_size: Number of books per batched kNN query
+        n_threads: Number of FAISS threads (default: FAISS decides)
+
+    Returns:
+        Dictionary with the number of books, skipped books (not in the database),
+        duplicate index entries and rows written
+    """
+    ds_service = _get_ds_service()
+    stats = {"books": 0, "skipped_books": 0, "duplicate_books": 0, "rows": 0}
+
+    db = next(get_db())
+    try:
+        db_isbn_by_canonical = {normalize_isbn(isbn): isbn for isbn in get_all_isbns(db)}
+
+        def similarity_rows():
+            seen = set()
+            for book_id, neighbors in ds_service.vector_store.batch_knn(top_n + NEIGHBOR_SLACK, chunk_size, n_threads):
+                isbn1 = db_isbn_by_canonical.get(book_id)
+                if isbn1 is None:
+                    stats["skipped_books"] += 1
+                    continue
+                if isbn1 in seen:
+                    stats["duplicate_books"] += 1
+                    continue
+                seen.add(isbn1)
+                stats["books"] += 1
+
+                emitted = set()
+                for neighbor_id, score in neighbors:
+                    isbn2 = db_isbn_by_canonical.get(neighbor_id)
+                    if isbn2 is None or isbn2 == isbn1 or isbn2 in emitted:
+                        continue
+                    emitted.add(isbn2)
+                    yield isbn1, isbn2, score
+                    if len(emitted) == top_n:
+                        break
+
+        stats["rows"] = replace_similarities(db, similarity_rows())
+    finally:
+        db.close()
+
+    logger.info(f"Similarity table rebuilt: {stats}")
+    return stats
+
+
+def get_books_similarity_service(isbn: str, top_n: int = 10) -> List[FullBookInfo]:
+    """
+    **Get precomputed similar books** from the `book_similarity` table.
+
+    Args:
+        isbn: ISBN of the reference book
+        top_n: Maximum number of similar books to return
+
+    Returns:
+        List of FullBookInfo ordered by similarity (empty if nothing was precomputed)
+    """
+    canonical = normalize_isbn(isbn)
+    db = next(get_db())
+    try:
+        book = resolve_books_by_isbn(db, [canonical]).get(canonical)
+        if book is None:
+            return []
+
+        neighbor_isbns = [normalize_isbn(entry.ISBN_2) for entry in get_similar_books(db, book.ISBN, top_n)]
+        books_by_isbn = resolve_books_by_isbn(db, neighbor_isbns)
+        matches = [(books_by_isbn[i], 'semantic', True) for i in neighbor_isbns if i in books_by_isbn]
+        return build_full_book_infos(matches, db)
+    finally:
+        db.close()
+
+
+def get_more_like_this_service(isbn: str, top_k: int = 5) -> Optional[List[FullBookInfo]]:
+    """
+    **Get books similar to a given book**, precomputed table first.
+
+    Reads the `book_similarity` table (an indexed lookup) and falls back to a
+    live kNN search on the stored vector when it holds fewer than `top_k`
+    neighbors for the book: nothing precomputed, a table built with a smaller
+    `top_n`, or neighbors missing from the database. Requests above
+    SIMILARITY_TOP_N skip the table.
+
+    Args:
+        isbn: ISBN of the reference book
+        top_k: Maximum number of similar books to return
+
+    Returns:
+        List of FullBookInfo, or None if the book is neither precomputed nor in the vector index
+    """
+    if top_k > SIMILARITY_TOP_N:
+        logger.info(f"{top_k} similar books requested, {SIMILARITY_TOP_N} precomputed: searching the vector index")
+        return get_similar_books_service(isbn, top_k)
+    results = get_books_similarity_service(isbn, top_k)
+    if len(results) >= top_k:
+        return results
+    logger.info(f"{len(results)} of {top_k} similarities precomputed for ISBN {isbn}, searching the vector index")
+    live_results = get_similar_books_service(isbn, top_k)
+    # Books missing from the vector index keep whatever was precomputed
+    if live_results is None:
+        return results or None
+    return live_results
@@ -0,0 +1,79 @@
+import logging
+from typing import Optional
+
+# Compiled Levenshtein implementation, used when installed
+try:
+    from rapidfuzz.distance import Levenshtein as _rapidfuzz_levenshtein
+except ImportError:
+    _rapidfuzz_levenshtein = None
+
+logger = logging.getLogger(__name__)
+
+LEVENSHTEIN_BACKEND = "rapidfuzz" if _rapidfuzz_levenshtein is not None else "python"
+logger.info(f"Levenshtein backend: {LEVENSHTEIN_BACKEND}")
+
+
+def _levenshtein_python(s1: str, s2: str, max_distance: int) -> int:
+    """
+    **Banded Levenshtein distance** in pure Python (Ukkonen cut-off).
+
+    Only cells within `max_distance` of the diagonal are computed, and the
+    computation stops as soon as a whole row exceeds `max_distance`.
+
+    Args:
+        s1: First string
+        s2: Second string
+        max_distance: Largest distance of interest
+
+    Returns:
+        The distance, or `max_distance + 1` if it is larger than `max_distance`
+    """
+    if len(s1) > len(s2):
+        s1, s2 = s2, s1
+    len1, len2 = len(s1), len(s2)
+    limit = max_distance + 1
+
+    previous_row = [min(j, limit) for j in range(len1 + 1)]
+    for i in range(1, len2 + 1):
+        current_row = [limit] * (len1 + 1)
+        if i < limit:
+            current_row[0] = i
+        row_min = current_row[0]
+        char2 = s2[i - 1]
+        for j in range(max(1, i - max_distance), min(len1, i + max_distance) + 1):
+            change = previous_row[j - 1] + (s1[j - 1] != char2)
+            value = min(previous_row[j] + 1, current_row[j - 1] + 1, change, limit)
+            current_row[j] = value
+            if value < row_min:
+                row_min = value
+        if row_min >= limit:
+            return limit
+        previous_row = current_row
+
+    return previous_row[len1]
+
+
+def levenshtein_distance(s1: str, s2: str, max_distance: Optional[int] = None) -> int:
+    """
+    **Levenshtein distance with an optional cut-off.**
+
+    Strings whose length difference already exceeds `max_distance` are rejected
+    before any dynamic programming. Uses `rapidfuzz` when it is installed and
+    the pure-Python banded implementation otherwise; both return the same values.
+
+    Args:
+        s1: First string
+        s2: Second string
+        max_distance: Largest distance of interest (None = exact distance)
+
+    Returns:
+        The distance, or `max_distance + 1` if it is larger than `max_distance`
+    """
+    if max_distance is None:
+        max_distance = max(len(s1), len(s2))
+    if abs(len(s1) - len(s2)) > max_distance:
+        return max_distance + 1
+
+    if _rapidfuzz_levenshtein is not None:
+        return _rapidfuzz_levenshtein.distance(s1, s2, score_cutoff=max_distance)
+    return _levenshtein_python(s1, s2, max_distance)
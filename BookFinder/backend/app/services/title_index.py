@@ -0,0 +1,319 @@
+import logging
+import threading
+import time
+from typing import Dict, List, NamedTuple, Optional, Tuple
+import numpy as np
+from core.config import TITLE_INDEX_TTL_SECONDS
+from db.postgres import SessionLocal
+from db.postgres_service import get_book_titles
+from services.search_cache import normalize_query
+
+logger = logging.getLogger(__name__)
+
+# Character histograms used by the fuzzy search bound hash characters into this many buckets
+HISTOGRAM_BUCKETS = 32
+# Bits of a posting key holding the bigram's offset in its title; offsets beyond are not indexed
+OFFSET_BITS = 11
+OFFSET_MASK = (1 << OFFSET_BITS) - 1
+# Most extra query pieces of the pigeonhole filter (k + s pieces, s of them must match)
+MAX_EXTRA_PIECES = 3
+
+
+def normalize_title(title: str) -> str:
+    """
+    **Normalize a title for matching.**
+
+    Same normalization as the search cache key (`normalize_query`: NFKC,
+    case folding, whitespace collapsing), so queries sharing a cache entry
+    also share their exact and fuzzy matches.
+
+    Args:
+        title: Raw title or search query
+
+    Returns:
+        Normalized title string
+    """
+    return normalize_query(title)
+
+
+def _codepoints(text: str) -> np.ndarray:
+    """Unicode code points of a string as a uint32 array"""
+    return np.frombuffer(text.encode('utf-32-le'), dtype=np.uint32)
+
+
+def _bigram_codes(codes: np.ndarray) -> np.ndarray:
+    """Code of each character bigram (two 21-bit code points packed into an int64)"""
+    return (codes[:-1].astype(np.int64) << 21) | codes[1:]
+
+
+def _split_pieces(query: str, count: int) -> List[Tuple[str, int]]:
+    """Split a query into `count` contiguous pieces of near-equal length, as (piece, offset)"""
+    bounds = [round(i * len(query) / count) for i in range(count + 1)]
+    return [(query[bounds[i]:bounds[i + 1]], bounds[i]) for i in range(count)]
+
+
+class TitleSnapshot(NamedTuple):
+    """Immutable view of the catalog titles, swapped as a whole on refresh."""
+    exact: Dict[str, str]      # normalized title -> ISBN of the first book with that title
+    titles: List[str]          # normalized titles, in database order
+    isbns: List[str]           # ISBNs aligned with `titles`
+    lengths: np.ndarray        # length of each normalized title
+    by_length: np.ndarray      # title positions ordered by length
+    sorted_lengths: np.ndarray # lengths[by_length]
+    histograms: np.ndarray     # (titles, HISTOGRAM_BUCKETS) saturated character counts, in by_length order
+    histogram_sums: np.ndarray # row sums of `histograms`
+    gram_codes: np.ndarray     # sorted distinct bigram codes
+    gram_starts: np.ndarray    # postings of gram_codes[i] are posting_keys[gram_starts[i]:gram_starts[i + 1]]
+    posting_keys: np.ndarray   # (title position << OFFSET_BITS) | offset of each bigram occurrence
+
+
+class TitleIndex:
+    """
+    **Process-level index of catalog titles** for exact and fuzzy search.
+
+    Holds only `(ISBN, normalized title)` pairs, loaded with a single narrow query,
+    so a search never has to pull the whole `book` table. The index is rebuilt
+    after `ttl_seconds` or as soon as `invalidate()` is called (e.g. after an ETL load).
+    """
+
+    def __init__(self, ttl_seconds: int = TITLE_INDEX_TTL_SECONDS):
+        self.ttl_seconds = ttl_seconds
+        self._snapshot: Optional[TitleSnapshot] = None
+        self._built_at = 0.0
+        self._refresh_lock = threading.Lock()
+
+    @staticmethod
+    def _build_snapshot(rows) -> TitleSnapshot:
+        """
+        **Build a snapshot from `(ISBN, title)` rows.**
+
+        The fuzzy search structures (character histograms and positional bigram
+        postings in CSR layout) are built with vectorized numpy operations over
+        the concatenated titles, so a million titles take seconds.
+
+        Args:
+            rows: Iterable of (ISBN, title) pairs
+
+        Returns:
+            TitleSnapshot with exact-match map, aligned title/ISBN arrays and fuzzy search postings
+        """
+        exact = {}
+        titles = []
+        isbns = []
+        for isbn, title in rows:
+            if not title:
+                continue
+            normalized = normalize_title(title)
+            exact.setdefault(normalized, isbn)
+            titles.append(normalized)
+            isbns.append(isbn)
+
+        lengths = np.fromiter((len(t) for t in titles), dtype=np.int32, count=len(titles))
+        codes = _codepoints("".join(titles))
+        title_of_char = np.repeat(np.arange(len(titles), dtype=np.int64), lengths)
+        offsets = np.arange(len(codes), dtype=np.int64) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+
+        histograms = np.zeros((len(titles), HISTOGRAM_BUCKETS), dtype=np.int32)
+        np.add.at(histograms, (title_of_char, codes % HISTOGRAM_BUCKETS), 1)
+        by_length = np.argsort(lengths, kind='stable').astype(np.int32)
+        histograms = np.minimum(histograms[by_length], 255).astype(np.uint8)
+
+        # Bigrams start at every character but a title's last; offsets past OFFSET_MASK are not indexed
+        starts = np.flatnonzero((offsets[:-1] < lengths[title_of_char[:-1]] - 1) & (offsets[:-1] <= OFFSET_MASK)) \
+            if len(codes) > 1 else np.empty(0, dtype=np.int64)
+        grams = _bigram_codes(codes)[starts] if len(codes) > 1 else np.empty(0, dtype=np.int64)
+        key_dtype = np.uint32 if len(titles) < 1 << (32 - OFFSET_BITS) else np.int64
+        keys = ((title_of_char[starts] << OFFSET_BITS) | offsets[starts]).astype(key_dtype)
+        order = np.lexsort((keys, grams))
+        gram_codes, gram_starts = np.unique(grams[order], return_index=True)
+
+        return TitleSnapshot(
+            exact=exact,
+            titles=titles,
+            isbns=isbns,
+            lengths=lengths,
+            by_length=by_length,
+            sorted_lengths=lengths[by_length],
+            histograms=histograms,
+            histogram_sums=histograms.sum(axis=1, dtype=np.int32),
+            gram_codes=gram_codes,
+            gram_starts=np.append(gram_starts, len(order)).astype(np.int64),
+            posting_keys=keys[order]
+        )
+
+    def refresh(self) -> None:
+        """**Reload all titles from the database** and swap in the new snapshot."""
+        db = SessionLocal()
+        try:
+            rows = get_book_titles(db)
+        finally:
+            db.close()
+        self._snapshot = self._build_snapshot(rows)
+        self._built_at = time.monotonic()
+        logger.info(f"Title index built with {len(self._snapshot.titles)} titles")
+
+    def invalidate(self) -> None:
+        """**Mark the index as stale** so the next search rebuilds it."""
+        self._built_at = 0.0
+        logger.info("Title index invalidated")
+
+    def get_snapshot(self) -> TitleSnapshot:
+        """
+        **Return the current snapshot**, rebuilding it first if missing or expired.
+
+        Only one thread rebuilds an expired index; the others keep serving the
+        previous snapshot instead of waiting on the database.
+
+        Returns:
+            Current TitleSnapshot
+        """
+        expired = time.monotonic() - self._built_at >= self.ttl_seconds
+        if self._snapshot is None or expired:
+            # Block only when there is nothing to serve yet
+            if self._refresh_lock.acquire(blocking=self._snapshot is None):
+                try:
+                    if self._snapshot is None or time.monotonic() - self._built_at >= self.ttl_seconds:
+                        self.refresh()
+                finally:
+                    self._refresh_lock.release()
+        return self._snapshot
+
+    def lookup_exact(self, search_query: str) -> Optional[str]:
+        """
+        **Find the ISBN of a book whose title equals the query** (case-insensitive).
+
+        Args:
+            search_query: User's search query
+
+        Returns:
+            ISBN string or None if no title matches exactly
+        """
+        return self.get_snapshot().exact.get(normalize_title(search_query))
+
+    def fuzzy_candidates(self, search_query: str, threshold: float,
+                         snapshot: Optional[TitleSnapshot] = None) -> List[int]:
+        """
+        **Positions of the titles that can be within `threshold` CER of the query.**
+
+        With `k = floor(threshold * max(len(query), len(title)))` edits allowed, three
+        lossless filters run from cheapest to most selective:
+
+        1. **Length:** `|len(query) - len(title)| <= k`.
+        2. **Character histogram:** each edit changes at most one character count up and
+           one down, so `k` must cover the surplus of query characters missing from the
+           title and vice versa (counted over `HISTOGRAM_BUCKETS` hashed buckets).
+        3. **Pigeonhole:** split into `k + s` pieces, at least `s` pieces of the query
+           survive the `k` edits unchanged, so they occur in the title within `k` of
+           their query offset. Pieces are looked up through positional bigram postings.
+
+        Every title within the threshold is returned; only exact CER scoring remains.
+
+        Args:
+            search_query: User's search query
+            threshold: Maximum CER of a match
+            snapshot: Snapshot to search (defaults to the current one)
+
+        Returns:
+            Ascending positions into the snapshot's `titles` / `isbns`
+        """
+        snapshot = snapshot or self.get_snapshot()
+        query = normalize_title(search_query)
+        if not query or not snapshot.titles:
+            return []
+
+        query_length = len(query)
+        # Title lengths passing the length filter form one slice of the length-sorted arrays
+        valid_lengths = [
+            length for length in range(int(query_length * (1 - threshold)) - 1,
+                                       int(query_length / max(1e-9, 1 - threshold)) + 2)
+            if length >= 0 and abs(length - query_length) <= int(threshold * max(length, query_length) + 1e-9)
+        ]
+        if not valid_lengths:
+            return []
+        low = np.searchsorted(snapshot.sorted_lengths, valid_lengths[0], side='left')
+        high = np.searchsorted(snapshot.sorted_lengths, valid_lengths[-1], side='right')
+        edits_by_length = np.floor(
+            threshold * np.maximum(snapshot.sorted_lengths[low:high], query_length) + 1e-9
+        ).astype(np.int32)
+
+        # Surplus of title characters over the query's: P = sum(max(0, t - q)); the query's
+        # surplus is P - (sum(t) - sum(q)), and k edits must cover the larger of the two
+        query_histogram = np.zeros(HISTOGRAM_BUCKETS, dtype=np.int16)
+        np.add.at(query_histogram, _codepoints(query) % HISTOGRAM_BUCKETS, 1)
+        query_histogram = np.minimum(query_histogram, 255)
+        title_surplus = np.maximum(snapshot.histograms[low:high].astype(np.int16) - query_histogram, 0).sum(axis=1)
+        query_surplus = title_surplus - (snapshot.histogram_sums[low:high] - int(query_histogram.sum()))
+        passed = np.maximum(title_surplus, query_surplus) <= edits_by_length
+        candidates = snapshot.by_length[low:high][passed]
+        if len(candidates) == 0:
+            return []
+        max_edits = np.zeros(len(snapshot.titles), dtype=np.int32)
+        max_edits[candidates] = edits_by_length[passed]
+
+        survivors = np.zeros(len(snapshot.titles), dtype=bool)
+        survivors[candidates] = True
+        postings_cache = {}
+        kept = []
+        for edits in np.unique(max_edits[candidates]):
+            group = candidates[max_edits[candidates] == edits]
+            extra = MAX_EXTRA_PIECES
+            while extra > 1 and query_length // (edits + extra) < 2:
+                extra -= 1
+            pieces = _split_pieces(query, edits + extra)
+            # Single-character pieces cannot be looked up in bigram postings
+            if min(len(piece) for piece, _ in pieces) < 2:
+                kept.append(group)
+                continue
+
+            hits = np.zeros(len(snapshot.titles), dtype=np.int32)
+            for piece, offset in pieces:
+                hits[self._piece_titles(snapshot, piece, offset, int(edits), survivors, postings_cache)] += 1
+            # Titles longer than the indexed offsets may hold pieces in their tail
+            hits[group[snapshot.lengths[group] > OFFSET_MASK]] = extra
+            kept.append(group[hits[group] >= extra])
+        return np.sort(np.concatenate(kept)).tolist()
+
+    @staticmethod
+    def _piece_titles(snapshot: TitleSnapshot, piece: str, offset: int, edits: int,
+                      survivors: np.ndarray, postings_cache: dict) -> np.ndarray:
+        """
+        **Titles among `survivors` containing `piece` within `edits` of `offset`.**
+
+        Intersects the postings of the piece's bigrams, each shifted back to the
+        piece start, then keeps occurrences inside the offset window. Postings
+        restricted to the survivors are kept in `postings_cache` for the query.
+
+        Returns:
+            Distinct title positions
+        """
+        keys = None
+        for shift, code in enumerate(_bigram_codes(_codepoints(piece)).tolist()):
+            postings = postings_cache.get(code)
+            if postings is None:
+                row = np.searchsorted(snapshot.gram_codes, code)
+                if row >= len(snapshot.gram_codes) or snapshot.gram_codes[row] != code:
+                    postings = snapshot.posting_keys[:0]
+                else:
+                    postings = snapshot.posting_keys[snapshot.gram_starts[row]:snapshot.gram_starts[row + 1]]
+                    postings = postings[survivors[postings >> OFFSET_BITS]]
+                postings_cache[code] = postings
+            postings = postings[(postings & OFFSET_MASK) >= shift] - shift
+            keys = postings if keys is None else np.intersect1d(keys, postings, assume_unique=True)
+            if len(keys) == 0:
+                return np.empty(0, dtype=np.int64)
+        in_window = np.abs((keys & OFFSET_MASK).astype(np.int64) - offset) <= edits
+        return np.unique(keys[in_window] >> OFFSET_BITS).astype(np.int64)
+
+
+# Initialize the title index once per process
+_title_index = TitleIndex()
+
+
+def get_title_index() -> TitleIndex:
+    """
+    **Return the process-wide `TitleIndex`.**
+
+    Returns:
+        The shared TitleIndex instance
+    """
+    return _title_index
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Pre-warm the description cache
+Generates descriptions for the most frequent logged searches that matched no
+catalog book (the `search_query` table), with the concurrent, rate-limited
+batch mode. Catalog titles are not warmed: their searches use stored vectors
+and never call the LLM
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+from db.postgres import get_db
+from db.postgres_service import get_unmatched_search_terms
+
+# Add DS to path
+sys.path.insert(0, str(Path(__file__).parent / "ds"))
+from app.config import config
+from app.description_generator import DescriptionGenerator
+
+
+def main():
+    """Generate and cache descriptions for frequent searches without a catalog match"""
+    parser = argparse.ArgumentParser(description="Pre-warm the description cache")
+    parser.add_argument("--limit", type=int, default=1000, help="Most frequent unmatched searches to warm")
+    parser.add_argument("--concurrency", type=int, default=config.OPENAI_BATCH_CONCURRENCY,
+                        help="Concurrent API calls")
+    parser.add_argument("--bulk-size", type=int, default=config.OPENAI_BULK_SIZE,
+                        help="Titles per request (1 = one request per title)")
+    args = parser.parse_args()
+
+    db = next(get_db())
+    try:
+        terms = get_unmatched_search_terms(db, args.limit)
+    finally:
+        db.close()
+    # Terms are logged normalized like description cache keys; rows logged before that are folded in
+    titles = list(dict.fromkeys(DescriptionGenerator.cache_title(term) for term in terms if term.strip()))
+
+    print("=" * 70)
+    print("WARMING DESCRIPTION CACHE")
+    print("=" * 70)
+    print(f"Unmatched searches: {len(titles)}")
+    print(f"Concurrency: {args.concurrency}")
+    print(f"Titles per request: {args.bulk_size}")
+    print(f"Budget: {config.OPENAI_RPM_LIMIT:.0f} RPM, {config.OPENAI_TPM_LIMIT:.0f} TPM")
+    print("=" * 70)
+
+    start = time.monotonic()
+
+    def report(done: int, total: int):
+        elapsed = time.monotonic() - start
+        print(f"\r   {done}/{total} titles ({done / elapsed if elapsed else 0:.1f}/s)", end="", flush=True)
+
+    generator = DescriptionGenerator()
+    generator.batch_generate_descriptions(titles, max_workers=args.concurrency, progress_callback=report,
+                                          bulk_size=args.bulk_size)
+
+    stats = generator.get_cache_stats()
+    print(f"\n\n✅ Done in {time.monotonic() - start:.1f}s, {stats['total_cached']} descriptions cached")
+    print(f"   Bulk requests: {stats['bulk']['requests']}, titles retried individually: {stats['bulk']['fallbacks']}")
+    print(f"   Failed generations: {stats['failures']}")
+    print(f"   Rate limiter waited {generator.rate_limiter.waited_seconds:.1f}s in total")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
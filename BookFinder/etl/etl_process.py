@@ -1,14 +1,22 @@
 import pandas as pd
 import glob
 import os
+import sys
 from os import path
 from sqlalchemy import text
 from sqlalchemy.orm import sessionmaker
 import logging
+import requests
 from database.database import engine, Base
 from database.models import Book, AppUser, Bookstore, BookStoreInventory, BookSimilarity, SearchQuery, Ratings
 from fastapi import status
 
+try:
+    from isbn import normalize_isbn  # copied from the backend's DS package at image build time
+except ImportError:  # running from a source checkout
+    sys.path.insert(0, path.join(path.dirname(path.abspath(__file__)), "..", "backend", "app", "ds", "app"))
+    from isbn import normalize_isbn
+
 # ➡️ New Imports for Web Service ⬅️
 from fastapi import FastAPI, HTTPException
 import uvicorn
@@ -40,11 +48,39 @@ def load_csv_to_table(table_name: str, csv_path: str) -> None:
             logger.info(f"Table '{table_name}' already has data. Skipping CSV load.")
             return
         
-    df = pd.read_csv(csv_path)
+    # Read ISBNs as text so pandas does not turn them into floats
+    df = pd.read_csv(csv_path, dtype={"ISBN": str})
+    if "ISBN" in df.columns:
+        df["ISBN"] = df["ISBN"].map(normalize_isbn)
     # Write to DB
     df.to_sql(table_name, con=engine, if_exists="append", index=False, method="multi")
     logger.info(f"Loaded data into table: {table_name}")
 
+def notify_catalog_refresh() -> None:
+    """
+    **Tell the backend that the catalog was (re)loaded.**  
+    The backend keeps in-memory title data that must be rebuilt after a load.
+    Does nothing unless `CATALOG_REFRESH_URL` is set; failures are only logged.
+    The request carries `CATALOG_REFRESH_SECRET` (set to the same value in the
+    backend's environment) in the `X-Service-Secret` header.
+    
+    Args:
+        None
+
+    Returns:
+        None
+    """
+    refresh_url = os.environ.get("CATALOG_REFRESH_URL")
+    if not refresh_url:
+        return
+    try:
+        headers = {"X-Service-Secret": os.environ.get("CATALOG_REFRESH_SECRET", "")}
+        response = requests.post(refresh_url, headers=headers, timeout=5)
+        response.raise_for_status()
+        logger.info("Backend catalog caches refreshed.")
+    except Exception as e:
+        logger.warning(f"Could not notify backend about catalog refresh: {e}")
+
 # -----------------------------------------------------
 # ➡️ New: FastAPI Endpoint to Trigger Data Load ⬅️
 # -----------------------------------------------------
@@ -106,6 +142,7 @@ def trigger_data_ingestion():
         )
 
     logger.info("Tables are fully populated.")
+    notify_catalog_refresh()
     return {"message": "Tables are fully populated.", "successful_tables": successful_tables}
 
 # -----------------------------------------------------
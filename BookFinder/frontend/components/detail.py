@@ -3,8 +3,9 @@ Book detail page component for FindMyRead application.
 Displays comprehensive information about a selected book.
 """
 import streamlit as st
-from utils.search import get_book_by_id
+from utils.search import get_book_by_id, get_similar_books
 from utils.session import go_back_to_home, go_home
+from components.book_card import render_book_card
 from components.rating_widget import render_ratings_section
 
 
@@ -41,6 +42,7 @@ def render_detail():
     - Main section with book **cover image** and **pricing info** from the store.
     - Long **description** or plot summary.
     - Ratings section showing user reviews and interactive rating widgets.
+    - **More Like This** section with similar books from the backend.
 
     Provides a **back button** to navigate to previous results or home, 
     depending on the user's navigation history.
@@ -138,3 +140,21 @@ def render_detail():
     # Ratings section
     st.markdown("---")
     render_ratings_section(book['id'])
+    
+    # More like this - similar books served from the stored book vectors
+    similar_books = get_similar_books(book['id'])
+    if similar_books:
+        st.markdown("---")
+        st.markdown('<div class="results-header">', unsafe_allow_html=True)
+        st.markdown('<div class="result-title">More Like This</div>', unsafe_allow_html=True)
+        st.markdown("</div>", unsafe_allow_html=True)
+        
+        for i in range(0, len(similar_books), 2):
+            cols = st.columns(2)
+            
+            with cols[0]:
+                render_book_card(similar_books[i], similar_books[i].get("id"), index=i + 3000)
+            
+            if i + 1 < len(similar_books):
+                with cols[1]:
+                    render_book_card(similar_books[i + 1], similar_books[i + 1].get("id"), index=i + 3001)
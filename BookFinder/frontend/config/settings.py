@@ -28,6 +28,7 @@ BACKEND_BROWSER_URL = os.getenv("BACKEND_BROWSER_URL", "http://localhost:8000")
 # API Endpoints
 API_ENDPOINTS = {
     "search_books": "/api/books/search",
+    "similar_books": "/api/books/{book_id}/similar",
     "get_book_ratings": "/api/ratings/{book_id}",
     "rate_book": "/api/ratings/",
     "auth_google": "/api/auth/google",
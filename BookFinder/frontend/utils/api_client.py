@@ -176,6 +176,21 @@ class APIClient:
         #     }
         # ]
     
+    def get_similar_books(self, book_id: str, top_k: int = 4) -> Optional[List[Dict]]:
+        """
+        Get books similar to a specific book ("more like this").
+        
+        Args:
+            book_id: The book's unique identifier (ISBN)
+            top_k: Number of similar books to return
+            
+        Returns:
+            List of book dictionaries (same format as search results) or None if request fails
+        """
+        endpoint = API_ENDPOINTS["similar_books"].format(book_id=book_id)
+        params = {"top_k": top_k}
+        return self._make_request("GET", endpoint, params=params)
+    
     def get_book_ratings(self, book_id: str) -> Optional[List[Dict]]:
         """
         Get all ratings for a specific book.
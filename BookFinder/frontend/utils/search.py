@@ -74,10 +74,40 @@ def _search_mock_data(query: str):
     return exact, suggestions
 
 
+def get_similar_books(book_id: str):
+    """
+    Fetch books similar to the given book from the backend API.
+    Results are kept in session state per book, so reruns of the detail page
+    reuse them and books opened from "More Like This" stay resolvable.
+    
+    Args:
+        book_id: The book's unique identifier (ISBN)
+        
+    Returns:
+        List of book dicts (empty if the request fails or nothing is found)
+    """
+    similar = st.session_state.setdefault("similar", {})
+    if str(book_id) in similar:
+        return similar[str(book_id)]
+    
+    # Books from the external API fallback are not in the catalog index
+    if str(book_id).startswith("ext-"):
+        return []
+    
+    api_client = get_api_client()
+    api_response = api_client.get_similar_books(book_id)
+    books = transform_books_list_from_api(api_response) if api_response else []
+    # Failed requests are not remembered, so the next render retries them
+    if api_response is not None:
+        similar[str(book_id)] = books
+    return books
+
+
 def get_book_by_id(book_id: str):
     """
     Retrieve a book by its ID.
-    First checks session state (API results), then falls back to mock data.
+    First checks session state (API results, including "More Like This" books),
+    then falls back to mock data.
     
     Args:
         book_id: The book's unique identifier (string for API compatibility)
@@ -96,6 +126,12 @@ def get_book_by_id(book_id: str):
             if str(book.get("id")) == str(book_id):
                 return book
     
+    # Books opened from a detail page's "More Like This" section
+    for books in st.session_state.get("similar", {}).values():
+        for book in books:
+            if str(book.get("id")) == str(book_id):
+                return book
+    
     # PRIORITY 2: Try to find in mock data (for backwards compatibility)
     for book in BOOKS:
         if str(book.get("id")) == str(book_id):
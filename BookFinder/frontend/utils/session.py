@@ -17,6 +17,8 @@ def initialize_session_state():
         st.session_state["suggestions"] = []
     if "selected_book_id" not in st.session_state:
         st.session_state["selected_book_id"] = None
+    if "similar" not in st.session_state:
+        st.session_state["similar"] = {}  # book_id -> its "More Like This" books
     
     # Authentication state
     if "auth_token" not in st.session_state: